@@ -0,0 +1,32 @@
+"""add users.calendar_token for subscribable ICS feeds
+
+Revision ID: 3f1a9c2d7e01
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1a9c2d7e01'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Tables are created by init_db() on startup, so this may run against a
+    # schema that already has the column — keep every statement idempotent.
+    op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS calendar_token VARCHAR(64)")
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_users_calendar_token ON users (calendar_token)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_users_calendar_token")
+    op.execute("ALTER TABLE users DROP COLUMN IF EXISTS calendar_token")
@@ -0,0 +1,51 @@
+"""store tasks.deadline as timestamptz and index it per owner
+
+Revision ID: 4d8a1e6c9b04
+Revises: c27d5e9b4f03
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d8a1e6c9b04'
+down_revision: Union[str, None] = 'c27d5e9b4f03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Offset-less ISO strings were always read as UTC by the planner.
+    op.execute("SET LOCAL TIME ZONE 'UTC'")
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF (SELECT data_type FROM information_schema.columns
+                WHERE table_name = 'tasks' AND column_name = 'deadline') <> 'timestamp with time zone' THEN
+                ALTER TABLE tasks
+                    ALTER COLUMN deadline TYPE TIMESTAMP WITH TIME ZONE
+                    USING deadline::timestamptz;
+            END IF;
+        END $$
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_owner_deadline ON tasks (owner_user_id, deadline)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_tasks_owner_deadline")
+    op.execute("SET LOCAL TIME ZONE 'UTC'")
+    op.execute(
+        """
+        ALTER TABLE tasks
+            ALTER COLUMN deadline TYPE VARCHAR
+            USING to_char(deadline, 'YYYY-MM-DD"T"HH24:MI:SS.US"+00:00"')
+        """
+    )
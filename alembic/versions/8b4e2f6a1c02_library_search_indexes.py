@@ -0,0 +1,61 @@
+"""library full-text / trigram search indexes
+
+Revision ID: 8b4e2f6a1c02
+Revises: 3f1a9c2d7e01
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b4e2f6a1c02'
+down_revision: Union[str, None] = '3f1a9c2d7e01'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION immutable_unaccent(text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION library_search_document(title text, summary text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE
+        AS $$ SELECT immutable_unaccent(lower(coalesce(title, '') || ' ' || coalesce(summary, ''))) $$
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_library_items_search_trgm ON library_items
+        USING gin (library_search_document(title, summary) gin_trgm_ops)
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_library_items_search_fts ON library_items
+        USING gin (to_tsvector('simple'::regconfig, library_search_document(title, summary)))
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_library_items_owner_subject "
+        "ON library_items (owner_user_id, subject)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_library_items_owner_subject")
+    op.execute("DROP INDEX IF EXISTS ix_library_items_search_fts")
+    op.execute("DROP INDEX IF EXISTS ix_library_items_search_trgm")
+    op.execute("DROP FUNCTION IF EXISTS library_search_document(text, text)")
+    op.execute("DROP FUNCTION IF EXISTS immutable_unaccent(text)")
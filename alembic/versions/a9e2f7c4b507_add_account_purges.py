@@ -0,0 +1,50 @@
+"""add account_purges tombstones for background account resets
+
+Revision ID: a9e2f7c4b507
+Revises: f1c4d8b2a306
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9e2f7c4b507'
+down_revision: Union[str, None] = 'f1c4d8b2a306'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS account_purges (
+            id VARCHAR PRIMARY KEY,
+            owner_user_id VARCHAR NOT NULL,
+            batch_id VARCHAR,
+            requested_by VARCHAR NOT NULL,
+            cutoff TIMESTAMP WITH TIME ZONE NOT NULL,
+            status VARCHAR(16) NOT NULL,
+            rows_deleted INTEGER,
+            table_counts JSONB,
+            error TEXT,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+            started_at TIMESTAMP WITH TIME ZONE,
+            finished_at TIMESTAMP WITH TIME ZONE,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+        )
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_account_purges_owner_user_id ON account_purges (owner_user_id)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_account_purges_batch_id ON account_purges (batch_id)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS account_purges")
@@ -0,0 +1,69 @@
+"""library search document covers tags; drop the trigram index
+
+Revision ID: b6d2e8f4a709
+Revises: a9e2f7c4b507
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d2e8f4a709'
+down_revision: Union[str, None] = 'a9e2f7c4b507'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION library_search_document(title text, summary text, tags jsonb) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE
+        AS $$ SELECT immutable_unaccent(lower(
+            coalesce(title, '') || ' ' || coalesce(summary, '') || ' ' || coalesce(
+                (SELECT string_agg(tag, ' ') FROM jsonb_array_elements_text(
+                    CASE WHEN jsonb_typeof(tags) = 'array' THEN tags ELSE '[]'::jsonb END
+                ) AS tag),
+                ''
+            )
+        )) $$
+        """
+    )
+    # prefix tsquery matching replaces the substring fallback
+    op.execute("DROP INDEX IF EXISTS ix_library_items_search_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_library_items_search_fts")
+    op.execute(
+        """
+        CREATE INDEX ix_library_items_search_fts ON library_items
+        USING gin (to_tsvector('simple'::regconfig, library_search_document(title, summary, tags)))
+        """
+    )
+    op.execute("DROP FUNCTION IF EXISTS library_search_document(text, text)")
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION library_search_document(title text, summary text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE
+        AS $$ SELECT immutable_unaccent(lower(coalesce(title, '') || ' ' || coalesce(summary, ''))) $$
+        """
+    )
+    op.execute("DROP INDEX IF EXISTS ix_library_items_search_fts")
+    op.execute(
+        """
+        CREATE INDEX ix_library_items_search_fts ON library_items
+        USING gin (to_tsvector('simple'::regconfig, library_search_document(title, summary)))
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX ix_library_items_search_trgm ON library_items
+        USING gin (library_search_document(title, summary) gin_trgm_ops)
+        """
+    )
+    op.execute("DROP FUNCTION IF EXISTS library_search_document(text, text, jsonb)")
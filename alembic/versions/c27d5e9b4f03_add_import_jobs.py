@@ -0,0 +1,46 @@
+"""add import_jobs table for background program imports
+
+Revision ID: c27d5e9b4f03
+Revises: 8b4e2f6a1c02
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c27d5e9b4f03'
+down_revision: Union[str, None] = '8b4e2f6a1c02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS import_jobs (
+            id VARCHAR PRIMARY KEY,
+            kind VARCHAR(16) NOT NULL,
+            status VARCHAR(16) NOT NULL,
+            draft_id VARCHAR,
+            total_items INTEGER,
+            processed_items INTEGER,
+            item_errors JSONB,
+            error TEXT,
+            result JSONB,
+            owner_user_id VARCHAR NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+        )
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_import_jobs_owner_user_id ON import_jobs (owner_user_id)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS import_jobs")
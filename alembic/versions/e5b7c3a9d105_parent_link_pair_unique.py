@@ -0,0 +1,43 @@
+"""unique (parent_id, student_id) index on parent_student_links
+
+Revision ID: e5b7c3a9d105
+Revises: 4d8a1e6c9b04
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b7c3a9d105'
+down_revision: Union[str, None] = '4d8a1e6c9b04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep one row per pair (an active link wins, then the newest).
+    op.execute(
+        """
+        DELETE FROM parent_student_links AS l
+        USING (
+            SELECT id, row_number() OVER (
+                PARTITION BY parent_id, student_id
+                ORDER BY (status = 'active') DESC, created_at DESC
+            ) AS rank
+            FROM parent_student_links
+        ) AS d
+        WHERE l.id = d.id AND d.rank > 1
+        """
+    )
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_parent_student_links_pair "
+        "ON parent_student_links (parent_id, student_id) INCLUDE (status)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS uq_parent_student_links_pair")
@@ -0,0 +1,41 @@
+"""indexes for keyset admin user listing and prefix search
+
+Revision ID: f1c4d8b2a306
+Revises: e5b7c3a9d105
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c4d8b2a306'
+down_revision: Union[str, None] = 'e5b7c3a9d105'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS ix_users_created_at_id ON users (created_at, id)")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_users_username_prefix "
+        "ON users (lower(username) text_pattern_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_users_first_name_prefix "
+        "ON users (lower(first_name) text_pattern_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_users_full_name_prefix "
+        "ON users (lower(last_name || ' ' || first_name) text_pattern_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_users_full_name_prefix")
+    op.execute("DROP INDEX IF EXISTS ix_users_first_name_prefix")
+    op.execute("DROP INDEX IF EXISTS ix_users_username_prefix")
+    op.execute("DROP INDEX IF EXISTS ix_users_created_at_id")
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -10,6 +12,31 @@ class Settings(BaseSettings):
     db_user: str = "postgres"
     db_password: str
 
+    # Connection pool, per worker process: at most size + overflow
+    # connections; a checkout waits up to pool_timeout seconds for one.
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30.0
+    # Connections older than this are replaced on checkout (-1 = never).
+    # With a recycle shorter than the server/proxy idle timeout, pre-ping
+    # (one extra round trip per checkout) can be switched off.
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    # SQL statement logging; independent of `debug` so it stays off by default.
+    db_echo: bool = False
+
+    # Optional streaming replica for read-only endpoints (same pool settings).
+    # After a user commits a write, their reads stay on the primary for this
+    # long in the worker that handled the write; keep it above normal lag.
+    replica_database_url: Optional[str] = None
+    replica_read_your_writes_seconds: float = 5.0
+
+    # Responses smaller than this are sent uncompressed.
+    compression_minimum_bytes: int = 1024
+    compression_gzip_level: int = 6
+    # Brotli is preferred when the client accepts it.
+    compression_brotli_quality: int = 4
+
     debug: bool = True
     app_version: str = "0.1.0"
 
@@ -17,6 +44,13 @@ class Settings(BaseSettings):
     jwt_algorithm: str = "HS256"
     jwt_expire_minutes: int = 60 * 24 * 7  # 7 days
 
+    # Shared library catalog is cached per process; other workers see admin
+    # edits after at most this long.
+    library_cache_ttl_seconds: int = 300
+    # Active parent->children links are cached per process; revocations made
+    # through another worker apply after at most this long.
+    parent_link_cache_ttl_seconds: int = 60
+
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -0,0 +1,113 @@
+"""Response compression (brotli when available, else gzip).
+
+Pure ASGI middleware for the API's single-body responses (JSON, ICS):
+
+- only bodies of at least `minimum_size` bytes with a compressible
+  content type are compressed; streamed bodies pass through untouched;
+- the encoding is negotiated from Accept-Encoding, honouring `q=0`;
+  brotli (pinned in requirements.txt) is preferred, with gzip as the
+  fallback — also when an environment was installed without `brotli`;
+- a strong ETag becomes weak on a compressed response, since its bytes
+  differ from the identity representation; `Vary: Accept-Encoding` is set.
+"""
+from __future__ import annotations
+
+import gzip
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # missing from a partial install: serve gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+# Larger bodies (big plans) are compressed off the event loop.
+THREADPOOL_MIN_BYTES = 256 * 1024
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Best supported coding accepted by the client, or None."""
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = q
+    wildcard = accepted.get("*", 0.0)
+    for coding in (("br", "gzip") if brotli is not None else ("gzip",)):
+        if accepted.get(coding, wildcard) > 0:
+            return coding
+    return None
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _compress(self, body: bytes, coding: str) -> bytes:
+        if coding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            # first body message: decide, then release the held start message
+            passthrough = True
+            headers = MutableHeaders(raw=start_message["headers"])
+            body = message.get("body", b"")
+            content_type = headers.get("content-type", "")
+            if (
+                message.get("more_body")
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            ):
+                await send(start_message)
+                await send(message)
+                return
+
+            if len(body) >= THREADPOOL_MIN_BYTES:
+                body = await run_in_threadpool(self._compress, body, coding)
+            else:
+                body = self._compress(body, coding)
+            headers["Content-Encoding"] = coding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            await send(start_message)
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,25 @@
+"""Opaque keyset-pagination cursors.
+
+A cursor is the (timestamp, id) sort key of the last row of a page, as
+URL-safe base64 JSON. Clients pass it back unchanged to get the next page.
+"""
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+
+
+def encode(at: datetime, row_id: str) -> str:
+    raw = json.dumps([at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode(cursor: str) -> tuple[datetime, str]:
+    """Inverse of `encode`; raises ValueError on malformed input."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        at, row_id = json.loads(raw)
+        return datetime.fromisoformat(at), str(row_id)
+    except (TypeError, ValueError) as exc:  # binascii.Error and JSONDecodeError are ValueErrors
+        raise ValueError("invalid cursor") from exc
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Callable
+from typing import AsyncIterator, Callable
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
@@ -9,7 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import decode_access_token
 from app.crud import user as user_crud
-from app.database import get_db
+from app.database import ReadSessionLocal, get_db, replica_engine, wrote_recently
 from app.models.user import User
 
 bearer_scheme = HTTPBearer(auto_error=False)
@@ -31,9 +31,30 @@ async def get_current_user(
     user = await user_crud.get_user_by_id(db, user_id)
     if not user or not user.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Tài khoản không tồn tại")
+    db.info["user_id"] = user.id  # lets get_db record this user's writes
     return user
 
 
+async def get_read_db(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> AsyncIterator[AsyncSession]:
+    """Session for read-only handlers: the replica when one is configured.
+
+    Authentication always reads the primary, and so must any other
+    authorization check: run it in a dependency declared before this one
+    (see `routers/parent.py`). The request's primary session
+    is reused when there is no replica, or when the user committed a write
+    in this process within `replica_read_your_writes_seconds`.
+    """
+    if replica_engine is None or wrote_recently(current_user.id):
+        yield db
+        return
+    await db.commit()  # hand the primary connection back before using the replica
+    async with ReadSessionLocal() as session:
+        yield session
+
+
 def require_role(*roles: str) -> Callable:
     """Factory that returns a FastAPI dependency checking role membership."""
     async def _check(current_user: User = Depends(get_current_user)) -> User:
@@ -0,0 +1,47 @@
+"""Conditional GET helpers: ETags derived from row versions.
+
+Handlers compute a tag from a cheap version query (ids, counts, update
+timestamps) before loading the full data, and answer 304 when the client
+already holds that version — so nothing is loaded or serialized.
+
+Tags are strong when generated. CompressionMiddleware marks them weak
+(`W/"..."`) on compressed responses, so `if_none_match` uses the weak
+comparison of RFC 9110 §13.1.2.
+"""
+from __future__ import annotations
+
+import hashlib
+from typing import Optional
+
+from fastapi import Response
+
+# Revalidate on every use; the ETag makes revalidation cheap.
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: object) -> str:
+    digest = hashlib.sha1("\x1f".join(str(p) for p in parts).encode()).hexdigest()
+    return f'"{digest[:24]}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def if_none_match(header: Optional[str], etag: str) -> bool:
+    """True if the If-None-Match *header* matches *etag* (weak comparison)."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = _opaque(etag)
+    return any(_opaque(candidate) == wanted for candidate in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def cache_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
@@ -0,0 +1,188 @@
+"""Background workers for import jobs (program upload parsing, finalization).
+
+Jobs are started with FastAPI BackgroundTasks after the request that
+created them has committed, and run on their own sessions: one for the
+actual work (a single transaction, so a failed job leaves no partial data)
+and one for progress updates, committed after every chunk so that
+`GET /imports/jobs/{id}` can report progress while the work is in flight.
+"""
+from __future__ import annotations
+
+import io
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.uploads import UploadFormat, chunked, iter_records
+from app.crud import habits as habits_crud
+from app.crud import import_draft as draft_crud
+from app.crud import import_job as job_crud
+from app.crud import settings as settings_crud
+from app.crud import slots as slots_crud
+from app.crud import tasks as tasks_crud
+from app.database import AsyncSessionLocal
+from app.planner.deadline_spreader import spread_deadlines, weekly_capacity
+from app.schemas.free_slot import FreeSlotSchema
+from app.schemas.habit import HabitSchema
+from app.schemas.import_draft import DraftItemSchema, ImportDraftCreate
+from app.schemas.task import TaskCreate
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 500
+
+_TASK_LIST = TypeAdapter(list[TaskCreate])
+
+
+async def program_deadlines(db: AsyncSession, draft, owner_user_id: str) -> list[datetime]:
+    """Staggered deadlines for the draft's items, aligned with `draft.items`."""
+    items = draft.items or []
+    slots = [FreeSlotSchema.model_validate(s) for s in await slots_crud.list_slots(db, owner_user_id)]
+    habits = [HabitSchema.model_validate(h) for h in await habits_crud.list_habits(db, owner_user_id)]
+    settings_row = await settings_crud.get_settings(db)
+    capacity = weekly_capacity(
+        slots, habits, settings_row.daily_limit_minutes, settings_row.buffer_percent
+    )
+
+    now = datetime.now(timezone.utc)
+    backlog = sum(
+        t.estimated_minutes - t.progress_minutes
+        for t in await tasks_crud.list_active_tasks(db, owner_user_id, now)
+    )
+    return spread_deadlines(
+        durations=[item.get("durationMin", 30) for item in items],
+        order=[item.get("orderIndex", i) for i, item in enumerate(items)],
+        capacity=capacity,
+        start=now,
+        backlog_minutes=backlog,
+    )
+
+
+def draft_items_to_tasks(draft, deadlines: Optional[list[datetime]] = None) -> list[TaskCreate]:
+    """Validate every draft item as a TaskCreate in a single pass.
+
+    *deadlines* (from `program_deadlines`) are aligned with `draft.items`;
+    without them every item gets the legacy flat two-week deadline.
+    """
+    fallback = (datetime.utcnow() + timedelta(days=14)).isoformat()
+    raw = []
+    for index, item in enumerate(draft.items or []):
+        duration_min = item.get("durationMin", 30)
+        raw.append({
+            "subject": item.get("subject") or draft.name,
+            "title": item.get("title", "Nhiệm vụ từ draft"),
+            "deadline": deadlines[index].isoformat() if deadlines else fallback,
+            "timezone": "Asia/Ho_Chi_Minh",
+            "difficulty": item.get("difficulty", 3),
+            "durationEstimateMin": duration_min,
+            "durationEstimateMax": duration_min,
+            "durationUnit": "minutes",
+            "estimatedMinutes": duration_min,
+            "importance": 2,
+            "contentFocus": item.get("notes") or "",
+            "successCriteria": [item.get("successCriteria") or "Hoàn thành mục tiêu"],
+            "milestones": None,
+            "notes": item.get("notes") or "",
+        })
+    return _TASK_LIST.validate_python(raw)
+
+
+def validate_draft_records(records: list[tuple[int, dict]]) -> tuple[list[DraftItemSchema], list[dict]]:
+    """Validate one chunk of uploaded rows; missing ids/orderIndex are filled in."""
+    items: list[DraftItemSchema] = []
+    errors: list[dict] = []
+    for line_no, record in records:
+        if "__error__" in record:
+            errors.append({"line": line_no, "error": record["__error__"]})
+            continue
+        record.setdefault("id", str(uuid.uuid4()))
+        record.setdefault("orderIndex", line_no)
+        try:
+            items.append(DraftItemSchema.model_validate(record))
+        except ValidationError as exc:
+            first = exc.errors()[0]
+            field = ".".join(str(p) for p in first["loc"])
+            errors.append({"line": line_no, "error": f"{field}: {first['msg']}"})
+    return items, errors
+
+
+async def _report(job_id: str, **values) -> None:
+    async with AsyncSessionLocal() as progress_db:
+        await job_crud.update_job(progress_db, job_id, **values)
+        await progress_db.commit()
+
+
+async def run_parse_job(
+    job_id: str,
+    owner_user_id: str,
+    raw: bytes,
+    fmt: UploadFormat,
+    draft_meta: dict,
+) -> None:
+    """Parse an uploaded program and store it as a new draft."""
+    try:
+        await _report(job_id, status="running")
+        records = list(iter_records(io.BytesIO(raw), fmt))
+        await _report(job_id, total_items=len(records))
+
+        items: list[DraftItemSchema] = []
+        errors: list[dict] = []
+        for processed, chunk in enumerate(chunked(records, CHUNK_SIZE), start=1):
+            chunk_items, chunk_errors = validate_draft_records(chunk)
+            items.extend(chunk_items)
+            errors.extend(chunk_errors)
+            await _report(
+                job_id,
+                processed_items=min(processed * CHUNK_SIZE, len(records)),
+                item_errors=errors[: job_crud.MAX_ITEM_ERRORS],
+            )
+
+        async with AsyncSessionLocal() as db:
+            payload = ImportDraftCreate(**draft_meta, items=items)
+            draft = await draft_crud.create_draft(db, payload, owner_user_id)
+            await db.commit()
+
+        await _report(
+            job_id,
+            status="succeeded",
+            draft_id=draft.id,
+            result={"draftId": draft.id, "itemCount": len(items), "failedCount": len(errors)},
+        )
+    except Exception as exc:  # noqa: BLE001 — any failure is reported on the job
+        logger.exception("Import job %s failed", job_id)
+        await _report(job_id, status="failed", error=str(exc)[:1000])
+
+
+async def run_finalize_job(job_id: str, owner_user_id: str, draft_id: str) -> None:
+    """Convert a draft into tasks, reporting progress per inserted chunk."""
+    try:
+        await _report(job_id, status="running")
+        async with AsyncSessionLocal() as db:
+            draft = await draft_crud.get_draft(db, draft_id)
+            if not draft or draft.owner_user_id != owner_user_id:
+                raise ValueError("Draft not found")
+            payloads = draft_items_to_tasks(
+                draft, await program_deadlines(db, draft, owner_user_id)
+            )
+            await _report(job_id, total_items=len(payloads))
+            if not await draft_crud.mark_finalized(db, draft_id, owner_user_id):
+                raise ValueError("Draft already finalized")
+
+            created: list[str] = []
+            for chunk in chunked(payloads, CHUNK_SIZE):
+                created += await tasks_crud.bulk_create_tasks(db, chunk, owner_user_id)
+                await _report(job_id, processed_items=len(created))
+            await db.commit()
+
+        await _report(
+            job_id,
+            status="succeeded",
+            result={"createdTaskIds": created, "count": len(created)},
+        )
+    except Exception as exc:  # noqa: BLE001 — any failure is reported on the job
+        logger.exception("Finalize job %s failed", job_id)
+        await _report(job_id, status="failed", error=str(exc)[:1000])
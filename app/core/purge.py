@@ -0,0 +1,98 @@
+"""Background purge of account data behind `AccountPurge` tombstones.
+
+Each owned table is emptied in bounded batches of `DELETE ... WHERE id IN
+(SELECT id ... LIMIT n)`, committed one at a time together with the purge's
+progress. Locks are held for one batch only, and a crash loses at most the
+batch in flight. Only rows created up to the tombstone's cutoff are
+deleted, so data the user creates right after a reset is kept.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+from app.crud import account_purge as purge_crud
+from app.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 2000
+
+# (table, creation timestamp column). The biggest table goes last, so the
+# user-visible lists empty first.
+PURGE_TABLES = (
+    ("tasks", "created_at"),
+    ("free_slots", "created_at"),
+    ("habits", "created_at"),
+    ("feedback", "submitted_at"),
+    ("import_drafts", "created_at"),
+    ("plan_records", "created_at"),
+)
+
+_DELETE_BATCH_SQL = {
+    table: text(f"""
+        DELETE FROM {table}
+        WHERE id IN (
+            SELECT id FROM {table}
+            WHERE owner_user_id = :owner AND ({column} IS NULL OR {column} <= :cutoff)
+            LIMIT :batch
+        )
+    """)
+    for table, column in PURGE_TABLES
+}
+
+
+async def purge_account(purge_id: str, owner_user_id: str, cutoff: datetime, batch_size: int = BATCH_SIZE) -> int:
+    """Delete the owner's rows up to *cutoff*; returns the number of rows deleted."""
+    total = 0
+    counts: dict[str, int] = {}
+    async with AsyncSessionLocal() as db:
+        for table, _ in PURGE_TABLES:
+            counts[table] = 0
+            while True:
+                result = await db.execute(
+                    _DELETE_BATCH_SQL[table],
+                    {"owner": owner_user_id, "cutoff": cutoff, "batch": batch_size},
+                )
+                deleted = result.rowcount
+                counts[table] += deleted
+                total += deleted
+                await purge_crud.update_purge(db, purge_id, rows_deleted=total, table_counts=counts)
+                await db.commit()
+                if deleted < batch_size:
+                    break
+    return total
+
+
+async def run_purges(purge_ids: list[str]) -> None:
+    """Run the given purges one after another and log overall throughput."""
+    started = time.perf_counter()
+    total = 0
+    for purge_id in purge_ids:
+        async with AsyncSessionLocal() as db:
+            purge = await purge_crud.get_purge(db, purge_id)
+            if purge is None or purge.status != "queued":
+                continue
+            owner_user_id, cutoff = purge.owner_user_id, purge.cutoff
+            await purge_crud.update_purge(
+                db, purge_id, status="running", started_at=datetime.now(timezone.utc)
+            )
+            await db.commit()
+        try:
+            total += await purge_account(purge_id, owner_user_id, cutoff)
+            values = {"status": "succeeded"}
+        except Exception as exc:  # noqa: BLE001 — any failure is reported on the purge
+            logger.exception("Account purge %s failed", purge_id)
+            values = {"status": "failed", "error": str(exc)[:1000]}
+        async with AsyncSessionLocal() as db:
+            await purge_crud.update_purge(db, purge_id, finished_at=datetime.now(timezone.utc), **values)
+            await db.commit()
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        "Purged %d rows for %d accounts in %.1fs (%.0f rows/s)",
+        total, len(purge_ids), elapsed, total / elapsed if elapsed else 0.0,
+    )
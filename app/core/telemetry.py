@@ -0,0 +1,275 @@
+"""In-process performance telemetry, exposed in Prometheus text format.
+
+- `TelemetryMiddleware` records per-route latency plus each request's DB
+  query count and DB time. Routes are labelled by their path template, not
+  by the raw URL.
+- `instrument_engine` hooks SQLAlchemy cursor events to time every query.
+- `TimedQueuePool` times connection checkouts (pool wait), and
+  `render()` adds checked-out/overflow gauges for instrumented engines.
+- `span("name")` times a block of code, e.g. the planner phases.
+- `render()` produces the text served at `GET /metrics`.
+
+Everything is plain counters in a dict, updated on the event loop thread.
+Recording costs a dict lookup and a bisect, and a scrape costs one pass
+over the series.
+"""
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+# Upper bounds in seconds; +Inf is implicit.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class Histogram:
+    """Cumulative histogram keyed by a tuple of label values."""
+
+    def __init__(self, name: str, doc: str, labels: tuple[str, ...], buckets: tuple[float, ...]):
+        self.name = name
+        self.doc = doc
+        self.labels = labels
+        self.buckets = buckets
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.doc}"
+        yield f"# TYPE {self.name} histogram"
+        for label_values, series in sorted(self._series.items()):
+            labels = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labels, label_values))
+            prefix = f"{labels}," if labels else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                yield f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}'
+            cumulative += series[len(self.buckets)]
+            yield f'{self.name}_bucket{{{prefix}le="+Inf"}} {cumulative}'
+            suffix = f"{{{labels}}}" if labels else ""
+            yield f"{self.name}_sum{suffix} {series[-1]:.6f}"
+            yield f"{self.name}_count{suffix} {cumulative}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+HTTP_LATENCY = Histogram(
+    "studyflow_http_request_duration_seconds",
+    "Time from request start to the last response byte.",
+    ("method", "route", "status"),
+    LATENCY_BUCKETS,
+)
+HTTP_DB_QUERIES = Histogram(
+    "studyflow_http_request_db_queries",
+    "Database statements executed per request.",
+    ("method", "route"),
+    COUNT_BUCKETS,
+)
+HTTP_DB_TIME = Histogram(
+    "studyflow_http_request_db_duration_seconds",
+    "Total database time per request.",
+    ("method", "route"),
+    LATENCY_BUCKETS,
+)
+DB_QUERY_TIME = Histogram(
+    "studyflow_db_query_duration_seconds",
+    "Duration of individual database statements.",
+    (),
+    LATENCY_BUCKETS,
+)
+SPAN_TIME = Histogram(
+    "studyflow_span_duration_seconds",
+    "Duration of named code spans (planner phases etc.).",
+    ("span",),
+    LATENCY_BUCKETS,
+)
+
+POOL_WAIT_TIME = Histogram(
+    "studyflow_db_pool_wait_seconds",
+    "Time spent waiting for a pooled connection.",
+    ("outcome",),
+    LATENCY_BUCKETS,
+)
+
+HISTOGRAMS: list[Histogram] = [
+    HTTP_LATENCY, HTTP_DB_QUERIES, HTTP_DB_TIME, DB_QUERY_TIME, POOL_WAIT_TIME, SPAN_TIME,
+]
+
+
+# ---------------------------------------------------------------------------
+# Per-request state
+# ---------------------------------------------------------------------------
+
+@dataclass
+class RequestStats:
+    db_queries: int = 0
+    db_seconds: float = 0.0
+
+
+_request: ContextVar[Optional[RequestStats]] = ContextVar("telemetry_request", default=None)
+
+
+def current_request() -> Optional[RequestStats]:
+    return _request.get()
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a block into studyflow_span_duration_seconds{span=name}."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        SPAN_TIME.observe(time.perf_counter() - start, name)
+
+
+# ---------------------------------------------------------------------------
+# SQLAlchemy hooks
+# ---------------------------------------------------------------------------
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("telemetry_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["telemetry_query_start"].pop()
+    DB_QUERY_TIME.observe(elapsed)
+    stats = _request.get()
+    if stats is not None:
+        stats.db_queries += 1
+        stats.db_seconds += elapsed
+
+
+def _handle_error(exception_context):
+    starts = exception_context.connection.info.get("telemetry_query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited.
+
+    `outcome` is "ok", or "timeout" when no connection freed up within
+    pool_timeout; a growing timeout count means the pool is too small for
+    the worker's concurrency.
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            POOL_WAIT_TIME.observe(time.perf_counter() - start, "timeout")
+            raise
+        POOL_WAIT_TIME.observe(time.perf_counter() - start, "ok")
+        return conn
+
+
+_pools: list[tuple[str, Pool]] = []
+
+
+def instrument_engine(engine: Engine, name: str = "primary") -> None:
+    """Attach query timing to a (sync) engine; pass `async_engine.sync_engine`.
+
+    The engine's pool is also reported by `render()` as saturation gauges,
+    labelled pool=*name*.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+    _pools.append((name, engine.pool))
+
+
+def _render_pool_gauges() -> Iterator[str]:
+    # Only queue pools expose these counters (NullPool/StaticPool do not).
+    pools = [(name, p) for name, p in _pools if hasattr(p, "checkedout")]
+    gauges = (
+        ("studyflow_db_pool_size", "Configured persistent connections.", lambda p: p.size()),
+        ("studyflow_db_pool_checked_out", "Connections currently in use.", lambda p: p.checkedout()),
+        ("studyflow_db_pool_checked_in", "Idle connections in the pool.", lambda p: p.checkedin()),
+        # QueuePool.overflow() starts at -size; clamp to connections beyond size.
+        ("studyflow_db_pool_overflow", "Connections open beyond pool size.", lambda p: max(0, p.overflow())),
+    )
+    for name, doc, value in gauges:
+        yield f"# HELP {name} {doc}"
+        yield f"# TYPE {name} gauge"
+        for pool_name, pool in pools:
+            yield f'{name}{{pool="{pool_name}"}} {value(pool)}'
+
+
+# ---------------------------------------------------------------------------
+# ASGI middleware
+# ---------------------------------------------------------------------------
+
+class TelemetryMiddleware:
+    """Pure ASGI middleware (no BaseHTTPMiddleware body buffering).
+
+    Measurements are taken when the last body chunk is sent, so background
+    tasks that run after the response do not count toward the request.
+    """
+
+    def __init__(self, app, skip_paths: tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.skip_paths = skip_paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        stats = RequestStats()
+        token = _request.set(stats)
+        status_code = 500
+        recorded = False
+
+        def record() -> None:
+            nonlocal recorded
+            recorded = True
+            route = scope.get("route")
+            route_label = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            HTTP_LATENCY.observe(time.perf_counter() - start, method, route_label, str(status_code))
+            HTTP_DB_QUERIES.observe(stats.db_queries, method, route_label)
+            HTTP_DB_TIME.observe(stats.db_seconds, method, route_label)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body") and not recorded:
+                record()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if not recorded:
+                record()
+            _request.reset(token)
+
+
+def render() -> str:
+    lines: list[str] = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    lines.extend(_render_pool_gauges())
+    return "\n".join(lines) + "\n"
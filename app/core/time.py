@@ -0,0 +1,17 @@
+"""Timezone helpers shared by the planner and the crud layer."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+TZ_OFFSET = timezone(timedelta(hours=7))  # UTC+7
+
+
+def as_vn_aware(value: str | datetime) -> datetime:
+    """Normalize an ISO datetime string or a datetime to an aware datetime in UTC+7.
+
+    Naive values are taken as UTC.
+    """
+    dt = value if isinstance(value, datetime) else datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(TZ_OFFSET)
@@ -0,0 +1,83 @@
+"""Streaming parsers for admin/student file uploads (JSON-lines, JSON, CSV).
+
+Records are yielded one at a time together with their 1-based line/row
+number so callers can validate and insert in bounded chunks and report
+errors against the original file.
+"""
+from __future__ import annotations
+
+import codecs
+import csv
+import json
+from itertools import islice
+from typing import IO, Iterable, Iterator, Literal, Optional, TypeVar
+
+UploadFormat = Literal["jsonl", "json", "csv"]
+
+T = TypeVar("T")
+
+
+class UploadFormatError(ValueError):
+    """The upload cannot be parsed at all (as opposed to a bad record)."""
+
+
+def detect_format(filename: Optional[str], explicit: Optional[str] = None) -> UploadFormat:
+    name = (explicit or filename or "").lower()
+    for fmt in ("jsonl", "ndjson", "json", "csv"):
+        if name == fmt or name.endswith(f".{fmt}"):
+            return "jsonl" if fmt == "ndjson" else fmt  # type: ignore[return-value]
+    raise UploadFormatError("Định dạng tệp không hỗ trợ (jsonl, json, csv)")
+
+
+def iter_records(
+    raw: IO[bytes], fmt: UploadFormat, list_fields: tuple[str, ...] = ()
+) -> Iterator[tuple[int, dict]]:
+    """Yield (line_no, record) from a binary file object.
+
+    For CSV, columns named in *list_fields* are split on "|" or ";" into lists.
+    Lines that are not valid JSON are yielded as {"__error__": message}.
+    """
+    text = codecs.getreader("utf-8-sig")(raw)
+    if fmt == "jsonl":
+        for line_no, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield line_no, {"__error__": f"JSON không hợp lệ: {exc.msg}"}
+                continue
+            yield line_no, record if isinstance(record, dict) else {"__error__": "Mỗi dòng phải là một object"}
+    elif fmt == "json":
+        try:
+            data = json.load(text)
+        except json.JSONDecodeError as exc:
+            raise UploadFormatError(f"JSON không hợp lệ: {exc.msg}") from exc
+        if isinstance(data, dict):
+            data = data.get("items", [])
+        if not isinstance(data, list):
+            raise UploadFormatError("JSON phải là một mảng hoặc có khóa 'items'")
+        for index, record in enumerate(data, start=1):
+            yield index, record if isinstance(record, dict) else {"__error__": "Phần tử phải là một object"}
+    elif fmt == "csv":
+        reader = csv.DictReader(text)
+        try:
+            for row in reader:
+                record = {k.strip(): (v.strip() if isinstance(v, str) else v) for k, v in row.items() if k}
+                for field in list_fields:
+                    value = record.get(field)
+                    if isinstance(value, str):
+                        sep = "|" if "|" in value else ";"
+                        record[field] = [part.strip() for part in value.split(sep) if part.strip()]
+                # DictReader counts the header as line 1
+                yield reader.line_num, record
+        except csv.Error as exc:  # NUL bytes, oversized fields: the rest is unreadable
+            raise UploadFormatError(f"CSV không hợp lệ (dòng {reader.line_num}): {exc}") from exc
+    else:
+        raise UploadFormatError(f"Định dạng không hỗ trợ: {fmt}")
+
+
+def chunked(iterable: Iterable[T], size: int) -> Iterator[list[T]]:
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
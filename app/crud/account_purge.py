@@ -0,0 +1,112 @@
+"""CRUD helpers for account purge tombstones."""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import ColumnElement, exists, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.account_purge import AccountPurge
+
+# A purge that has not reported progress for this long is assumed to have
+# died with its worker process; the owner can simply reset again.
+STALE_AFTER = timedelta(minutes=10)
+
+
+# ---------------------------------------------------------------------------
+# Hiding tombstoned rows
+# ---------------------------------------------------------------------------
+#
+# The purge runs in the background, so owner-scoped reads exclude every row
+# that an unfinished (queued, running or failed) purge of its owner covers:
+# the data disappears the moment the reset is committed. Covered means the
+# same as in app/core/purge.py: created at or before the cutoff, or never
+# timestamped.
+
+def not_purged(owner_user_id: ColumnElement, created_at: ColumnElement) -> ColumnElement[bool]:
+    """True for rows no pending reset of their owner covers."""
+    return ~exists().where(
+        AccountPurge.owner_user_id == owner_user_id,
+        AccountPurge.status != "succeeded",
+        or_(created_at == None, created_at <= AccountPurge.cutoff),  # noqa: E711
+    )
+
+
+def not_purged_sql(alias: str, created_at: str = "created_at") -> str:
+    """`not_purged` for text SQL, over the row alias *alias*."""
+    return f"""NOT EXISTS (
+        SELECT 1 FROM account_purges ap
+        WHERE ap.owner_user_id = {alias}.owner_user_id
+          AND ap.status <> 'succeeded'
+          AND ({alias}.{created_at} IS NULL OR {alias}.{created_at} <= ap.cutoff)
+    )"""
+
+
+async def create_purges(
+    db: AsyncSession,
+    owner_user_ids: list[str],
+    requested_by: str,
+    batch_id: Optional[str] = None,
+) -> list[AccountPurge]:
+    """Tombstone everything each owner has created up to now (database time)."""
+    cutoff = await db.scalar(select(func.now()))
+    now = datetime.now(timezone.utc)
+    purges = [
+        AccountPurge(
+            id=str(uuid.uuid4()),
+            owner_user_id=owner_id,
+            batch_id=batch_id,
+            requested_by=requested_by,
+            cutoff=cutoff,
+            status="queued",
+            rows_deleted=0,
+            table_counts={},
+            created_at=now,
+            updated_at=now,
+        )
+        for owner_id in owner_user_ids
+    ]
+    db.add_all(purges)
+    await db.flush()
+    return purges
+
+
+def _mark_stale(purge: AccountPurge) -> bool:
+    if purge.status in ("queued", "running") and purge.updated_at is not None:
+        if datetime.now(timezone.utc) - purge.updated_at > STALE_AFTER:
+            purge.status = "failed"
+            purge.error = "Tiến trình xóa dữ liệu bị gián đoạn, vui lòng thử lại."
+            return True
+    return False
+
+
+async def get_purge(db: AsyncSession, purge_id: str) -> Optional[AccountPurge]:
+    result = await db.execute(select(AccountPurge).where(AccountPurge.id == purge_id))
+    purge = result.scalar_one_or_none()
+    if purge and _mark_stale(purge):
+        await db.flush()
+    return purge
+
+
+async def list_batch(db: AsyncSession, batch_id: str) -> list[AccountPurge]:
+    result = await db.execute(
+        select(AccountPurge)
+        .where(AccountPurge.batch_id == batch_id)
+        .order_by(AccountPurge.created_at, AccountPurge.id)
+    )
+    purges = list(result.scalars().all())
+    stale = [p for p in purges if _mark_stale(p)]
+    if stale:
+        await db.flush()
+    return purges
+
+
+async def update_purge(db: AsyncSession, purge_id: str, **values) -> None:
+    """Set columns on a purge and bump updated_at (the worker's heartbeat)."""
+    await db.execute(
+        update(AccountPurge)
+        .where(AccountPurge.id == purge_id)
+        .values(**values, updated_at=datetime.now(timezone.utc))
+    )
@@ -6,6 +6,7 @@ from datetime import datetime
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud.account_purge import not_purged
 from app.models.feedback import Feedback
 from app.schemas.feedback import FeedbackCreate
 
@@ -13,7 +14,7 @@ from app.schemas.feedback import FeedbackCreate
 async def list_feedback(db: AsyncSession, owner_user_id: str) -> list[Feedback]:
     result = await db.execute(
         select(Feedback)
-        .where(Feedback.owner_user_id == owner_user_id)
+        .where(Feedback.owner_user_id == owner_user_id, not_purged(Feedback.owner_user_id, Feedback.submitted_at))
         .order_by(Feedback.submitted_at)
     )
     return list(result.scalars().all())
@@ -7,19 +7,23 @@ from typing import Optional
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud.account_purge import not_purged
 from app.models.habit import Habit
 from app.schemas.habit import HabitCreate
 
 
+_VISIBLE = not_purged(Habit.owner_user_id, Habit.created_at)
+
+
 async def list_habits(db: AsyncSession, owner_user_id: str) -> list[Habit]:
     result = await db.execute(
-        select(Habit).where(Habit.owner_user_id == owner_user_id).order_by(Habit.created_at)
+        select(Habit).where(Habit.owner_user_id == owner_user_id, _VISIBLE).order_by(Habit.created_at)
     )
     return list(result.scalars().all())
 
 
 async def get_habit(db: AsyncSession, habit_id: str) -> Optional[Habit]:
-    result = await db.execute(select(Habit).where(Habit.id == habit_id))
+    result = await db.execute(select(Habit).where(Habit.id == habit_id, _VISIBLE))
     return result.scalar_one_or_none()
 
 
@@ -1,18 +1,23 @@
 from __future__ import annotations
 
+import json
 import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud.account_purge import not_purged, not_purged_sql
 from app.models.import_draft import ImportDraft
-from app.schemas.import_draft import ImportDraftCreate, ImportDraftUpdate
+from app.schemas.import_draft import DraftItemPatch, ImportDraftCreate, ImportDraftUpdate
+
+
+_VISIBLE = not_purged(ImportDraft.owner_user_id, ImportDraft.created_at)
 
 
 async def list_drafts(db: AsyncSession, owner_user_id: str, draft_type: Optional[str] = None) -> list[ImportDraft]:
-    query = select(ImportDraft).where(ImportDraft.owner_user_id == owner_user_id).order_by(ImportDraft.created_at.desc())
+    query = select(ImportDraft).where(ImportDraft.owner_user_id == owner_user_id, _VISIBLE).order_by(ImportDraft.created_at.desc())
     if draft_type:
         query = query.where(ImportDraft.draft_type == draft_type)
     result = await db.execute(query)
@@ -20,7 +25,7 @@ async def list_drafts(db: AsyncSession, owner_user_id: str, draft_type: Optional
 
 
 async def get_draft(db: AsyncSession, draft_id: str) -> Optional[ImportDraft]:
-    result = await db.execute(select(ImportDraft).where(ImportDraft.id == draft_id))
+    result = await db.execute(select(ImportDraft).where(ImportDraft.id == draft_id, _VISIBLE))
     return result.scalar_one_or_none()
 
 
@@ -58,6 +63,85 @@ async def update_draft(db: AsyncSession, draft_id: str, payload: ImportDraftUpda
     return draft
 
 
+# ---------------------------------------------------------------------------
+# Item-level edits — modify one element of the items JSONB array in SQL
+# instead of round-tripping and rewriting the whole array.
+# ---------------------------------------------------------------------------
+
+_PATCH_ITEM_SQL = text(f"""
+    UPDATE import_drafts AS d
+    SET items = jsonb_set(d.items, ARRAY[(e.pos - 1)::text], e.elem || CAST(:patch AS jsonb)),
+        updated_at = now()
+    FROM (
+        SELECT t.elem, t.pos
+        FROM import_drafts AS src, jsonb_array_elements(src.items) WITH ORDINALITY AS t(elem, pos)
+        WHERE src.id = :draft_id AND t.elem->>'id' = :item_id
+        LIMIT 1
+    ) AS e
+    WHERE d.id = :draft_id AND d.owner_user_id = :owner AND d.status = 'draft'
+      AND {not_purged_sql("d")}
+    RETURNING e.elem || CAST(:patch AS jsonb)
+""")
+
+_DELETE_ITEM_SQL = text(f"""
+    UPDATE import_drafts AS d
+    SET items = d.items - (e.pos - 1)::int,
+        updated_at = now()
+    FROM (
+        SELECT t.pos
+        FROM import_drafts AS src, jsonb_array_elements(src.items) WITH ORDINALITY AS t(elem, pos)
+        WHERE src.id = :draft_id AND t.elem->>'id' = :item_id
+        LIMIT 1
+    ) AS e
+    WHERE d.id = :draft_id AND d.owner_user_id = :owner AND d.status = 'draft'
+      AND {not_purged_sql("d")}
+""")
+
+_APPEND_ITEMS_SQL = text(f"""
+    UPDATE import_drafts
+    SET items = coalesce(items, '[]'::jsonb) || CAST(:items AS jsonb),
+        updated_at = now()
+    WHERE id = :draft_id AND owner_user_id = :owner AND status = 'draft'
+      AND {not_purged_sql("import_drafts")}
+""")
+
+
+async def patch_draft_item(
+    db: AsyncSession, draft_id: str, item_id: str, patch: DraftItemPatch, owner_user_id: str
+) -> Optional[dict]:
+    """Merge *patch* into one item. Returns the updated item, or None if not found."""
+    result = await db.execute(
+        _PATCH_ITEM_SQL,
+        {
+            "draft_id": draft_id,
+            "item_id": item_id,
+            "owner": owner_user_id,
+            "patch": json.dumps(patch.model_dump(exclude_unset=True)),
+        },
+    )
+    row = result.first()
+    if row is None:
+        return None
+    item = row[0]
+    return json.loads(item) if isinstance(item, str) else item
+
+
+async def delete_draft_item(db: AsyncSession, draft_id: str, item_id: str, owner_user_id: str) -> bool:
+    result = await db.execute(
+        _DELETE_ITEM_SQL, {"draft_id": draft_id, "item_id": item_id, "owner": owner_user_id}
+    )
+    return result.rowcount > 0
+
+
+async def append_draft_items(db: AsyncSession, draft_id: str, items: list[dict], owner_user_id: str) -> bool:
+    """Append already-validated item dicts to the end of a draft."""
+    result = await db.execute(
+        _APPEND_ITEMS_SQL,
+        {"draft_id": draft_id, "items": json.dumps(items, ensure_ascii=False), "owner": owner_user_id},
+    )
+    return result.rowcount > 0
+
+
 async def finalize_draft(db: AsyncSession, draft_id: str) -> Optional[ImportDraft]:
     draft = await get_draft(db, draft_id)
     if draft is None:
@@ -68,6 +152,24 @@ async def finalize_draft(db: AsyncSession, draft_id: str) -> Optional[ImportDraf
     return draft
 
 
+async def mark_finalized(db: AsyncSession, draft_id: str, owner_user_id: str) -> bool:
+    """Atomically flip an owned draft from "draft" to "finalized".
+
+    Returns False if the draft is missing, not owned, or already finalized,
+    so two concurrent finalize requests cannot both create tasks.
+    """
+    result = await db.execute(
+        update(ImportDraft)
+        .where(
+            ImportDraft.id == draft_id,
+            ImportDraft.owner_user_id == owner_user_id,
+            ImportDraft.status == "draft",
+        )
+        .values(status="finalized", updated_at=datetime.utcnow())
+    )
+    return result.rowcount > 0
+
+
 async def delete_draft(db: AsyncSession, draft_id: str) -> bool:
     result = await db.execute(delete(ImportDraft).where(ImportDraft.id == draft_id))
     return result.rowcount > 0
@@ -0,0 +1,68 @@
+"""CRUD helpers for background import jobs."""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.import_job import ImportJob
+
+# A running job that has not reported progress for this long is assumed to
+# have died with its worker process.
+STALE_AFTER = timedelta(minutes=10)
+MAX_ITEM_ERRORS = 100
+
+
+async def create_job(
+    db: AsyncSession, kind: str, owner_user_id: str, draft_id: Optional[str] = None
+) -> ImportJob:
+    now = datetime.now(timezone.utc)
+    job = ImportJob(
+        id=str(uuid.uuid4()),
+        kind=kind,
+        status="queued",
+        draft_id=draft_id,
+        total_items=0,
+        processed_items=0,
+        item_errors=[],
+        result={},
+        owner_user_id=owner_user_id,
+        created_at=now,
+        updated_at=now,
+    )
+    db.add(job)
+    await db.flush()
+    return job
+
+
+async def get_job(db: AsyncSession, job_id: str) -> Optional[ImportJob]:
+    result = await db.execute(select(ImportJob).where(ImportJob.id == job_id))
+    job = result.scalar_one_or_none()
+    if job and job.status in ("queued", "running") and job.updated_at is not None:
+        if datetime.now(timezone.utc) - job.updated_at > STALE_AFTER:
+            job.status = "failed"
+            job.error = "Tiến trình nhập bị gián đoạn, vui lòng thử lại."
+            await db.flush()
+    return job
+
+
+async def list_jobs(db: AsyncSession, owner_user_id: str, limit: int = 20) -> list[ImportJob]:
+    result = await db.execute(
+        select(ImportJob)
+        .where(ImportJob.owner_user_id == owner_user_id)
+        .order_by(ImportJob.created_at.desc())
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def update_job(db: AsyncSession, job_id: str, **values) -> None:
+    """Set columns on a job and bump updated_at (the worker's heartbeat)."""
+    await db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id)
+        .values(**values, updated_at=datetime.now(timezone.utc))
+    )
@@ -1,51 +1,168 @@
 from __future__ import annotations
 
+import heapq
 import uuid
 from typing import Optional
 
-from sqlalchemy import select
+from pydantic import ValidationError
+from sqlalchemy import ColumnElement, func, insert, literal_column, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud import library_cache
 from app.models.library import LibraryItem
-from app.schemas.library import LibraryItemCreate
+from app.schemas.library import LibraryItemCreate, LibraryItemSchema
 
+# Must match the expressions in the ix_library_items_search_* indexes.
+_SEARCH_CONFIG = literal_column("'simple'::regconfig")
 
-async def list_library(db: AsyncSession, owner_user_id: str) -> list[LibraryItem]:
-    """Return system-shared items (owner_user_id IS NULL) + user's own items."""
-    from sqlalchemy import or_, null
-    result = await db.execute(
+
+def _visible_to(owner_user_id: str) -> ColumnElement[bool]:
+    """System-shared items (owner_user_id IS NULL) + the user's own items."""
+    return or_(LibraryItem.owner_user_id == None, LibraryItem.owner_user_id == owner_user_id)  # noqa: E711
+
+
+def _page(items: list, limit: Optional[int], offset: int) -> list:
+    return items[offset:offset + limit] if limit is not None else items[offset:]
+
+
+def _sort_key(item: LibraryItemSchema) -> tuple[str, str, str]:
+    return item.subject, item.title, item.id
+
+
+async def list_library(
+    db: AsyncSession,
+    owner_user_id: str,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> list[LibraryItemSchema]:
+    """Return system-shared items (cached) + user's own items, by subject/title."""
+    catalog = await library_cache.get_shared_catalog()
+    stmt = (
         select(LibraryItem)
-        .where(or_(LibraryItem.owner_user_id == None, LibraryItem.owner_user_id == owner_user_id))  # noqa: E711
-        .order_by(LibraryItem.subject, LibraryItem.title)
+        .where(LibraryItem.owner_user_id == owner_user_id)
+        .order_by(LibraryItem.subject, LibraryItem.title, LibraryItem.id)
     )
-    return list(result.scalars().all())
+    if limit is not None:
+        # Only the first offset+limit private rows can land on this page.
+        stmt = stmt.limit(offset + limit)
+    private = [LibraryItemSchema.model_validate(row) for row in (await db.execute(stmt)).scalars()]
+    merged = list(heapq.merge(catalog.items, private, key=_sort_key))
+    return _page(merged, limit, offset)
 
 
-async def search_library(
-    db: AsyncSession, owner_user_id: str, query: Optional[str] = None, subject: Optional[str] = None
+async def search_private_library(
+    db: AsyncSession,
+    owner_user_id: str,
+    query: Optional[str] = None,
+    subject: Optional[str] = None,
+    include_shared: bool = False,
+    limit: Optional[int] = None,
+    offset: int = 0,
 ) -> list[LibraryItem]:
-    from sqlalchemy import or_
-    stmt = select(LibraryItem).where(
-        or_(LibraryItem.owner_user_id == None, LibraryItem.owner_user_id == owner_user_id)  # noqa: E711
-    )
-    items = (await db.execute(stmt)).scalars().all()
-    results = []
-    for item in items:
-        match_query = (
-            query.lower() in f"{item.title} {item.summary}".lower() if query else True
+    """Accent-insensitive SQL search over title, summary and tags.
+
+    Every query token must prefix-match a word of the item — the rule of
+    `library_cache.score_item`, so partially typed words match — through
+    the full-text index. Ranked by ts_rank.
+    """
+    if include_shared:
+        stmt = select(LibraryItem).where(_visible_to(owner_user_id))
+    else:
+        stmt = select(LibraryItem).where(LibraryItem.owner_user_id == owner_user_id)
+    if subject:
+        stmt = stmt.where(LibraryItem.subject == subject)
+
+    tokens = library_cache.tokenize(query or "")
+    if tokens:
+        document = func.library_search_document(LibraryItem.title, LibraryItem.summary, LibraryItem.tags)
+        tsvector = func.to_tsvector(_SEARCH_CONFIG, document)
+        # tokens are normalized \w+ runs, safe to splice into tsquery syntax
+        tsquery = func.to_tsquery(_SEARCH_CONFIG, " & ".join(f"{token}:*" for token in tokens))
+        stmt = stmt.where(tsvector.op("@@")(tsquery)).order_by(
+            func.ts_rank(tsvector, tsquery).desc(),
+            LibraryItem.title,
+            LibraryItem.id,
         )
-        match_subject = item.subject == subject if subject else True
-        if match_query and match_subject:
-            results.append(item)
-    return results
-
-
-async def save_library_items(db: AsyncSession, items: list[LibraryItemCreate], owner_user_id: Optional[str] = None) -> list[LibraryItem]:
-    saved = []
-    for payload in items:
-        data = payload.model_dump()
-        item = LibraryItem(id=str(uuid.uuid4()), **data, owner_user_id=owner_user_id)
-        db.add(item)
-        saved.append(item)
-    await db.flush()
-    return saved
+    else:
+        stmt = stmt.order_by(LibraryItem.subject, LibraryItem.title, LibraryItem.id)
+
+    result = await db.execute(stmt.offset(offset).limit(limit))
+    return list(result.scalars().all())
+
+
+async def search_library(
+    db: AsyncSession,
+    owner_user_id: str,
+    query: Optional[str] = None,
+    subject: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> list[LibraryItemSchema]:
+    """Search shared items in the in-memory index and private items in SQL.
+
+    Both sides match with the prefix rule of `library_cache.score_item` and
+    are scored by it, so the merged ranking is consistent. The score also
+    drops the rare SQL hit the Python tokenizer splits differently.
+    """
+    tokens = library_cache.tokenize(query or "")
+    catalog = await library_cache.get_shared_catalog()
+    scored = catalog.search(tokens, subject)
+
+    for row in await search_private_library(db, owner_user_id, query=query, subject=subject):
+        item = LibraryItemSchema.model_validate(row)
+        if not tokens:
+            scored.append((0, item))
+        elif score := library_cache.score_item(tokens, item):
+            scored.append((score, item))
+
+    if tokens:
+        scored.sort(key=lambda pair: (-pair[0], pair[1].title, pair[1].id))
+    else:
+        scored.sort(key=lambda pair: _sort_key(pair[1]))
+    return _page([item for _, item in scored], limit, offset)
+
+
+async def save_library_items(db: AsyncSession, items: list[LibraryItemCreate], owner_user_id: Optional[str] = None) -> list[LibraryItemSchema]:
+    rows = [
+        {"id": str(uuid.uuid4()), **payload.model_dump(), "owner_user_id": owner_user_id}
+        for payload in items
+    ]
+    await bulk_insert_library_items(db, rows)
+    return [LibraryItemSchema.model_validate(row) for row in rows]
+
+
+async def bulk_insert_library_items(db: AsyncSession, rows: list[dict]) -> list[str]:
+    """Insert many rows with batched multi-row INSERT ... RETURNING id.
+
+    Goes through SQLAlchemy's insertmanyvalues path: no ORM object is built
+    per row and rows are sent to the server in pages of up to 1000.
+    """
+    if not rows:
+        return []
+    result = await db.execute(insert(LibraryItem).returning(LibraryItem.id), rows)
+    return list(result.scalars().all())
+
+
+def validate_library_records(
+    records: list[tuple[int, dict]],
+    owner_user_id: Optional[str] = None,
+) -> tuple[list[dict], list[dict]]:
+    """Validate one chunk of (line_no, record) pairs.
+
+    Returns (insertable rows, errors) — a bad record never aborts the chunk.
+    """
+    rows: list[dict] = []
+    errors: list[dict] = []
+    for line_no, record in records:
+        if "__error__" in record:
+            errors.append({"line": line_no, "error": record["__error__"]})
+            continue
+        try:
+            payload = LibraryItemCreate.model_validate(record)
+        except ValidationError as exc:
+            first = exc.errors()[0]
+            field = ".".join(str(p) for p in first["loc"])
+            errors.append({"line": line_no, "error": f"{field}: {first['msg']}"})
+            continue
+        rows.append({"id": str(uuid.uuid4()), **payload.model_dump(), "owner_user_id": owner_user_id})
+    return rows, errors
@@ -0,0 +1,160 @@
+"""Process-level cache of the system-shared library catalog.
+
+System items (owner_user_id IS NULL) are identical for every user, so they
+are loaded once, validated once, and indexed in memory: an inverted index
+over normalized title/summary/tags tokens plus a per-subject index. Request
+handlers merge the catalog with the caller's private items from the DB.
+
+The admin add/delete endpoints call `invalidate()`. Other worker processes
+pick up changes when their copy expires after `library_cache_ttl_seconds`.
+
+The snapshot outlives the request that loads it, so it is always read from
+the primary in a session of its own — never from a lagging replica that the
+caller may be reading with, which would pin stale items for a whole TTL.
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+import unicodedata
+from bisect import bisect_left
+from typing import Iterable, Optional
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.library import LibraryItem
+from app.schemas.library import LibraryItemSchema
+
+_TOKEN_RE = re.compile(r"\w+")
+_TITLE_BOOST = 2
+
+
+def normalize(text: str) -> str:
+    """Lowercase and strip Vietnamese diacritics ("Đạo hàm" -> "dao ham")."""
+    decomposed = unicodedata.normalize("NFD", text.lower().replace("đ", "d"))
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(normalize(text))
+
+
+def score_item(query_tokens: list[str], item: LibraryItemSchema) -> int:
+    """Relevance of one item; 0 when some query token matches nothing.
+
+    Each query token must prefix-match a token of the item (so partially
+    typed words still match). Title hits count double.
+    """
+    title_tokens = tokenize(item.title)
+    body_tokens = tokenize(f"{item.summary} {' '.join(item.tags)}")
+    score = 0
+    for q in query_tokens:
+        if any(t.startswith(q) for t in title_tokens):
+            score += _TITLE_BOOST
+        elif any(t.startswith(q) for t in body_tokens):
+            score += 1
+        else:
+            return 0
+    return score
+
+
+class SharedCatalog:
+    """Immutable snapshot of system library items with prebuilt indexes."""
+
+    def __init__(self, items: Iterable[LibraryItemSchema]) -> None:
+        self.items: list[LibraryItemSchema] = sorted(
+            items, key=lambda i: (i.subject, i.title, i.id)
+        )
+        self._by_subject: dict[str, list[int]] = {}
+        # token -> {item index: weight}
+        self._postings: dict[str, dict[int, int]] = {}
+        for idx, item in enumerate(self.items):
+            self._by_subject.setdefault(item.subject, []).append(idx)
+            for token in tokenize(f"{item.summary} {' '.join(item.tags)}"):
+                self._postings.setdefault(token, {}).setdefault(idx, 1)
+            for token in tokenize(item.title):
+                self._postings.setdefault(token, {})[idx] = _TITLE_BOOST
+        self._vocabulary: list[str] = sorted(self._postings)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def by_subject(self, subject: str) -> list[LibraryItemSchema]:
+        return [self.items[i] for i in self._by_subject.get(subject, [])]
+
+    def _prefix_matches(self, prefix: str) -> dict[int, int]:
+        """Best weight per item over every vocabulary token starting with *prefix*."""
+        matches: dict[int, int] = {}
+        pos = bisect_left(self._vocabulary, prefix)
+        while pos < len(self._vocabulary) and self._vocabulary[pos].startswith(prefix):
+            for idx, weight in self._postings[self._vocabulary[pos]].items():
+                if weight > matches.get(idx, 0):
+                    matches[idx] = weight
+            pos += 1
+        return matches
+
+    def search(
+        self, query_tokens: list[str], subject: Optional[str] = None
+    ) -> list[tuple[int, LibraryItemSchema]]:
+        """Return (score, item) for items matching every query token."""
+        if not query_tokens:
+            items = self.by_subject(subject) if subject else self.items
+            return [(0, item) for item in items]
+
+        scores: Optional[dict[int, int]] = None
+        for token in query_tokens:
+            matches = self._prefix_matches(token)
+            if scores is None:
+                scores = matches
+            else:
+                scores = {i: s + matches[i] for i, s in scores.items() if i in matches}
+            if not scores:
+                return []
+
+        results = []
+        for idx, score in scores.items():
+            item = self.items[idx]
+            if subject and item.subject != subject:
+                continue
+            results.append((score, item))
+        return results
+
+
+_catalog: Optional[SharedCatalog] = None
+_loaded_at = 0.0
+_generation = 0
+_lock = asyncio.Lock()
+
+
+async def _load() -> SharedCatalog:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(LibraryItem).where(LibraryItem.owner_user_id == None)  # noqa: E711
+        )
+        return SharedCatalog(LibraryItemSchema.model_validate(row) for row in result.scalars())
+
+
+async def get_shared_catalog() -> SharedCatalog:
+    global _catalog, _loaded_at
+    if _catalog is not None and time.monotonic() - _loaded_at < settings.library_cache_ttl_seconds:
+        return _catalog
+    async with _lock:
+        # Another request may have reloaded while we waited for the lock.
+        if _catalog is not None and time.monotonic() - _loaded_at < settings.library_cache_ttl_seconds:
+            return _catalog
+        generation = _generation
+        catalog = await _load()
+        # Drop the result if invalidate() ran while we were loading.
+        if generation == _generation:
+            _catalog, _loaded_at = catalog, time.monotonic()
+        return catalog
+
+
+def invalidate() -> None:
+    """Discard the cached catalog; the next request reloads it."""
+    global _catalog, _generation
+    _catalog = None
+    _generation += 1
@@ -0,0 +1,10 @@
+"""LIKE pattern helpers shared by the search queries."""
+from __future__ import annotations
+
+# Pass as `.like(pattern, escape=LIKE_ESCAPE)`.
+LIKE_ESCAPE = "!"
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards in user input so they match literally."""
+    return value.replace("!", "!!").replace("%", "!%").replace("_", "!_")
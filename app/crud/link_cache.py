@@ -0,0 +1,71 @@
+"""Process-level cache of each parent's actively linked children.
+
+Parent child-data endpoints authorize with a set lookup instead of a query.
+A hit is trusted; a miss is confirmed against the database, so a link that
+was activated in another worker process is never refused. The link routes
+invalidate the parent's entry after committing, so a concurrent request
+cannot reload the pre-commit state into the cache. A revocation made by
+another worker is honored once that worker's entry expires, after
+`parent_link_cache_ttl_seconds`.
+
+Callers pass the primary session: an entry loaded from a lagging replica
+would keep a just-revoked link authorized for a whole TTL.
+"""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.parent import ParentStudentLink
+
+MAX_CACHED_PARENTS = 50_000
+
+# parent_id -> (active student ids, loaded_at); least recently used first
+_children: OrderedDict[str, tuple[frozenset[str], float]] = OrderedDict()
+
+
+async def _load(db: AsyncSession, parent_id: str) -> frozenset[str]:
+    result = await db.execute(
+        select(ParentStudentLink.student_id).where(
+            ParentStudentLink.parent_id == parent_id,
+            ParentStudentLink.status == "active",
+        )
+    )
+    return frozenset(result.scalars().all())
+
+
+def _cached(parent_id: str) -> Optional[frozenset[str]]:
+    """The parent's unexpired entry, or None."""
+    entry = _children.get(parent_id)
+    if entry is None or time.monotonic() - entry[1] >= settings.parent_link_cache_ttl_seconds:
+        return None
+    _children.move_to_end(parent_id)
+    return entry[0]
+
+
+async def active_children(db: AsyncSession, parent_id: str, refresh: bool = False) -> frozenset[str]:
+    if not refresh and (children := _cached(parent_id)) is not None:
+        return children
+    children = await _load(db, parent_id)
+    _children[parent_id] = (children, time.monotonic())
+    _children.move_to_end(parent_id)
+    while len(_children) > MAX_CACHED_PARENTS:
+        _children.popitem(last=False)
+    return children
+
+
+async def is_active_link(db: AsyncSession, parent_id: str, student_id: str) -> bool:
+    children = _cached(parent_id)
+    if children is not None and student_id in children:
+        return True
+    # a miss, or a link activated since the entry was loaded: one DB check
+    return student_id in await active_children(db, parent_id, refresh=True)
+
+
+def invalidate(parent_id: str) -> None:
+    _children.pop(parent_id, None)
@@ -2,22 +2,21 @@
 from __future__ import annotations
 
 import uuid
+from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud import statements
+from app.crud.account_purge import not_purged, not_purged_sql
 from app.models.parent import ParentStudentLink, ParentSuggestion
+from app.models.task import Task
 from app.models.user import User
 
 
 async def get_link(db: AsyncSession, parent_id: str, student_id: str) -> Optional[ParentStudentLink]:
-    result = await db.execute(
-        select(ParentStudentLink).where(
-            ParentStudentLink.parent_id == parent_id,
-            ParentStudentLink.student_id == student_id,
-        )
-    )
+    result = await db.execute(statements.link(parent_id, student_id))
     return result.scalar_one_or_none()
 
 
@@ -124,3 +123,118 @@ async def update_suggestion_status(
         suggestion.status = status
         await db.flush()
     return suggestion
+
+
+# ---- Dashboard overview (batched over all children) ----
+
+async def list_usernames(db: AsyncSession, user_ids: list[str]) -> dict[str, str]:
+    if not user_ids:
+        return {}
+    result = await db.execute(select(User.id, User.username).where(User.id.in_(user_ids)))
+    return dict(result.all())
+
+
+async def task_stats_by_owner(
+    db: AsyncSession, owner_ids: list[str], now: datetime
+) -> dict[str, tuple[int, int, int]]:
+    """owner_id -> (total, done, overdue) task counts, in one GROUP BY."""
+    if not owner_ids:
+        return {}
+    unfinished = Task.progress_minutes < Task.estimated_minutes
+    result = await db.execute(
+        select(
+            Task.owner_user_id,
+            func.count(),
+            func.count().filter(~unfinished),
+            func.count().filter(unfinished, Task.deadline <= now),
+        )
+        .where(Task.owner_user_id.in_(owner_ids), not_purged(Task.owner_user_id, Task.created_at))
+        .group_by(Task.owner_user_id)
+    )
+    return {owner: (total, done, overdue) for owner, total, done, overdue in result.all()}
+
+
+async def overdue_tasks_by_owner(
+    db: AsyncSession, owner_ids: list[str], now: datetime, per_owner: int
+) -> dict[str, list]:
+    """The *per_owner* most recently overdue unfinished tasks of each owner."""
+    if not owner_ids:
+        return {}
+    ranked = (
+        select(
+            Task.id,
+            Task.subject,
+            Task.title,
+            Task.deadline,
+            (Task.estimated_minutes - Task.progress_minutes).label("remaining_minutes"),
+            Task.owner_user_id,
+            func.row_number()
+            .over(partition_by=Task.owner_user_id, order_by=Task.deadline.desc())
+            .label("rank"),
+        )
+        .where(
+            Task.owner_user_id.in_(owner_ids),
+            Task.progress_minutes < Task.estimated_minutes,
+            Task.deadline <= now,
+            not_purged(Task.owner_user_id, Task.created_at),
+        )
+        .subquery()
+    )
+    result = await db.execute(
+        select(ranked).where(ranked.c.rank <= per_owner).order_by(ranked.c.deadline.desc())
+    )
+    grouped: dict[str, list] = {}
+    for row in result.all():
+        grouped.setdefault(row.owner_user_id, []).append(row)
+    return grouped
+
+
+# Latest plan per owner, reduced in SQL to session counts and the next few
+# pending sessions so the full sessions JSON never leaves the database.
+_PLAN_SUMMARY_SQL = text(f"""
+    SELECT p.owner_user_id, p.plan_version, p.generated_at,
+           c.sessions_total, c.sessions_done, u.upcoming
+    FROM (
+        SELECT DISTINCT ON (owner_user_id) owner_user_id, plan_version, generated_at, sessions
+        FROM plan_records
+        WHERE owner_user_id IN :owner_ids AND {not_purged_sql("plan_records")}
+        ORDER BY owner_user_id, created_at DESC
+    ) AS p
+    CROSS JOIN LATERAL (
+        SELECT count(*) AS sessions_total,
+               count(*) FILTER (WHERE e->>'status' = 'done') AS sessions_done
+        FROM jsonb_array_elements(p.sessions) AS e
+        WHERE e->>'source' <> 'break'
+    ) AS c
+    CROSS JOIN LATERAL (
+        SELECT coalesce(jsonb_agg(n.session ORDER BY n.starts_at), '[]'::jsonb) AS upcoming
+        FROM (
+            SELECT (e->>'plannedStart')::timestamptz AS starts_at,
+                   jsonb_build_object(
+                       'id', e->>'id',
+                       'subject', e->>'subject',
+                       'title', e->>'title',
+                       'planned_start', e->>'plannedStart',
+                       'planned_end', e->>'plannedEnd',
+                       'minutes', (e->>'minutes')::int
+                   ) AS session
+            FROM jsonb_array_elements(p.sessions) AS e
+            WHERE e->>'source' <> 'break'
+              AND e->>'status' = 'pending'
+              AND (e->>'plannedStart')::timestamptz >= :now
+            ORDER BY starts_at
+            LIMIT :per_owner
+        ) AS n
+    ) AS u
+""").bindparams(bindparam("owner_ids", expanding=True))
+
+
+async def plan_summaries_by_owner(
+    db: AsyncSession, owner_ids: list[str], now: datetime, per_owner: int
+) -> dict[str, object]:
+    if not owner_ids:
+        return {}
+    result = await db.execute(
+        _PLAN_SUMMARY_SQL, {"owner_ids": owner_ids, "now": now, "per_owner": per_owner}
+    )
+    return {row.owner_user_id: row for row in result.all()}
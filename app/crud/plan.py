@@ -4,9 +4,11 @@ import uuid
 from datetime import date, datetime
 from typing import Any, Optional
 
-from sqlalchemy import select
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud import statements
+from app.crud.account_purge import not_purged, not_purged_sql
 from app.models.plan import PlanRecord
 from app.schemas.plan import PlanRecordSchema
 
@@ -26,7 +28,10 @@ def _to_json_safe(obj: Any) -> Any:
 async def get_plan_history(db: AsyncSession, owner_user_id: str, limit: int = 5) -> list[PlanRecord]:
     result = await db.execute(
         select(PlanRecord)
-        .where(PlanRecord.owner_user_id == owner_user_id)
+        .where(
+            PlanRecord.owner_user_id == owner_user_id,
+            not_purged(PlanRecord.owner_user_id, PlanRecord.created_at),
+        )
         .order_by(PlanRecord.created_at)
         .limit(limit)
     )
@@ -34,15 +39,98 @@ async def get_plan_history(db: AsyncSession, owner_user_id: str, limit: int = 5)
 
 
 async def get_latest_plan(db: AsyncSession, owner_user_id: str) -> Optional[PlanRecord]:
-    result = await db.execute(
-        select(PlanRecord)
-        .where(PlanRecord.owner_user_id == owner_user_id)
-        .order_by(PlanRecord.created_at.desc())
-        .limit(1)
-    )
+    result = await db.execute(statements.latest_plan(owner_user_id))
+    return result.scalar_one_or_none()
+
+
+# Row version of the latest plan: xmin changes on every UPDATE of the row
+# (session status changes keep id and plan_version), so this identifies
+# the exact stored content without reading the JSONB.
+_LATEST_PLAN_VERSION_SQL = text(f"""
+    SELECT id || ':' || plan_version || ':' || xmin::text
+    FROM plan_records
+    WHERE owner_user_id = :owner AND {not_purged_sql("plan_records")}
+    ORDER BY created_at DESC
+    LIMIT 1
+""")
+
+# The `GET /plan/latest` body, rendered by Postgres from the stored JSONB.
+# Keys match PlanRecordSchema.model_dump(by_alias=True).
+_LATEST_PLAN_JSON_SQL = text(f"""
+    SELECT id || ':' || plan_version || ':' || xmin::text AS version,
+           jsonb_build_object(
+               'id', id,
+               'planVersion', plan_version,
+               'sessions', coalesce(sessions, '[]'::jsonb),
+               'unscheduledTasks', coalesce(unscheduled_tasks, '[]'::jsonb),
+               'suggestions', coalesce(suggestions, '[]'::jsonb),
+               'generatedAt', generated_at,
+               'owner_user_id', NULL
+           )::text AS body
+    FROM plan_records
+    WHERE owner_user_id = :owner AND {not_purged_sql("plan_records")}
+    ORDER BY created_at DESC
+    LIMIT 1
+""")
+
+
+async def get_latest_plan_version(db: AsyncSession, owner_user_id: str) -> Optional[str]:
+    result = await db.execute(_LATEST_PLAN_VERSION_SQL, {"owner": owner_user_id})
     return result.scalar_one_or_none()
 
 
+async def get_latest_plan_json(db: AsyncSession, owner_user_id: str):
+    """Latest plan as a ready-to-send JSON document, never decoded in Python.
+
+    Returns a row (version, body) or None; `version` is the same value as
+    `get_latest_plan_version`.
+    """
+    result = await db.execute(_LATEST_PLAN_JSON_SQL, {"owner": owner_user_id})
+    return result.one_or_none()
+
+
+# Latest plan reduced in SQL to the sessions starting inside [:start, :end),
+# with only the fields a calendar view renders.
+_PLAN_WINDOW_SQL = text(f"""
+    SELECT p.id AS plan_id, p.plan_version, p.generated_at,
+           jsonb_array_length(coalesce(p.unscheduled_tasks, '[]'::jsonb)) AS unscheduled_count,
+           coalesce(w.sessions, '[]'::jsonb) AS sessions
+    FROM (
+        SELECT id, plan_version, generated_at, sessions, unscheduled_tasks
+        FROM plan_records
+        WHERE owner_user_id = :owner AND {not_purged_sql("plan_records")}
+        ORDER BY created_at DESC
+        LIMIT 1
+    ) AS p
+    CROSS JOIN LATERAL (
+        SELECT jsonb_agg(
+                   jsonb_build_object(
+                       'id', e->>'id',
+                       'task_id', e->>'taskId',
+                       'habit_id', e->>'habitId',
+                       'source', e->>'source',
+                       'subject', e->>'subject',
+                       'title', e->>'title',
+                       'planned_start', e->>'plannedStart',
+                       'planned_end', e->>'plannedEnd',
+                       'minutes', (e->>'minutes')::int,
+                       'status', e->>'status'
+                   )
+                   ORDER BY (e->>'plannedStart')::timestamptz
+               ) AS sessions
+        FROM jsonb_array_elements(p.sessions) AS e
+        WHERE (e->>'plannedStart')::timestamptz >= :start
+          AND (e->>'plannedStart')::timestamptz < :end
+    ) AS w
+""")
+
+
+async def get_plan_window(db: AsyncSession, owner_user_id: str, start: datetime, end: datetime):
+    """Latest plan of *owner_user_id* trimmed to sessions in [start, end), or None."""
+    result = await db.execute(_PLAN_WINDOW_SQL, {"owner": owner_user_id, "start": start, "end": end})
+    return result.one_or_none()
+
+
 async def save_plan(db: AsyncSession, plan: PlanRecordSchema) -> PlanRecord:
     # Serialize sessions with camelCase aliases so the frontend receives them correctly.
     # Use mode='json' (Pydantic v2) so datetime fields become ISO strings; fall back to
@@ -87,16 +175,23 @@ async def remove_habit_from_plans(db: AsyncSession, habit_id: str, owner_user_id
 async def remove_task_from_plans(db: AsyncSession, task_id: str, owner_user_id: str) -> None:
     """Remove all sessions and unscheduled_task entries referencing *task_id*
     from every stored plan record."""
+    await remove_tasks_from_plans(db, {task_id}, owner_user_id)
+
+
+async def remove_tasks_from_plans(db: AsyncSession, task_ids: set[str], owner_user_id: str) -> None:
+    """Like `remove_task_from_plans` for many tasks, in a single pass over the plans."""
+    if not task_ids:
+        return
     result = await db.execute(select(PlanRecord).where(PlanRecord.owner_user_id == owner_user_id))
     records: list[PlanRecord] = list(result.scalars().all())
     for record in records:
         new_sessions = [
             s for s in (record.sessions or [])
-            if s.get("taskId") != task_id
+            if s.get("taskId") not in task_ids
         ]
         new_unscheduled = [
             t for t in (record.unscheduled_tasks or [])
-            if t.get("id") != task_id
+            if t.get("id") not in task_ids
         ]
         if new_sessions != record.sessions or new_unscheduled != record.unscheduled_tasks:
             record.sessions = new_sessions
@@ -7,21 +7,21 @@ from typing import Optional
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud import statements
+from app.crud.account_purge import not_purged
 from app.models.free_slot import FreeSlot
 from app.schemas.free_slot import FreeSlotCreate
 
 
 async def list_slots(db: AsyncSession, owner_user_id: str) -> list[FreeSlot]:
-    result = await db.execute(
-        select(FreeSlot)
-        .where(FreeSlot.owner_user_id == owner_user_id)
-        .order_by(FreeSlot.weekday, FreeSlot.start_time)
-    )
+    result = await db.execute(statements.slots_for_owner(owner_user_id))
     return list(result.scalars().all())
 
 
 async def get_slot(db: AsyncSession, slot_id: str) -> Optional[FreeSlot]:
-    result = await db.execute(select(FreeSlot).where(FreeSlot.id == slot_id))
+    result = await db.execute(
+        select(FreeSlot).where(FreeSlot.id == slot_id, not_purged(FreeSlot.owner_user_id, FreeSlot.created_at))
+    )
     return result.scalar_one_or_none()
 
 
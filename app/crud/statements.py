@@ -0,0 +1,70 @@
+"""Cached SELECT statements for the per-request hot paths.
+
+Every authenticated request loads the user, and the plan/dashboard
+endpoints load the latest plan, tasks and slots. Building those queries
+with `select(...)` on every call means constructing the expression tree
+and walking it again to compute the compiled-cache key. A `lambda_stmt`
+is built once per lambda: later calls only look up the cached tree and
+bind the closure values (here the ids) as parameters, and the compiled
+SQL comes from the engine's cache as before. asyncpg in turn reuses its
+prepared statement because the SQL text is identical on every call.
+
+Only closure *values* may vary between calls; the shape of each statement
+must not, so keep conditional clauses out of these lambdas. The
+`not_purged` filter is fixed SQL, built once with the rest of the tree.
+"""
+from __future__ import annotations
+
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+
+from app.crud.account_purge import not_purged
+from app.models.free_slot import FreeSlot
+from app.models.parent import ParentStudentLink
+from app.models.plan import PlanRecord
+from app.models.task import Task
+from app.models.user import User
+
+
+def user_by_id(user_id: str) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(User).where(User.id == user_id))
+
+
+def latest_plan(owner_user_id: str) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(PlanRecord)
+        .where(
+            PlanRecord.owner_user_id == owner_user_id,
+            not_purged(PlanRecord.owner_user_id, PlanRecord.created_at),
+        )
+        .order_by(PlanRecord.created_at.desc())
+        .limit(1)
+    )
+
+
+def tasks_for_owner(owner_user_id: str) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(Task)
+        .where(Task.owner_user_id == owner_user_id, not_purged(Task.owner_user_id, Task.created_at))
+        .order_by(Task.created_at)
+    )
+
+
+def slots_for_owner(owner_user_id: str) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(FreeSlot)
+        .where(
+            FreeSlot.owner_user_id == owner_user_id,
+            not_purged(FreeSlot.owner_user_id, FreeSlot.created_at),
+        )
+        .order_by(FreeSlot.weekday, FreeSlot.start_time)
+    )
+
+
+def link(parent_id: str, student_id: str) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(ParentStudentLink).where(
+            ParentStudentLink.parent_id == parent_id,
+            ParentStudentLink.student_id == student_id,
+        )
+    )
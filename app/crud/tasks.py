@@ -2,29 +2,125 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, exists, func, insert, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.time import as_vn_aware
+from app.crud import statements
+from app.crud.account_purge import not_purged
 from app.models.task import Task
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.schemas.task import TaskBase, TaskCreate, TaskUpdate
+
+
+def _row_values(payload: TaskBase, **extra) -> dict:
+    """Column values for a task payload; the ISO deadline becomes a datetime."""
+    data = payload.model_dump(by_alias=False, **extra)
+    if "deadline" in data:
+        data["deadline"] = as_vn_aware(data["deadline"])
+    return data
+
+
+# Hides tasks covered by a pending reset of their owner.
+_VISIBLE = not_purged(Task.owner_user_id, Task.created_at)
 
 
 async def list_tasks(db: AsyncSession, owner_user_id: str) -> list[Task]:
+    result = await db.execute(statements.tasks_for_owner(owner_user_id))
+    return list(result.scalars().all())
+
+
+async def list_active_tasks(db: AsyncSession, owner_user_id: str, now: datetime) -> list[Task]:
+    """Tasks with remaining work and a deadline after *now* (uses ix_tasks_owner_deadline)."""
     result = await db.execute(
-        select(Task).where(Task.owner_user_id == owner_user_id).order_by(Task.created_at)
+        select(Task)
+        .where(
+            Task.owner_user_id == owner_user_id,
+            Task.deadline > now,
+            Task.estimated_minutes > Task.progress_minutes,
+            _VISIBLE,
+        )
+        .order_by(Task.created_at)
     )
     return list(result.scalars().all())
 
 
+# ---------------------------------------------------------------------------
+# Keyset pagination over (deadline, id)
+# ---------------------------------------------------------------------------
+
+TaskStatus = Literal["active", "done", "overdue"]
+
+
+async def page_tasks(
+    db: AsyncSession,
+    owner_user_id: str,
+    *,
+    now: datetime,
+    limit: Optional[int] = None,
+    after: Optional[tuple[datetime, str]] = None,
+    subject: Optional[str] = None,
+    status: Optional[TaskStatus] = None,
+    due_from: Optional[datetime] = None,
+    due_to: Optional[datetime] = None,
+    columns: Optional[list[str]] = None,
+) -> list:
+    """Tasks ordered by (deadline, id), starting after the *after* key.
+
+    With *columns*, only those attributes (plus deadline and id, needed for
+    the cursor) are selected and plain Row objects are returned.
+    """
+    if columns:
+        wanted = dict.fromkeys(["id", "deadline", *columns])
+        stmt = select(*(getattr(Task, name) for name in wanted))
+    else:
+        stmt = select(Task)
+    stmt = stmt.where(Task.owner_user_id == owner_user_id, _VISIBLE)
+
+    if subject:
+        stmt = stmt.where(Task.subject == subject)
+    if status == "done":
+        stmt = stmt.where(Task.progress_minutes >= Task.estimated_minutes)
+    elif status == "active":
+        stmt = stmt.where(Task.progress_minutes < Task.estimated_minutes, Task.deadline > now)
+    elif status == "overdue":
+        stmt = stmt.where(Task.progress_minutes < Task.estimated_minutes, Task.deadline <= now)
+    # same reading of naive values as stored deadlines (see _row_values)
+    if due_from is not None:
+        stmt = stmt.where(Task.deadline >= as_vn_aware(due_from))
+    if due_to is not None:
+        stmt = stmt.where(Task.deadline < as_vn_aware(due_to))
+    if after is not None:
+        stmt = stmt.where(tuple_(Task.deadline, Task.id) > tuple_(*after))
+
+    stmt = stmt.order_by(Task.deadline, Task.id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    result = await db.execute(stmt)
+    return list(result.all() if columns else result.scalars().all())
+
+
+async def task_list_version(db: AsyncSession, owner_user_id: str) -> tuple[int, Optional[datetime]]:
+    """(count, latest updated_at) of the owner's tasks; changes on any insert/update/delete."""
+    result = await db.execute(
+        select(func.count(), func.max(Task.updated_at)).where(Task.owner_user_id == owner_user_id, _VISIBLE)
+    )
+    count, latest = result.one()
+    return count, latest
+
+
+async def has_tasks(db: AsyncSession, owner_user_id: str) -> bool:
+    return bool(await db.scalar(select(exists().where(Task.owner_user_id == owner_user_id, _VISIBLE))))
+
+
 async def get_task(db: AsyncSession, task_id: str) -> Optional[Task]:
-    result = await db.execute(select(Task).where(Task.id == task_id))
+    result = await db.execute(select(Task).where(Task.id == task_id, _VISIBLE))
     return result.scalar_one_or_none()
 
 
 async def create_task(db: AsyncSession, payload: TaskCreate, owner_user_id: str) -> Task:
-    data = payload.model_dump(by_alias=False)
+    data = _row_values(payload)
     task = Task(
         id=str(uuid.uuid4()),
         **data,
@@ -38,11 +134,41 @@ async def create_task(db: AsyncSession, payload: TaskCreate, owner_user_id: str)
     return task
 
 
+# asyncpg caps a statement at 32767 bind parameters
+_MAX_BIND_PARAMS = 32767
+
+
+async def bulk_create_tasks(db: AsyncSession, payloads: list[TaskCreate], owner_user_id: str) -> list[str]:
+    """Insert many tasks with multi-row INSERT statements.
+
+    One statement per ~1500 tasks (bounded by the bind parameter limit)
+    instead of one ORM add + flush per task. Returns ids in input order.
+    """
+    now = datetime.utcnow()
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            **_row_values(payload),
+            "owner_user_id": owner_user_id,
+            "created_at": now,
+            "updated_at": now,
+            "progress_minutes": 0,
+        }
+        for payload in payloads
+    ]
+    if not rows:
+        return []
+    per_statement = _MAX_BIND_PARAMS // len(rows[0])
+    for start in range(0, len(rows), per_statement):
+        await db.execute(insert(Task).values(rows[start:start + per_statement]))
+    return [row["id"] for row in rows]
+
+
 async def update_task(db: AsyncSession, task_id: str, payload: TaskUpdate) -> Optional[Task]:
     task = await get_task(db, task_id)
     if task is None:
         return None
-    data = payload.model_dump(by_alias=False, exclude_unset=True)
+    data = _row_values(payload, exclude_unset=True)
     for key, value in data.items():
         setattr(task, key, value)
     task.updated_at = datetime.utcnow()
@@ -63,3 +189,54 @@ async def update_task_progress(db: AsyncSession, task_id: str, progress_minutes:
     task.updated_at = datetime.utcnow()
     await db.flush()
     return task
+
+
+# ---------------------------------------------------------------------------
+# Set-based batch mutations
+# ---------------------------------------------------------------------------
+
+async def owned_task_ids(db: AsyncSession, task_ids: set[str], owner_user_id: str) -> set[str]:
+    """Subset of *task_ids* that exist and belong to *owner_user_id*."""
+    if not task_ids:
+        return set()
+    result = await db.execute(
+        select(Task.id).where(Task.id.in_(task_ids), Task.owner_user_id == owner_user_id, _VISIBLE)
+    )
+    return set(result.scalars().all())
+
+
+async def bulk_update_tasks(db: AsyncSession, updates: list[tuple[str, TaskUpdate]]) -> None:
+    """UPDATE many tasks by primary key, one executemany per set of sent fields.
+
+    Like `update_task`, only the fields present in each payload are written.
+    """
+    if not updates:
+        return
+    now = datetime.utcnow()
+    by_keys: dict[frozenset[str], list[dict]] = {}
+    for task_id, payload in updates:
+        values = _row_values(payload, exclude_unset=True)
+        by_keys.setdefault(frozenset(values), []).append({"id": task_id, **values, "updated_at": now})
+    for rows in by_keys.values():
+        await db.execute(update(Task).execution_options(synchronize_session=False), rows)
+
+
+async def bulk_update_progress(db: AsyncSession, progress: list[tuple[str, int]]) -> None:
+    if not progress:
+        return
+    now = datetime.utcnow()
+    await db.execute(
+        update(Task).execution_options(synchronize_session=False),
+        [{"id": task_id, "progress_minutes": minutes, "updated_at": now} for task_id, minutes in progress],
+    )
+
+
+async def bulk_delete_tasks(db: AsyncSession, task_ids: set[str], owner_user_id: str) -> int:
+    if not task_ids:
+        return 0
+    result = await db.execute(
+        delete(Task)
+        .where(Task.id.in_(task_ids), Task.owner_user_id == owner_user_id)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 import random
+import secrets
 import string
 import uuid
+from datetime import datetime
+from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import func, select, text, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import hash_password, verify_password
-from app.models.user import User
+from app.crud import statements
+from app.crud.like import LIKE_ESCAPE, escape_like
+from app.models.user import FULL_NAME, User
 from app.schemas.user import UserRegister, UserUpdate
 
 
@@ -22,7 +27,12 @@ async def get_user_by_username(db: AsyncSession, username: str) -> User | None:
 
 
 async def get_user_by_id(db: AsyncSession, user_id: str) -> User | None:
-    result = await db.execute(select(User).where(User.id == user_id))
+    result = await db.execute(statements.user_by_id(user_id))
+    return result.scalar_one_or_none()
+
+
+async def get_user_by_calendar_token(db: AsyncSession, token: str) -> User | None:
+    result = await db.execute(select(User).where(User.calendar_token == token))
     return result.scalar_one_or_none()
 
 
@@ -31,6 +41,73 @@ async def get_all_users(db: AsyncSession) -> list[User]:
     return list(result.scalars().all())
 
 
+# ---------------------------------------------------------------------------
+# Admin listing
+# ---------------------------------------------------------------------------
+
+# Exact counts above this are reported as "at least COUNT_CAP".
+COUNT_CAP = 10_000
+
+
+def _user_filters(role: Optional[str], is_active: Optional[bool], prefix: Optional[str]) -> list:
+    clauses = []
+    if role:
+        clauses.append(User.role == role)
+    if is_active is not None:
+        clauses.append(User.is_active == is_active)
+    if prefix:
+        pattern = escape_like(prefix.strip().lower()) + "%"
+        clauses.append(
+            func.lower(User.username).like(pattern, escape=LIKE_ESCAPE)
+            | func.lower(User.first_name).like(pattern, escape=LIKE_ESCAPE)
+            | func.lower(FULL_NAME).like(pattern, escape=LIKE_ESCAPE)
+        )
+    return clauses
+
+
+async def page_users(
+    db: AsyncSession,
+    *,
+    limit: Optional[int] = None,
+    after: Optional[tuple[datetime, str]] = None,
+    role: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    prefix: Optional[str] = None,
+) -> list[User]:
+    """Users ordered by (created_at, id), starting after the *after* key."""
+    stmt = select(User).where(*_user_filters(role, is_active, prefix))
+    if after is not None:
+        stmt = stmt.where(tuple_(User.created_at, User.id) > tuple_(*after))
+    stmt = stmt.order_by(User.created_at, User.id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    result = await db.execute(stmt)
+    return list(result.scalars().all())
+
+
+async def count_users(
+    db: AsyncSession,
+    role: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    prefix: Optional[str] = None,
+) -> tuple[int, bool]:
+    """Return (count, exact).
+
+    Unfiltered, the planner's row estimate from pg_class is used once the
+    table is big enough for it to matter. Filtered counts stop at COUNT_CAP.
+    """
+    filters = _user_filters(role, is_active, prefix)
+    if not filters:
+        estimate = await db.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'users'::regclass")
+        )
+        if estimate is not None and estimate > COUNT_CAP:
+            return int(estimate), False
+    capped = select(User.id).where(*filters).limit(COUNT_CAP + 1).subquery()
+    count = await db.scalar(select(func.count()).select_from(capped))
+    return min(count, COUNT_CAP), count <= COUNT_CAP
+
+
 async def create_user(db: AsyncSession, payload: UserRegister) -> User:
     link_code = _generate_link_code() if payload.role == "student" else None
     user = User(
@@ -89,3 +166,16 @@ async def rotate_link_code(db: AsyncSession, user: User) -> User:
     user.link_code = _generate_link_code()
     await db.flush()
     return user
+
+
+async def rotate_calendar_token(db: AsyncSession, user: User) -> User:
+    """Issue a fresh calendar feed token, invalidating any previously shared URL."""
+    user.calendar_token = secrets.token_urlsafe(32)
+    await db.flush()
+    return user
+
+
+async def revoke_calendar_token(db: AsyncSession, user: User) -> User:
+    user.calendar_token = None
+    await db.flush()
+    return user
@@ -1,33 +1,120 @@
+"""Engines, session factories and the request session dependencies.
+
+Writes always go to the primary. Read-only endpoints take `get_read_db`
+(app/core/deps.py), which uses `ReadSessionLocal` — bound to the replica
+when REPLICA_DATABASE_URL is set — unless the user committed a write in
+this process within `replica_read_your_writes_seconds`.
+"""
+import time
+
+from sqlalchemy import TextClause, event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 from app.config import settings
+from app.core.telemetry import TimedQueuePool, instrument_engine
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-)
+# Write marks older than the read-your-writes window are pruned past this size.
+MAX_TRACKED_WRITERS = 10_000
+
+
+def _create_engine(url: str):
+    return create_async_engine(
+        url,
+        echo=settings.db_echo,
+        poolclass=TimedQueuePool,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+    )
+
+
+class PrimarySession(Session):
+    """Sync session class behind primary AsyncSessions; flags writes in `info`."""
+
+
+engine = _create_engine(settings.database_url)
+instrument_engine(engine.sync_engine, "primary")
 
 AsyncSessionLocal = sessionmaker(
     bind=engine,
     class_=AsyncSession,
+    sync_session_class=PrimarySession,
+    expire_on_commit=False,
+)
+
+replica_engine = _create_engine(settings.replica_database_url) if settings.replica_database_url else None
+if replica_engine is not None:
+    instrument_engine(replica_engine.sync_engine, "replica")
+
+ReadSessionLocal = sessionmaker(
+    bind=replica_engine or engine,
+    class_=AsyncSession,
     expire_on_commit=False,
 )
 
 
+# ---------------------------------------------------------------------------
+# Read-your-writes tracking
+# ---------------------------------------------------------------------------
+
+# user id -> time.monotonic() of their last committed write in this process
+_recent_writes: dict[str, float] = {}
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _flag_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(PrimarySession, "do_orm_execute")
+def _flag_statement(orm_execute_state):
+    # Bulk update()/delete()/insert() and text() DML bypass the flush.
+    statement = orm_execute_state.statement
+    if isinstance(statement, TextClause):
+        wrote = statement.text.lstrip()[:6].upper() != "SELECT"
+    else:
+        wrote = not orm_execute_state.is_select
+    if wrote:
+        orm_execute_state.session.info["wrote"] = True
+
+
+def mark_written(user_id: str) -> None:
+    now = time.monotonic()
+    _recent_writes[user_id] = now
+    if len(_recent_writes) > MAX_TRACKED_WRITERS:
+        horizon = now - settings.replica_read_your_writes_seconds
+        for uid in [u for u, at in _recent_writes.items() if at < horizon]:
+            del _recent_writes[uid]
+
+
+def wrote_recently(user_id: str) -> bool:
+    at = _recent_writes.get(user_id)
+    return at is not None and time.monotonic() - at < settings.replica_read_your_writes_seconds
+
+
 class Base(DeclarativeBase):
     pass
 
 
 async def get_db() -> AsyncSession:
-    """Dependency that provides an async database session."""
+    """Dependency that provides an async database session.
+
+    FastAPI caches dependencies per request, so `get_current_user` and the
+    route handler receive the same session (and at most one pooled
+    connection, checked out on first use and returned at commit).
+    A committed write by the authenticated user is recorded for
+    read-your-writes routing.
+    """
     async with AsyncSessionLocal() as session:
         try:
             yield session
             await session.commit()
+            user_id = session.info.get("user_id")
+            if user_id and session.info.get("wrote"):
+                mark_written(user_id)
         except Exception:
             await session.rollback()
             raise
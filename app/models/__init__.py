@@ -11,11 +11,14 @@ from app.models.settings import AppSettings
 from app.models.profile import UserProfile
 from app.models.library import LibraryItem
 from app.models.import_draft import ImportDraft
+from app.models.import_job import ImportJob
+from app.models.account_purge import AccountPurge
 from app.models.user import User
 from app.models.parent import ParentStudentLink, ParentSuggestion
 
 __all__ = [
     "Task", "Habit", "FreeSlot", "PlanRecord",
     "Feedback", "AppSettings", "UserProfile", "LibraryItem", "ImportDraft",
+    "ImportJob", "AccountPurge",
     "User", "ParentStudentLink", "ParentSuggestion",
 ]
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class AccountPurge(Base):
+    """Tombstone for one account reset: everything the owner created up to
+    `cutoff` is deleted in the background; rows created later are kept."""
+
+    __tablename__ = "account_purges"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    owner_user_id: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    # shared by the purges of one admin off-boarding request
+    batch_id: Mapped[Optional[str]] = mapped_column(String, nullable=True, index=True)
+    requested_by: Mapped[str] = mapped_column(String, nullable=False)
+    cutoff: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # "queued" | "running" | "succeeded" | "failed"
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="queued")
+    rows_deleted: Mapped[int] = mapped_column(Integer, default=0)
+    # per-table deleted row counts, e.g. {"tasks": 120, "plan_records": 4000}
+    table_counts: Mapped[dict] = mapped_column(JSONB, default=dict)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    # "parse" (upload -> draft) | "finalize" (draft -> tasks)
+    kind: Mapped[str] = mapped_column(String(16), nullable=False)
+    # "queued" | "running" | "succeeded" | "failed"
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="queued")
+    draft_id: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    total_items: Mapped[int] = mapped_column(Integer, default=0)
+    processed_items: Mapped[int] = mapped_column(Integer, default=0)
+    # item-level validation problems: [{"line": int, "error": str}], capped
+    item_errors: Mapped[list] = mapped_column(JSONB, default=list)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # kind-specific output, e.g. {"createdTaskIds": [...]} for finalize jobs
+    result: Mapped[dict] = mapped_column(JSONB, default=dict)
+    owner_user_id: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Optional
 
-from sqlalchemy import String, Text
+from sqlalchemy import DDL, Index, String, Text, event
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -21,3 +21,49 @@ class LibraryItem(Base):
     tags: Mapped[list] = mapped_column(JSONB, default=list)
     # NULL = system-shared content; set to user id for user-created items
     owner_user_id: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
+
+    __table_args__ = (
+        Index("ix_library_items_owner_subject", "owner_user_id", "subject"),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Search support (Postgres only)
+# ---------------------------------------------------------------------------
+# unaccent() is only STABLE, so it is wrapped in IMMUTABLE functions that can
+# back expression indexes. library_search_document() is the single definition
+# of "searchable text" (title, summary and tags, like library_cache); the
+# search in crud/library.py uses the exact same expression so the planner
+# can use the index. Keep in sync with the alembic revisions.
+
+SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    """
+    CREATE OR REPLACE FUNCTION immutable_unaccent(text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION library_search_document(title text, summary text, tags jsonb) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE
+    AS $$ SELECT immutable_unaccent(lower(
+        coalesce(title, '') || ' ' || coalesce(summary, '') || ' ' || coalesce(
+            (SELECT string_agg(tag, ' ') FROM jsonb_array_elements_text(
+                CASE WHEN jsonb_typeof(tags) = 'array' THEN tags ELSE '[]'::jsonb END
+            ) AS tag),
+            ''
+        )
+    )) $$
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_library_items_search_fts ON library_items
+    USING gin (to_tsvector('simple'::regconfig, library_search_document(title, summary, tags)))
+    """,
+]
+
+for _statement in SEARCH_DDL:
+    event.listen(
+        LibraryItem.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
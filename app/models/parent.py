@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, String, func
+from sqlalchemy import DateTime, Index, String, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -11,6 +11,17 @@ from app.database import Base
 
 class ParentStudentLink(Base):
     __tablename__ = "parent_student_links"
+    __table_args__ = (
+        # One link per pair; INCLUDE lets the authorization check read status
+        # from the index alone.
+        Index(
+            "uq_parent_student_links_pair",
+            "parent_id",
+            "student_id",
+            unique=True,
+            postgresql_include=["status"],
+        ),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True)
     parent_id: Mapped[str] = mapped_column(String, nullable=False, index=True)
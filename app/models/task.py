@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, Integer, String, Text, func
+from sqlalchemy import DateTime, Index, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -12,11 +12,15 @@ from app.database import Base
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # "my tasks due before X" / active-task loads for plan rebuilds
+        Index("ix_tasks_owner_deadline", "owner_user_id", "deadline"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True)
     subject: Mapped[str] = mapped_column(String, nullable=False)
     title: Mapped[str] = mapped_column(String, nullable=False)
-    deadline: Mapped[str] = mapped_column(String, nullable=False)  # ISO string
+    deadline: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     timezone: Mapped[str] = mapped_column(String, default="Asia/Ho_Chi_Minh")
     difficulty: Mapped[int] = mapped_column(Integer, nullable=False)
     duration_estimate_min: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import date, datetime
 from typing import Optional
 
-from sqlalchemy import Date, DateTime, String, func
+from sqlalchemy import Date, DateTime, Index, String, func, literal_column
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -30,9 +30,34 @@ class User(Base):
 
     is_active: Mapped[bool] = mapped_column(default=True)
     link_code: Mapped[str | None] = mapped_column(String(8), nullable=True, unique=True, index=True)
+    # Secret for the read-only calendar subscription URL; NULL = feed disabled
+    calendar_token: Mapped[str | None] = mapped_column(String(64), nullable=True, unique=True, index=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
+
+
+# "Nguyễn Văn An"; a literal separator so queries match the index expression.
+FULL_NAME = User.last_name + literal_column("' '") + User.first_name
+
+# Admin listing: keyset order, and case-insensitive prefix search
+# (text_pattern_ops lets LIKE 'abc%' use a btree under any collation).
+Index("ix_users_created_at_id", User.created_at, User.id)
+Index(
+    "ix_users_username_prefix",
+    func.lower(User.username).label("username_lower"),
+    postgresql_ops={"username_lower": "text_pattern_ops"},
+)
+Index(
+    "ix_users_first_name_prefix",
+    func.lower(User.first_name).label("first_name_lower"),
+    postgresql_ops={"first_name_lower": "text_pattern_ops"},
+)
+Index(
+    "ix_users_full_name_prefix",
+    func.lower(FULL_NAME).label("full_name_lower"),
+    postgresql_ops={"full_name_lower": "text_pattern_ops"},
+)
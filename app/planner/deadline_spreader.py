@@ -0,0 +1,80 @@
+"""Stagger deadlines of a program's items over the student's real capacity.
+
+Items are walked once in `orderIndex` order while a day cursor consumes the
+student's per-weekday study capacity (free slots after cleaning, capped by
+the daily limit and buffer exactly like `generate_plan._build_buckets`,
+minus habit time). Each item is due at the end of the day on which the
+cumulative work up to and including it can be finished, so the resulting
+tasks arrive in `generate_plan` already in program order with deadlines it
+can actually meet.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Sequence
+
+from app.core.time import TZ_OFFSET
+from app.planner.clean_slots import clean_slots
+from app.schemas.free_slot import FreeSlotSchema
+from app.schemas.habit import HabitSchema
+
+# Used when the student has no usable slots yet, so deadlines still spread.
+FALLBACK_DAILY_MINUTES = 60
+
+
+def weekly_capacity(
+    slots: list[FreeSlotSchema],
+    habits: list[HabitSchema],
+    daily_limit_minutes: int,
+    buffer_percent: float,
+) -> list[int]:
+    """Usable task minutes per JS weekday (index 0 = Sunday)."""
+    per_weekday = [0] * 7
+    for slot in clean_slots(slots)["slots"]:
+        per_weekday[slot.weekday] += slot.capacity_minutes
+
+    capacity = []
+    for weekday, slot_minutes in enumerate(per_weekday):
+        allowed = max(0, min(daily_limit_minutes, int(slot_minutes * (1 - buffer_percent))))
+        habit_minutes = sum(
+            h.minutes
+            for h in habits
+            if h.cadence == "daily" or (h.cadence == "weekly" and h.weekday == weekday)
+        )
+        capacity.append(max(0, allowed - habit_minutes))
+    if not any(capacity):
+        capacity = [FALLBACK_DAILY_MINUTES] * 7
+    return capacity
+
+
+def spread_deadlines(
+    durations: Sequence[int],
+    order: Sequence[int],
+    capacity: list[int],
+    start: datetime,
+    backlog_minutes: int = 0,
+) -> list[datetime]:
+    """Return one deadline per item, aligned with the input order.
+
+    *order* holds each item's orderIndex (ties keep input order).
+    *backlog_minutes* of already-planned work is consumed before the first
+    item, so the program queues behind the student's existing tasks.
+    Planning starts the day after *start* (local time).
+    """
+    deadlines: list[datetime] = [start] * len(durations)
+    day = (start.astimezone(TZ_OFFSET) + timedelta(days=1)).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    left_today = capacity[(day.weekday() + 1) % 7]
+    pending = backlog_minutes
+
+    for index in sorted(range(len(durations)), key=lambda i: order[i]):
+        pending += max(0, durations[index])
+        while pending > left_today:
+            pending -= left_today
+            day += timedelta(days=1)
+            left_today = capacity[(day.weekday() + 1) % 7]
+        left_today -= pending
+        pending = 0
+        deadlines[index] = day.replace(hour=23, minute=59)
+    return deadlines
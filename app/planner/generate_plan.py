@@ -2,11 +2,14 @@
 from __future__ import annotations
 
 import re
+import time
 import uuid
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta, timezone
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
 
+from app.core.time import as_vn_aware
 from app.planner.clean_slots import clean_slots
 from app.schemas.free_slot import FreeSlotSchema
 from app.schemas.habit import HabitSchema
@@ -16,7 +19,6 @@ from app.schemas.task import TaskSchema
 
 MIN_SESSION_MINUTES = 25
 MAX_SESSION_MINUTES = 120
-TZ_OFFSET = timezone(timedelta(hours=7))  # UTC+7
 
 
 # ---------------------------------------------------------------------------
@@ -39,6 +41,33 @@ class DayBucket:
     used: int = 0
 
 
+@dataclass
+class PlannerProfile:
+    """Phase timings and work counters, filled in when passed to generate_plan."""
+    phases_ms: dict[str, float] = field(default_factory=dict)
+    counts: dict[str, int] = field(default_factory=dict)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.phases_ms[name] = round(self.phases_ms.get(name, 0.0) + elapsed, 3)
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def as_dict(self) -> dict:
+        return {"phasesMs": self.phases_ms, "counts": self.counts}
+
+
+def phase(profile: Optional[PlannerProfile], name: str):
+    """`profile.phase(name)`, or a no-op context when profiling is off."""
+    return profile.phase(name) if profile is not None else nullcontext()
+
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -55,14 +84,6 @@ def _diff_minutes(a: datetime, b: datetime) -> int:
     return int((b - a).total_seconds() // 60)
 
 
-def _as_vn_aware(iso: str) -> datetime:
-    """Normalize any ISO datetime string to a timezone-aware datetime in UTC+7."""
-    dt = datetime.fromisoformat(iso.replace("Z", "+00:00"))
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(TZ_OFFSET)
-
-
 def _add_minutes(dt: datetime, minutes: int) -> datetime:
     return dt + timedelta(minutes=minutes)
 
@@ -127,7 +148,7 @@ def _prioritize_tasks(tasks: list[TaskSchema]) -> list[TaskSchema]:
     return sorted(
         tasks,
         key=lambda t: (
-            _as_vn_aware(t.deadline).timestamp(),
+            as_vn_aware(t.deadline).timestamp(),
             -(t.importance or 0),
             -t.difficulty,
             -t.estimated_minutes,
@@ -145,8 +166,13 @@ def _take_from_bucket(
     chunk_preference: int,
     *,
     allow_shorter_than_min: bool = False,
+    profile: Optional[PlannerProfile] = None,
 ) -> Optional[dict]:
+    if profile is not None:
+        profile.count("allocationAttempts")
     if bucket.used >= bucket.allowed_minutes:
+        if profile is not None:
+            profile.count("failedProbes")
         return None
     for segment in bucket.segments:
         seg_capacity = max(0, _diff_minutes(segment.start, segment.end) - segment.used)
@@ -166,6 +192,8 @@ def _take_from_bucket(
             "session_end": session_end,
             "minutes": minutes,
         }
+    if profile is not None:
+        profile.count("failedProbes")
     return None
 
 
@@ -178,6 +206,7 @@ def _schedule_habits(
     habits: list[HabitSchema],
     settings: AppSettingsSchema,
     plan_version: int,
+    profile: Optional[PlannerProfile] = None,
 ) -> tuple[list[SessionSchema], list[PlanSuggestionSchema]]:
     habit_sessions: list[SessionSchema] = []
     suggestions: list[PlanSuggestionSchema] = []
@@ -192,7 +221,7 @@ def _schedule_habits(
 
             remaining = habit.minutes
             allocation = _take_from_bucket(
-                bucket, remaining, habit.minutes, allow_shorter_than_min=True
+                bucket, remaining, habit.minutes, allow_shorter_than_min=True, profile=profile
             )
             if not allocation:
                 suggestions.append(
@@ -224,7 +253,7 @@ def _schedule_habits(
                 remaining -= mins
                 allocation = (
                     _take_from_bucket(
-                        bucket, remaining, habit.minutes, allow_shorter_than_min=True
+                        bucket, remaining, habit.minutes, allow_shorter_than_min=True, profile=profile
                     )
                     if remaining > 0
                     else None
@@ -323,34 +352,40 @@ def generate_plan(
     settings: AppSettingsSchema,
     now_iso: str,
     previous_plan_version: Optional[int] = None,
+    profile: Optional[PlannerProfile] = None,
 ) -> PlanRecordSchema:
-    now = _as_vn_aware(now_iso)
-    cleaned = clean_slots(free_slots)
+    """Build a plan. Pass a PlannerProfile to collect phase timings and counters."""
+    now = as_vn_aware(now_iso)
+    with phase(profile, "cleanSlots"):
+        cleaned = clean_slots(free_slots)
     clean_slot_list: list[FreeSlotSchema] = cleaned["slots"]
     warnings: list[str] = cleaned["warnings"]
     plan_version = (previous_plan_version or 0) + 1
 
-    future_tasks = [t for t in tasks if _as_vn_aware(t.deadline) > now]
-    prioritized = _prioritize_tasks(future_tasks)
+    with phase(profile, "prioritizeTasks"):
+        future_tasks = [t for t in tasks if as_vn_aware(t.deadline) > now]
+        prioritized = _prioritize_tasks(future_tasks)
 
     latest_deadline = now
     for task in prioritized:
-        dl = _as_vn_aware(task.deadline)
+        dl = as_vn_aware(task.deadline)
         if dl > latest_deadline:
             latest_deadline = dl
 
     if not prioritized and habits:
         latest_deadline = now + timedelta(days=14)
 
-    buckets = [
-        b
-        for b in _build_buckets(now, latest_deadline, clean_slot_list, settings)
-        if b.segments
-    ]
+    with phase(profile, "buildBuckets"):
+        buckets = [
+            b
+            for b in _build_buckets(now, latest_deadline, clean_slot_list, settings)
+            if b.segments
+        ]
 
-    habit_sessions, habit_suggestions = _schedule_habits(
-        buckets, habits, settings, plan_version
-    )
+    with phase(profile, "scheduleHabits"):
+        habit_sessions, habit_suggestions = _schedule_habits(
+            buckets, habits, settings, plan_version, profile
+        )
 
     total_capacity = sum(b.allowed_minutes for b in buckets)
     total_demand = sum(
@@ -372,141 +407,158 @@ def generate_plan(
     unscheduled: list[TaskSchema] = []
     focus_chunk = settings.break_preset.focus or 45
 
-    for task in prioritized:
-        remaining = max(0, task.estimated_minutes - task.progress_minutes)
-        deadline = _as_vn_aware(task.deadline)
-        eligible_buckets = [
-            b
-            for b in buckets
-            if b.iso_date <= deadline.strftime("%Y-%m-%d")
-        ]
-        if not eligible_buckets:
-            unscheduled.append(task)
-            suggestions.append(
-                PlanSuggestionSchema(
-                    type="increase_free_time",
-                    message=f'Task "{task.title}" không nằm trong bất kỳ slot nào.',
+    with phase(profile, "allocateTasks"):
+        for task in prioritized:
+            remaining = max(0, task.estimated_minutes - task.progress_minutes)
+            deadline = as_vn_aware(task.deadline)
+            eligible_buckets = [
+                b
+                for b in buckets
+                if b.iso_date <= deadline.strftime("%Y-%m-%d")
+            ]
+            if not eligible_buckets:
+                unscheduled.append(task)
+                suggestions.append(
+                    PlanSuggestionSchema(
+                        type="increase_free_time",
+                        message=f'Task "{task.title}" không nằm trong bất kỳ slot nào.',
+                    )
                 )
-            )
-            continue
-
-        base_criteria = (
-            task.success_criteria
-            if task.success_criteria
-            else ["Hoàn thành buổi học"]
-        )
-        checklist = (
-            [item.strip() for item in task.content_focus.splitlines() if item.strip()]
-            if task.content_focus
-            else None
-        )
+                continue
 
-        def allocate(
-            bucket: DayBucket,
-            minutes_needed: int,
-            chunk_pref: int,
-            milestone_title: Optional[str] = None,
-        ) -> int:
-            nonlocal remaining
-            local_remaining = minutes_needed
-            attempt = _take_from_bucket(
-                bucket,
-                local_remaining,
-                chunk_pref,
-                allow_shorter_than_min=bool(milestone_title),
+            base_criteria = (
+                task.success_criteria
+                if task.success_criteria
+                else ["Hoàn thành buổi học"]
             )
-            while attempt and local_remaining > 0:
-                mins = attempt["minutes"]
-                sessions.append(
-                    SessionSchema(
-                        id=str(uuid.uuid4()),
-                        taskId=task.id,
-                        source="task",
-                        subject=task.subject,
-                        title=task.title,
-                        plannedStart=attempt["session_start"].isoformat(),
-                        plannedEnd=attempt["session_end"].isoformat(),
-                        minutes=mins,
-                        bufferMinutes=round(mins * settings.buffer_percent),
-                        status="pending",
-                        checklist=checklist,
-                        successCriteria=base_criteria,
-                        milestoneTitle=milestone_title,
-                        planVersion=plan_version,
-                    )
+            checklist = (
+                [item.strip() for item in task.content_focus.splitlines() if item.strip()]
+                if task.content_focus
+                else None
+            )
+
+            def allocate(
+                bucket: DayBucket,
+                minutes_needed: int,
+                chunk_pref: int,
+                milestone_title: Optional[str] = None,
+            ) -> int:
+                nonlocal remaining
+                local_remaining = minutes_needed
+                attempt = _take_from_bucket(
+                    bucket,
+                    local_remaining,
+                    chunk_pref,
+                    allow_shorter_than_min=bool(milestone_title),
+                    profile=profile,
                 )
-                remaining -= mins
-                local_remaining -= mins
-                attempt = (
-                    _take_from_bucket(
-                        bucket,
-                        local_remaining,
-                        chunk_pref,
-                        allow_shorter_than_min=bool(milestone_title),
+                while attempt and local_remaining > 0:
+                    mins = attempt["minutes"]
+                    sessions.append(
+                        SessionSchema(
+                            id=str(uuid.uuid4()),
+                            taskId=task.id,
+                            source="task",
+                            subject=task.subject,
+                            title=task.title,
+                            plannedStart=attempt["session_start"].isoformat(),
+                            plannedEnd=attempt["session_end"].isoformat(),
+                            minutes=mins,
+                            bufferMinutes=round(mins * settings.buffer_percent),
+                            status="pending",
+                            checklist=checklist,
+                            successCriteria=base_criteria,
+                            milestoneTitle=milestone_title,
+                            planVersion=plan_version,
+                        )
                     )
-                    if local_remaining > 0
-                    else None
-                )
-            return local_remaining
-
-        if task.milestones:
-            for milestone in task.milestones:
-                ms_remaining = min(milestone.minutes_estimate, remaining)
+                    remaining -= mins
+                    local_remaining -= mins
+                    attempt = (
+                        _take_from_bucket(
+                            bucket,
+                            local_remaining,
+                            chunk_pref,
+                            allow_shorter_than_min=bool(milestone_title),
+                            profile=profile,
+                        )
+                        if local_remaining > 0
+                        else None
+                    )
+                return local_remaining
+
+            if task.milestones:
+                for milestone in task.milestones:
+                    ms_remaining = min(milestone.minutes_estimate, remaining)
+                    for bucket in eligible_buckets:
+                        if ms_remaining <= 0:
+                            break
+                        ms_remaining = allocate(
+                            bucket,
+                            ms_remaining,
+                            milestone.minutes_estimate,
+                            milestone.title,
+                        )
+            else:
                 for bucket in eligible_buckets:
-                    if ms_remaining <= 0:
+                    if remaining <= 0:
                         break
-                    ms_remaining = allocate(
-                        bucket,
-                        ms_remaining,
-                        milestone.minutes_estimate,
-                        milestone.title,
+                    allocate(bucket, remaining, focus_chunk)
+
+            if remaining > 0:
+                unscheduled.append(task)
+                suggestions.append(
+                    PlanSuggestionSchema(
+                        type="reduce_duration",
+                        message=f'Nhiệm vụ "{task.title}" thiếu {remaining} phút. Giảm thời lượng hoặc thêm slot.',
                     )
-        else:
-            for bucket in eligible_buckets:
-                if remaining <= 0:
-                    break
-                allocate(bucket, remaining, focus_chunk)
-
-        if remaining > 0:
-            unscheduled.append(task)
-            suggestions.append(
-                PlanSuggestionSchema(
-                    type="reduce_duration",
-                    message=f'Nhiệm vụ "{task.title}" thiếu {remaining} phút. Giảm thời lượng hoặc thêm slot.',
                 )
-            )
 
-    sessions_with_breaks = _apply_breaks(sessions, settings, plan_version)
+    with phase(profile, "applyBreaks"):
+        sessions_with_breaks = _apply_breaks(sessions, settings, plan_version)
     generated_at = datetime.utcnow().isoformat()
 
     # ------------------------------------------------------------------
     # Deduplicate suggestions
     # ------------------------------------------------------------------
     # Group per-day habit failures into a single summary line
-    habit_fail_counts: dict[str, int] = {}
-    other_suggestions: list[PlanSuggestionSchema] = []
-    for s in suggestions:
-        m = re.match(r'Không đủ slot cho habit "(.+)" vào .+\.', s.message)
-        if m:
-            habit_name = m.group(1)
-            habit_fail_counts[habit_name] = habit_fail_counts.get(habit_name, 0) + 1
-        else:
-            other_suggestions.append(s)
-
-    seen_msgs: set[str] = set()
-    deduped: list[PlanSuggestionSchema] = []
-    for s in other_suggestions:
-        if s.message not in seen_msgs:
-            seen_msgs.add(s.message)
-            deduped.append(s)
-    for habit_name, count in habit_fail_counts.items():
-        deduped.append(
-            PlanSuggestionSchema(
-                type="increase_free_time",
-                message=f'Habit "{habit_name}" không có slot trong {count} ngày. Hãy thêm thời gian rảnh.',
+    with phase(profile, "dedupSuggestions"):
+        habit_fail_counts: dict[str, int] = {}
+        other_suggestions: list[PlanSuggestionSchema] = []
+        for s in suggestions:
+            m = re.match(r'Không đủ slot cho habit "(.+)" vào .+\.', s.message)
+            if m:
+                habit_name = m.group(1)
+                habit_fail_counts[habit_name] = habit_fail_counts.get(habit_name, 0) + 1
+            else:
+                other_suggestions.append(s)
+
+        seen_msgs: set[str] = set()
+        deduped: list[PlanSuggestionSchema] = []
+        for s in other_suggestions:
+            if s.message not in seen_msgs:
+                seen_msgs.add(s.message)
+                deduped.append(s)
+        for habit_name, count in habit_fail_counts.items():
+            deduped.append(
+                PlanSuggestionSchema(
+                    type="increase_free_time",
+                    message=f'Habit "{habit_name}" không có slot trong {count} ngày. Hãy thêm thời gian rảnh.',
+                )
             )
-        )
-    suggestions = deduped
+        suggestions = deduped
+
+    if profile is not None:
+        profile.count("tasks", len(tasks))
+        profile.count("futureTasks", len(prioritized))
+        profile.count("habits", len(habits))
+        profile.count("slots", len(clean_slot_list))
+        profile.count("buckets", len(buckets))
+        profile.count("segments", sum(len(b.segments) for b in buckets))
+        profile.count("sessions", len(sessions_with_breaks))
+        profile.count("breaks", len(sessions_with_breaks) - len(sessions))
+        profile.count("unscheduledTasks", len(unscheduled))
+        profile.count("suggestions", len(suggestions))
 
     return PlanRecordSchema(
         id=str(uuid.uuid4()),
@@ -1,7 +1,8 @@
 """Port of icsExport.ts — generate iCalendar (.ics) content from a plan."""
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Any
 
 from app.schemas.plan import PlanRecordSchema
@@ -9,18 +10,92 @@ from app.schemas.plan import PlanRecordSchema
 CRLF = "\r\n"
 PALETTE = ["#6EE7B7", "#93C5FD", "#FCD34D", "#FCA5A5", "#C4B5FD", "#F9A8D4"]
 
+# RFC 5545 §3.1: content lines SHOULD NOT exceed 75 octets (excluding CRLF);
+# continuation lines start with a single space, which counts toward the limit.
+MAX_LINE_OCTETS = 75
+FOLD = b"\r\n "
 
+# RFC 5545 §3.3.11: TEXT values escape backslash, semicolon, comma and newline.
+# Backslash goes first so the escapes added afterwards are not doubled.
+_TEXT_ESCAPES = (
+    ("\\", "\\\\"),
+    (";", "\\;"),
+    (",", "\\,"),
+    ("\r\n", "\\n"),
+    ("\n", "\\n"),
+    ("\r", "\\n"),
+)
+
+_SECONDS_PER_DAY = 86_400
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_day_prefix_cache: dict[int, str] = {}
+
+
+@lru_cache(maxsize=256)
 def _get_color(subject: str) -> str:
     index = abs(sum(ord(c) for c in subject)) % len(PALETTE)
     return PALETTE[index]
 
 
-def _format_date(iso: str) -> str:
+def _to_epoch(iso: str) -> int:
     dt = datetime.fromisoformat(iso)
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=timezone.utc)
-    utc = dt.astimezone(timezone.utc)
-    return utc.strftime("%Y%m%dT%H%M%SZ")
+    return int(dt.timestamp())
+
+
+def _format_epoch(epoch: int) -> str:
+    """Format a UTC epoch as YYYYMMDDTHHMMSSZ.
+
+    Sessions of one plan cluster on a few hundred days, so the date part is
+    memoised per day and only the time of day is formatted per call.
+    """
+    day, secs = divmod(epoch, _SECONDS_PER_DAY)
+    prefix = _day_prefix_cache.get(day)
+    if prefix is None:
+        prefix = (_EPOCH + timedelta(days=day)).strftime("%Y%m%dT")
+        _day_prefix_cache[day] = prefix
+    hours, rem = divmod(secs, 3600)
+    minutes, seconds = divmod(rem, 60)
+    return f"{prefix}{hours:02d}{minutes:02d}{seconds:02d}Z"
+
+
+def _format_date(iso: str) -> str:
+    return _format_epoch(_to_epoch(iso))
+
+
+def _fold(line: str) -> str:
+    """Fold a content line at 75 octets without splitting UTF-8 sequences."""
+    if len(line) <= MAX_LINE_OCTETS and line.isascii():
+        return line
+    data = line.encode("utf-8")
+    if len(data) <= MAX_LINE_OCTETS:
+        return line
+    parts: list[bytes] = []
+    start = 0
+    limit = MAX_LINE_OCTETS
+    while len(data) - start > limit:
+        cut = start + limit
+        while data[cut] & 0xC0 == 0x80:  # continuation byte — back off to char start
+            cut -= 1
+        parts.append(data[start:cut])
+        start = cut
+        limit = MAX_LINE_OCTETS - 1
+    parts.append(data[start:])
+    return FOLD.join(parts).decode("utf-8")
+
+
+@lru_cache(maxsize=4096)
+def _text_line(name: str, value: str) -> str:
+    """Build an escaped, folded TEXT property line.
+
+    Sessions of the same task repeat subject, title and criteria, so the
+    finished line is memoised and most events skip escaping and folding.
+    """
+    for raw, escaped in _TEXT_ESCAPES:
+        if raw in value:
+            value = value.replace(raw, escaped)
+    return _fold(f"{name}:{value}")
 
 
 def _get(session: Any, key: str, camel_key: str) -> Any:
@@ -30,38 +105,47 @@ def _get(session: Any, key: str, camel_key: str) -> Any:
     return getattr(session, key, None) or getattr(session, camel_key, None)
 
 
+CALENDAR_HEADER = [
+    "BEGIN:VCALENDAR",
+    "VERSION:2.0",
+    "PRODID:-//StudyFlow//Planner 1.0//VI",
+    "CALSCALE:GREGORIAN",
+]
+CALENDAR_FOOTER = "END:VCALENDAR"
+
+
+def render_vevent(session: Any, dtstamp: str) -> str:
+    """Render one session as a CRLF-joined VEVENT block. *dtstamp* is preformatted."""
+    session_id = _get(session, "id", "id")
+    planned_start = _get(session, "planned_start", "plannedStart")
+    planned_end = _get(session, "planned_end", "plannedEnd")
+    subject = _get(session, "subject", "subject")
+    title = _get(session, "title", "title")
+    criteria = _get(session, "success_criteria", "successCriteria") or []
+    description = " • ".join(criteria) if criteria else "Hoàn thành buổi học"
+
+    return CRLF.join((
+        "BEGIN:VEVENT",
+        _fold(f"UID:{session_id}@studyflow"),
+        f"DTSTAMP:{dtstamp}",
+        f"DTSTART:{_format_epoch(_to_epoch(planned_start))}",
+        f"DTEND:{_format_epoch(_to_epoch(planned_end))}",
+        _text_line("SUMMARY", f"{subject} · {title}"),
+        _text_line("DESCRIPTION", description),
+        _text_line("CATEGORIES", subject),
+        f"COLOR:{_get_color(subject)}",
+        "END:VEVENT",
+    ))
+
+
 def plan_to_ics(plan: PlanRecordSchema) -> str:
-    lines: list[str] = [
-        "BEGIN:VCALENDAR",
-        "VERSION:2.0",
-        "PRODID:-//StudyFlow//Planner 1.0//VI",
-        "CALSCALE:GREGORIAN",
-    ]
+    blocks: list[str] = list(CALENDAR_HEADER)
+    dtstamp = _format_date(plan.generated_at)
 
     for session in plan.sessions:
-        source = _get(session, "source", "source")
-        if source == "break":
+        if _get(session, "source", "source") == "break":
             continue
-        session_id = _get(session, "id", "id")
-        planned_start = _get(session, "planned_start", "plannedStart")
-        planned_end = _get(session, "planned_end", "plannedEnd")
-        subject = _get(session, "subject", "subject")
-        title = _get(session, "title", "title")
-        criteria = _get(session, "success_criteria", "successCriteria") or []
-        description = " • ".join(criteria) if criteria else "Hoàn thành buổi học"
-
-        lines += [
-            "BEGIN:VEVENT",
-            f"UID:{session_id}@studyflow",
-            f"DTSTAMP:{_format_date(plan.generated_at)}",
-            f"DTSTART:{_format_date(planned_start)}",
-            f"DTEND:{_format_date(planned_end)}",
-            f"SUMMARY:{subject} · {title}",
-            f"DESCRIPTION:{description}",
-            f"CATEGORIES:{subject}",
-            f"COLOR:{_get_color(subject)}",
-            "END:VEVENT",
-        ]
-
-    lines.append("END:VCALENDAR")
-    return CRLF.join(lines)
+        blocks.append(render_vevent(session, dtstamp))
+
+    blocks.append(CALENDAR_FOOTER)
+    return CRLF.join(blocks)
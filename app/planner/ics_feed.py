@@ -0,0 +1,110 @@
+"""Subscribable calendar feed — rolling-window ICS with per-session caching.
+
+Calendar clients poll a subscription URL every few minutes, and between
+polls the plan rarely changes. Rendered VEVENT blocks are therefore cached
+per session id together with a fingerprint of the fields that feed into
+them, so a poll only re-renders sessions that were added or edited.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from app.core.time import TZ_OFFSET
+from app.planner.ics_export import (
+    CALENDAR_FOOTER,
+    CALENDAR_HEADER,
+    CRLF,
+    _format_date,
+    _get,
+    render_vevent,
+)
+
+DEFAULT_PAST_DAYS = 7
+DEFAULT_FUTURE_DAYS = 60
+MAX_CACHED_EVENTS = 200_000
+
+
+class VEventCache:
+    """LRU of rendered VEVENT blocks keyed by session id."""
+
+    def __init__(self, max_entries: int = MAX_CACHED_EVENTS) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[tuple, str]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def render(self, session: Any, dtstamp: str) -> str:
+        session_id = _get(session, "id", "id")
+        fingerprint = _fingerprint(session, dtstamp)
+        cached = self._entries.get(session_id)
+        if cached is not None and cached[0] == fingerprint:
+            self._entries.move_to_end(session_id)
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        block = render_vevent(session, dtstamp)
+        self._entries[session_id] = (fingerprint, block)
+        self._entries.move_to_end(session_id)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return block
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def _fingerprint(session: Any, dtstamp: str) -> tuple:
+    criteria = _get(session, "success_criteria", "successCriteria") or []
+    return (
+        dtstamp,
+        _get(session, "planned_start", "plannedStart"),
+        _get(session, "planned_end", "plannedEnd"),
+        _get(session, "subject", "subject"),
+        _get(session, "title", "title"),
+        tuple(criteria),
+    )
+
+
+def _window_bounds(now: datetime, past_days: int, future_days: int) -> tuple[str, str]:
+    """Return [start, end) as local YYYY-MM-DD strings for prefix comparison."""
+    local = now.astimezone(TZ_OFFSET)
+    start = (local - timedelta(days=past_days)).strftime("%Y-%m-%d")
+    end = (local + timedelta(days=future_days + 1)).strftime("%Y-%m-%d")
+    return start, end
+
+
+_cache = VEventCache()
+
+
+def render_feed(
+    sessions: list,
+    generated_at: str,
+    now: datetime,
+    past_days: int = DEFAULT_PAST_DAYS,
+    future_days: int = DEFAULT_FUTURE_DAYS,
+    cache: Optional[VEventCache] = None,
+) -> str:
+    """Render the sessions whose local start date falls inside the window."""
+    cache = cache if cache is not None else _cache
+    window_start, window_end = _window_bounds(now, past_days, future_days)
+    dtstamp = _format_date(generated_at)
+
+    blocks: list[str] = [CRLF.join(CALENDAR_HEADER)]
+    for session in sessions:
+        if _get(session, "source", "source") == "break":
+            continue
+        # plannedStart is stored in UTC+7, so the date prefix is the local day
+        day = (_get(session, "planned_start", "plannedStart") or "")[:10]
+        if not (window_start <= day < window_end):
+            continue
+        blocks.append(cache.render(session, dtstamp))
+    blocks.append(CALENDAR_FOOTER)
+    return CRLF.join(blocks)
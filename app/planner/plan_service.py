@@ -6,6 +6,7 @@ from typing import Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.telemetry import span
 from app.crud import feedback as feedback_crud
 from app.crud import habits as habits_crud
 from app.crud import plan as plan_crud
@@ -13,7 +14,7 @@ from app.crud import profile as profile_crud
 from app.crud import settings as settings_crud
 from app.crud import slots as slots_crud
 from app.crud import tasks as tasks_crud
-from app.planner.generate_plan import generate_plan
+from app.planner.generate_plan import PlannerProfile, generate_plan, phase
 from app.schemas.free_slot import FreeSlotSchema
 from app.schemas.habit import HabitSchema
 from app.schemas.plan import PlanRecordSchema
@@ -97,30 +98,39 @@ async def _tune_settings_with_feedback(db: AsyncSession, owner_user_id: str) ->
     return settings
 
 
-async def rebuild_plan(db: AsyncSession, owner_user_id: str) -> Optional[PlanRecordSchema]:
-    tasks_rows = await tasks_crud.list_tasks(db, owner_user_id)
-    slots_rows = await slots_crud.list_slots(db, owner_user_id)
-
-    if not tasks_rows or not slots_rows:
-        return None
-
-    habits_rows = await habits_crud.list_habits(db, owner_user_id)
-    settings = await _tune_settings_with_feedback(db, owner_user_id)
-    latest_plan = await plan_crud.get_latest_plan(db, owner_user_id)
-
-    tasks = [_model_to_task(t) for t in tasks_rows]
-    free_slots = [_model_to_slot(s) for s in slots_rows]
-    habits = [_model_to_habit(h) for h in habits_rows]
-
-    plan = generate_plan(
-        tasks=tasks,
-        free_slots=free_slots,
-        habits=habits,
-        settings=settings,
-        now_iso=datetime.now(timezone.utc).isoformat(),
-        previous_plan_version=latest_plan.plan_version if latest_plan else None,
-    )
+async def rebuild_plan(
+    db: AsyncSession, owner_user_id: str, profile: Optional[PlannerProfile] = None
+) -> Optional[PlanRecordSchema]:
+    now = datetime.now(timezone.utc)
+    with span("plan.load"), phase(profile, "load"):
+        # Finished and expired tasks never produce sessions; leave them in the DB.
+        tasks_rows = await tasks_crud.list_active_tasks(db, owner_user_id, now)
+        slots_rows = await slots_crud.list_slots(db, owner_user_id)
+
+        if not slots_rows or (not tasks_rows and not await tasks_crud.has_tasks(db, owner_user_id)):
+            return None
+
+        habits_rows = await habits_crud.list_habits(db, owner_user_id)
+        settings = await _tune_settings_with_feedback(db, owner_user_id)
+        latest_plan = await plan_crud.get_latest_plan(db, owner_user_id)
+
+    with span("plan.convert"):
+        tasks = [_model_to_task(t) for t in tasks_rows]
+        free_slots = [_model_to_slot(s) for s in slots_rows]
+        habits = [_model_to_habit(h) for h in habits_rows]
+
+    with span("plan.generate"):
+        plan = generate_plan(
+            tasks=tasks,
+            free_slots=free_slots,
+            habits=habits,
+            settings=settings,
+            now_iso=now.isoformat(),
+            previous_plan_version=latest_plan.plan_version if latest_plan else None,
+            profile=profile,
+        )
     plan.owner_user_id = owner_user_id
 
-    await plan_crud.save_plan(db, plan)
+    with span("plan.save"), phase(profile, "save"):
+        await plan_crud.save_plan(db, plan)
     return plan
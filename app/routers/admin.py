@@ -4,24 +4,36 @@ All endpoints require role=admin.
 """
 from __future__ import annotations
 
+import uuid
+from datetime import datetime, timezone
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, Response, UploadFile, status
 from pydantic import BaseModel
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
+from app.core import cursors
 from app.core.deps import require_role
+from app.core.purge import run_purges
+from app.core.uploads import UploadFormatError, chunked, detect_format, iter_records
+from app.crud import account_purge as purge_crud
 from app.crud import library as library_crud
+from app.crud import library_cache
 from app.crud import user as user_crud
 from app.database import get_db
 from app.models.library import LibraryItem
 from app.models.user import User
+from app.schemas.account_purge import AccountPurgeSchema, AdminPurgeBatchSchema, AdminPurgeRequest
 from app.schemas.library import LibraryItemCreate, LibraryItemSchema
-from app.schemas.user import UserPublic
+from app.schemas.user import UserPublic, UserRole
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+IMPORT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
 
 class AdminUserUpdate(BaseModel):
     is_active: Optional[bool] = None
@@ -33,11 +45,40 @@ class ResetPasswordPayload(BaseModel):
 
 @router.get("/users", response_model=list[UserPublic])
 async def list_users(
+    response: Response,
+    limit: Optional[int] = Query(default=None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    role: Optional[UserRole] = None,
+    active: Optional[bool] = None,
+    q: Optional[str] = Query(default=None, min_length=1, max_length=64),
     db: AsyncSession = Depends(get_db),
     _admin: User = Depends(require_role("admin")),
 ):
-    """List all users in the system."""
-    return await user_crud.get_all_users(db)
+    """List users ordered by creation time.
+
+    `q` is a case-insensitive prefix of the username, first name or full name.
+    With `limit`, a full page sets `X-Next-Cursor`. The first page also sets
+    `X-Total-Count`, plus `X-Total-Count-Exact: false` when the value is an
+    estimate or capped.
+    """
+    try:
+        after = cursors.decode(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Cursor không hợp lệ")
+
+    users = await user_crud.page_users(
+        db, limit=limit, after=after, role=role, is_active=active, prefix=q
+    )
+    if limit is not None and len(users) == limit:
+        response.headers["X-Next-Cursor"] = cursors.encode(users[-1].created_at, users[-1].id)
+    if after is None:
+        if limit is None:
+            total, exact = len(users), True
+        else:
+            total, exact = await user_crud.count_users(db, role=role, is_active=active, prefix=q)
+        response.headers["X-Total-Count"] = str(total)
+        response.headers["X-Total-Count-Exact"] = "true" if exact else "false"
+    return users
 
 
 @router.get("/users/{user_id}", response_model=UserPublic)
@@ -85,6 +126,72 @@ async def admin_reset_password(
     return {"ok": True}
 
 
+# ---------------------------------------------------------------------------
+# Bulk data purge (off-boarding)
+# ---------------------------------------------------------------------------
+
+def _batch_summary(batch_id: str, purges) -> AdminPurgeBatchSchema:
+    rows = sum(p.rows_deleted or 0 for p in purges)
+    done = sum(1 for p in purges if p.status in ("succeeded", "failed"))
+    started = [p.started_at for p in purges if p.started_at]
+    finished = [p.finished_at for p in purges if p.finished_at]
+    elapsed = 0.0
+    if started:
+        end = max(finished) if done == len(purges) and finished else datetime.now(timezone.utc)
+        elapsed = max(0.0, (end - min(started)).total_seconds())
+    if done < len(purges):
+        status_ = "running" if started else "queued"
+    else:
+        status_ = "failed" if any(p.status == "failed" for p in purges) else "succeeded"
+    return AdminPurgeBatchSchema(
+        batchId=batch_id,
+        status=status_,
+        accounts=len(purges),
+        accountsDone=done,
+        rowsDeleted=rows,
+        elapsedSeconds=round(elapsed, 3),
+        rowsPerSecond=round(rows / elapsed, 1) if elapsed else 0.0,
+        purges=[AccountPurgeSchema.model_validate(p) for p in purges],
+    )
+
+
+@router.post("/purges", status_code=status.HTTP_202_ACCEPTED)
+async def admin_purge_users(
+    payload: AdminPurgeRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    admin: User = Depends(require_role("admin")),
+):
+    """Tombstone and purge the data of many accounts at once.
+
+    Accounts are purged one after another in the background; poll
+    `GET /admin/purges/{batchId}` for progress and rows/sec.
+    """
+    user_ids = list(dict.fromkeys(payload.userIds))
+    found = set((await db.execute(select(User.id).where(User.id.in_(user_ids)))).scalars().all())
+    missing = [uid for uid in user_ids if uid not in found]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Không tìm thấy người dùng: {', '.join(missing[:20])}")
+
+    batch_id = str(uuid.uuid4())
+    purges = await purge_crud.create_purges(db, user_ids, requested_by=admin.id, batch_id=batch_id)
+    await db.commit()
+    background_tasks.add_task(run_purges, [p.id for p in purges])
+    return _batch_summary(batch_id, purges).model_dump(by_alias=False)
+
+
+@router.get("/purges/{batch_id}")
+async def admin_get_purge_batch(
+    batch_id: str,
+    db: AsyncSession = Depends(get_db),
+    _admin: User = Depends(require_role("admin")),
+):
+    purges = await purge_crud.list_batch(db, batch_id)
+    if not purges:
+        raise HTTPException(status_code=404, detail="Không tìm thấy đợt xóa dữ liệu")
+    return _batch_summary(batch_id, purges).model_dump(by_alias=False)
+
+
 # ---------------------------------------------------------------------------
 # System library content management
 # ---------------------------------------------------------------------------
@@ -122,9 +229,51 @@ async def admin_add_system_library(
     """Add one or more system-shared library items (owner_user_id = NULL)."""
     saved = await library_crud.save_library_items(db, items, owner_user_id=None)
     await db.commit()
+    library_cache.invalidate()
     return saved
 
 
+def _next_library_chunk(chunks) -> Optional[tuple[list[dict], list[dict]]]:
+    """Parse and validate the next chunk of an upload; None once it is exhausted."""
+    chunk = next(chunks, None)
+    if chunk is None:
+        return None
+    return library_crud.validate_library_records(chunk, owner_user_id=None)
+
+
+@router.post("/library/import", response_model=dict, status_code=201)
+async def admin_import_system_library(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(default=None, pattern="^(jsonl|json|csv)$"),
+    db: AsyncSession = Depends(get_db),
+    _admin: User = Depends(require_role("admin")),
+):
+    """Bulk-load system library items from a JSON-lines, JSON or CSV upload.
+
+    The file is parsed as a stream and validated/inserted in chunks of
+    IMPORT_CHUNK_SIZE rows; invalid rows are skipped and reported by line.
+    CSV columns: subject, level, title, summary, url, tags ("a|b|c").
+    Reading, parsing and validation run in the threadpool, one chunk at a
+    time; only the inserts run on the event loop.
+    """
+    try:
+        fmt = detect_format(file.filename, format)
+        inserted = 0
+        errors: list[dict] = []
+        failed = 0
+        chunks = chunked(iter_records(file.file, fmt, list_fields=("tags",)), IMPORT_CHUNK_SIZE)
+        while (prepared := await run_in_threadpool(_next_library_chunk, chunks)) is not None:
+            rows, chunk_errors = prepared
+            inserted += len(await library_crud.bulk_insert_library_items(db, rows))
+            failed += len(chunk_errors)
+            errors.extend(chunk_errors[: MAX_REPORTED_ERRORS - len(errors)])
+    except (UploadFormatError, UnicodeDecodeError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    await db.commit()
+    library_cache.invalidate()
+    return {"inserted": inserted, "failed": failed, "errors": errors}
+
+
 @router.delete("/library/{item_id}", status_code=204)
 async def admin_delete_library_item(
     item_id: str,
@@ -136,3 +285,4 @@ async def admin_delete_library_item(
     if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Không tìm thấy tài liệu")
     await db.commit()
+    library_cache.invalidate()
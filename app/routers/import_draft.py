@@ -1,20 +1,37 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, Query, UploadFile, status
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_current_user
+from app.core.import_worker import (
+    draft_items_to_tasks,
+    program_deadlines,
+    run_finalize_job,
+    run_parse_job,
+)
+from app.core.uploads import UploadFormatError, detect_format
 from app.crud import import_draft as crud
+from app.crud import import_job as job_crud
 from app.crud import tasks as tasks_crud
 from app.database import get_db
 from app.models.user import User
-from app.schemas.import_draft import ImportDraftCreate, ImportDraftSchema, ImportDraftUpdate
-from app.schemas.task import TaskCreate
+from app.schemas.import_draft import (
+    DraftItemPatch,
+    DraftItemSchema,
+    ImportDraftCreate,
+    ImportDraftSchema,
+    ImportDraftUpdate,
+    ImportJobSchema,
+)
 
 router = APIRouter(prefix="/imports", tags=["imports"])
 
+MAX_UPLOAD_BYTES = 20 * 1024 * 1024
+
 
 def _to_schema(draft) -> ImportDraftSchema:
     return ImportDraftSchema(
@@ -82,38 +99,28 @@ async def finalize_draft(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Convert all draft items into real tasks."""
+    """Convert all draft items into real tasks in one batch.
+
+    Deadlines are staggered by orderIndex over the student's weekly capacity.
+    """
     draft = await crud.get_draft(db, draft_id)
     if not draft or draft.owner_user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Draft not found")
     if draft.status == "finalized":
         raise HTTPException(status_code=400, detail="Draft already finalized")
 
-    created_tasks = []
-    for item in (draft.items or []):
-        import datetime as dt_mod
-        deadline_dt = dt_mod.datetime.utcnow() + dt_mod.timedelta(days=14)
-        duration_min = item.get("durationMin", 30)
-        task_payload = TaskCreate.model_validate({
-            "subject": item.get("subject") or draft.name,
-            "title": item.get("title", "Nhiệm vụ từ draft"),
-            "deadline": deadline_dt.isoformat(),
-            "timezone": "Asia/Ho_Chi_Minh",
-            "difficulty": item.get("difficulty", 3),
-            "durationEstimateMin": duration_min,
-            "durationEstimateMax": duration_min,
-            "durationUnit": "minutes",
-            "estimatedMinutes": duration_min,
-            "importance": 2,
-            "contentFocus": item.get("notes") or "",
-            "successCriteria": [item.get("successCriteria") or "Hoàn thành mục tiêu"],
-            "milestones": None,
-            "notes": item.get("notes") or "",
-        })
-        task = await tasks_crud.create_task(db, task_payload, current_user.id)
-        created_tasks.append(str(task.id))
-
-    await crud.finalize_draft(db, draft_id)
+    deadlines = await program_deadlines(db, draft, current_user.id)
+    try:
+        payloads = draft_items_to_tasks(draft, deadlines)
+    except ValidationError as exc:
+        raise HTTPException(
+            status_code=422,
+            detail=exc.errors(include_url=False, include_context=False, include_input=False),
+        )
+
+    if not await crud.mark_finalized(db, draft_id, current_user.id):
+        raise HTTPException(status_code=400, detail="Draft already finalized")
+    created_tasks = await tasks_crud.bulk_create_tasks(db, payloads, current_user.id)
     return {"ok": True, "createdTaskIds": created_tasks, "count": len(created_tasks)}
 
 
@@ -129,91 +136,130 @@ async def delete_draft(
     await crud.delete_draft(db, draft_id)
 
 
+async def _get_owned_draft(db: AsyncSession, draft_id: str, owner_user_id: str):
+    draft = await crud.get_draft(db, draft_id)
+    if not draft or draft.owner_user_id != owner_user_id:
+        raise HTTPException(status_code=404, detail="Draft not found")
+    return draft
 
-def _to_schema(draft) -> ImportDraftSchema:
-    return ImportDraftSchema(
-        id=draft.id,
-        draft_type=draft.draft_type,
-        source_id=draft.source_id,
-        name=draft.name,
-        description=draft.description,
-        items=draft.items or [],
-        status=draft.status,
-        created_at=draft.created_at.isoformat() if draft.created_at else "",
-        updated_at=draft.updated_at.isoformat() if draft.updated_at else "",
-    )
 
+# ---------------------------------------------------------------------------
+# Item-level edits
+# ---------------------------------------------------------------------------
 
-@router.get("/drafts")
-async def list_drafts(
-    type: Optional[str] = Query(default=None),
+@router.post("/drafts/{draft_id}/items", status_code=status.HTTP_201_CREATED)
+async def append_draft_items(
+    draft_id: str,
+    items: list[DraftItemSchema],
     db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
 ):
-    drafts = await crud.list_drafts(db, draft_type=type)
-    return [_to_schema(d).model_dump(by_alias=False) for d in drafts]
-
-
-@router.post("/drafts", status_code=status.HTTP_201_CREATED)
-async def create_draft(payload: ImportDraftCreate, db: AsyncSession = Depends(get_db)):
-    draft = await crud.create_draft(db, payload)
-    return _to_schema(draft).model_dump(by_alias=False)
-
-
-@router.get("/drafts/{draft_id}")
-async def get_draft(draft_id: str, db: AsyncSession = Depends(get_db)):
-    draft = await crud.get_draft(db, draft_id)
-    if draft is None:
+    """Append items to a draft without rewriting the existing ones."""
+    if not await crud.append_draft_items(
+        db, draft_id, [item.model_dump() for item in items], current_user.id
+    ):
         raise HTTPException(status_code=404, detail="Draft not found")
-    return _to_schema(draft).model_dump(by_alias=False)
+    return {"ok": True, "count": len(items)}
 
 
-@router.patch("/drafts/{draft_id}")
-async def update_draft(draft_id: str, payload: ImportDraftUpdate, db: AsyncSession = Depends(get_db)):
-    draft = await crud.update_draft(db, draft_id, payload)
-    if draft is None:
-        raise HTTPException(status_code=404, detail="Draft not found")
-    return _to_schema(draft).model_dump(by_alias=False)
+@router.patch("/drafts/{draft_id}/items/{item_id}")
+async def patch_draft_item(
+    draft_id: str,
+    item_id: str,
+    payload: DraftItemPatch,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    item = await crud.patch_draft_item(db, draft_id, item_id, payload, current_user.id)
+    if item is None:
+        raise HTTPException(status_code=404, detail="Draft item not found")
+    return item
 
 
-@router.post("/drafts/{draft_id}/finalize", status_code=status.HTTP_201_CREATED)
-async def finalize_draft(draft_id: str, db: AsyncSession = Depends(get_db)):
-    """Convert all draft items into real tasks."""
-    draft = await crud.get_draft(db, draft_id)
-    if draft is None:
-        raise HTTPException(status_code=404, detail="Draft not found")
+@router.delete("/drafts/{draft_id}/items/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_draft_item(
+    draft_id: str,
+    item_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if not await crud.delete_draft_item(db, draft_id, item_id, current_user.id):
+        raise HTTPException(status_code=404, detail="Draft item not found")
+
+
+# ---------------------------------------------------------------------------
+# Background jobs
+# ---------------------------------------------------------------------------
+
+@router.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def create_import_job(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    name: str = Form(...),
+    description: str = Form(default=""),
+    draft_type: Literal["template", "program"] = Form(default="program"),
+    source_id: str = Form(default="upload"),
+    format: Optional[str] = Query(default=None, pattern="^(jsonl|json|csv)$"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Upload a program (JSON, JSON-lines or CSV); it is parsed in the background.
+
+    Poll `GET /imports/jobs/{id}`; on success `draftId` points at the new draft.
+    """
+    try:
+        fmt = detect_format(file.filename, format)
+    except UploadFormatError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    raw = await file.read(MAX_UPLOAD_BYTES + 1)
+    if len(raw) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Tệp quá lớn")
+
+    job = await job_crud.create_job(db, "parse", current_user.id)
+    await db.commit()
+    draft_meta = {
+        "draftType": draft_type,
+        "sourceId": source_id,
+        "name": name,
+        "description": description,
+    }
+    background_tasks.add_task(run_parse_job, job.id, current_user.id, raw, fmt, draft_meta)
+    return ImportJobSchema.model_validate(job).model_dump(by_alias=False)
+
+
+@router.post("/drafts/{draft_id}/finalize-jobs", status_code=status.HTTP_202_ACCEPTED)
+async def create_finalize_job(
+    draft_id: str,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Finalize a large draft in the background instead of inside the request."""
+    draft = await _get_owned_draft(db, draft_id, current_user.id)
     if draft.status == "finalized":
         raise HTTPException(status_code=400, detail="Draft already finalized")
+    job = await job_crud.create_job(db, "finalize", current_user.id, draft_id=draft_id)
+    await db.commit()
+    background_tasks.add_task(run_finalize_job, job.id, current_user.id, draft_id)
+    return ImportJobSchema.model_validate(job).model_dump(by_alias=False)
 
-    created_tasks = []
-    for item in (draft.items or []):
-        import datetime as dt_mod
-        deadline_dt = dt_mod.datetime.utcnow() + dt_mod.timedelta(days=14)
-        duration_min = item.get("durationMin", 30)
-        task_payload = TaskCreate.model_validate({
-            "subject": item.get("subject") or draft.name,
-            "title": item.get("title", "Nhiệm vụ từ draft"),
-            "deadline": deadline_dt.isoformat(),
-            "timezone": "Asia/Ho_Chi_Minh",
-            "difficulty": item.get("difficulty", 3),
-            "durationEstimateMin": duration_min,
-            "durationEstimateMax": duration_min,
-            "durationUnit": "minutes",
-            "estimatedMinutes": duration_min,
-            "importance": 2,
-            "contentFocus": item.get("notes") or "",
-            "successCriteria": [item.get("successCriteria") or "Hoàn thành mục tiêu"],
-            "milestones": None,
-            "notes": item.get("notes") or "",
-        })
-        task = await tasks_crud.create_task(db, task_payload)
-        created_tasks.append(str(task.id))
-
-    await crud.finalize_draft(db, draft_id)
-    return {"ok": True, "createdTaskIds": created_tasks, "count": len(created_tasks)}
+
+@router.get("/jobs")
+async def list_import_jobs(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    jobs = await job_crud.list_jobs(db, current_user.id)
+    return [ImportJobSchema.model_validate(j).model_dump(by_alias=False) for j in jobs]
 
 
-@router.delete("/drafts/{draft_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_draft(draft_id: str, db: AsyncSession = Depends(get_db)):
-    deleted = await crud.delete_draft(db, draft_id)
-    if not deleted:
-        raise HTTPException(status_code=404, detail="Draft not found")
+@router.get("/jobs/{job_id}")
+async def get_import_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    job = await job_crud.get_job(db, job_id)
+    if not job or job.owner_user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return ImportJobSchema.model_validate(job).model_dump(by_alias=False)
@@ -1,9 +1,9 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user
+from app.core.deps import get_current_user, get_read_db
 from app.crud import library as crud
 from app.database import get_db
 from app.models.user import User
@@ -16,12 +16,17 @@ router = APIRouter(prefix="/library", tags=["library"])
 async def list_library(
     q: Optional[str] = None,
     subject: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    limit: Optional[int] = Query(default=None, ge=1, le=200),
+    offset: int = Query(default=0, ge=0),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
+    """Shared + own library items. With `q`, results are ranked by relevance."""
     if q or subject:
-        return await crud.search_library(db, current_user.id, query=q, subject=subject)
-    return await crud.list_library(db, current_user.id)
+        return await crud.search_library(
+            db, current_user.id, query=q, subject=subject, limit=limit, offset=offset
+        )
+    return await crud.list_library(db, current_user.id, limit=limit, offset=offset)
 
 
 @router.post("/", response_model=list[LibraryItemSchema])
@@ -5,18 +5,27 @@ Requires role=parent for most endpoints. Students use a few endpoints
 """
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user, require_role
+from app.core.deps import get_read_db, require_role
+from app.core.time import TZ_OFFSET
+from app.crud import link_cache
 from app.crud import parent as crud
 from app.crud import tasks as tasks_crud
 from app.crud import plan as plan_crud
 from app.crud import habits as habits_crud
 from app.crud import user as user_crud
 from app.database import get_db
+from app.models.parent import ParentStudentLink
 from app.models.user import User
 from app.schemas.parent import (
+    ChildOverview,
+    ChildPlanWindow,
     LinkRequest,
     LinkSchema,
     LinkStatusUpdate,
@@ -35,15 +44,40 @@ router = APIRouter(prefix="/parent", tags=["parent"])
 async def _require_active_link(
     db: AsyncSession, parent_id: str, student_id: str
 ) -> None:
-    """Raise 403 unless an active link exists between parent and student."""
-    link = await crud.get_link(db, parent_id, student_id)
-    if not link or link.status != "active":
+    """Raise 403 unless an active link exists between parent and student.
+
+    *db* must be the primary session, also on replica-backed routes (see
+    `linked_child`).
+    """
+    if not await link_cache.is_active_link(db, parent_id, student_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Không có liên kết hợp lệ với học sinh này.",
         )
 
 
+async def linked_child(
+    student_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_role("parent")),
+) -> str:
+    """Path `student_id`, authorized against the primary.
+
+    For read routes whose data comes from `get_read_db`: declared before the
+    read session, the check runs while the primary connection is still held.
+    """
+    await _require_active_link(db, current_user.id, student_id)
+    return student_id
+
+
+async def active_links(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_role("parent")),
+) -> list[ParentStudentLink]:
+    """The parent's active links, read from the primary like `linked_child`."""
+    return await crud.list_links_for_parent(db, current_user.id, status="active")
+
+
 # ---------------------------------------------------------------------------
 # Link management (parent initiates)
 # ---------------------------------------------------------------------------
@@ -63,8 +97,14 @@ async def request_link(
     existing = await crud.get_link(db, current_user.id, student.id)
     if existing:
         raise HTTPException(status_code=409, detail="Đã gửi yêu cầu liên kết trước đó")
-    link = await crud.create_link(db, current_user.id, student.id)
-    await db.commit()
+    try:
+        link = await crud.create_link(db, current_user.id, student.id)
+        await db.commit()
+    except IntegrityError:
+        # a concurrent request created the same (parent, student) link
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Đã gửi yêu cầu liên kết trước đó")
+    link_cache.invalidate(current_user.id)
     return link
 
 
@@ -113,6 +153,7 @@ async def respond_to_link(
     if not link or link.student_id != current_user.id:
         raise HTTPException(status_code=404, detail="Không tìm thấy yêu cầu liên kết")
     await db.commit()
+    link_cache.invalidate(link.parent_id)
     return link
 
 
@@ -120,36 +161,99 @@ async def respond_to_link(
 # Parent reads child data
 # ---------------------------------------------------------------------------
 
+@router.get("/overview", response_model=list[ChildOverview])
+async def children_overview(
+    upcoming: int = Query(default=5, ge=0, le=20),
+    overdue: int = Query(default=5, ge=0, le=20),
+    links: list[ParentStudentLink] = Depends(active_links),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Compact dashboard for every actively linked child.
+
+    Five queries regardless of the number of children: links, usernames,
+    task counts, overdue tasks and latest-plan summaries.
+    """
+    student_ids = [link.student_id for link in links]
+    now = datetime.now(timezone.utc)
+
+    usernames = await crud.list_usernames(db, student_ids)
+    task_stats = await crud.task_stats_by_owner(db, student_ids, now)
+    overdue_tasks = await crud.overdue_tasks_by_owner(db, student_ids, now, overdue) if overdue else {}
+    plans = await crud.plan_summaries_by_owner(db, student_ids, now, upcoming)
+
+    overview = []
+    for link in links:
+        sid = link.student_id
+        tasks_total, tasks_done, overdue_count = task_stats.get(sid, (0, 0, 0))
+        plan = plans.get(sid)
+        plan_fields = {}
+        if plan is not None:
+            plan_fields = {
+                "plan_version": plan.plan_version,
+                "plan_generated_at": plan.generated_at,
+                "sessions_total": plan.sessions_total,
+                "sessions_done": plan.sessions_done,
+                "completion_rate": (
+                    round(plan.sessions_done / plan.sessions_total, 3) if plan.sessions_total else None
+                ),
+                "upcoming_sessions": plan.upcoming,
+            }
+        overview.append(ChildOverview(
+            student_id=sid,
+            username=usernames.get(sid, ""),
+            link_id=link.id,
+            tasks_total=tasks_total,
+            tasks_done=tasks_done,
+            overdue_count=overdue_count,
+            overdue_tasks=[row._asdict() for row in overdue_tasks.get(sid, [])],
+            **plan_fields,
+        ))
+    return overview
+
+
 @router.get("/child/{student_id}/tasks")
 async def get_child_tasks(
-    student_id: str,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("parent")),
+    student_id: str = Depends(linked_child),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    await _require_active_link(db, current_user.id, student_id)
     return await tasks_crud.list_tasks(db, student_id)
 
 
 @router.get("/child/{student_id}/plan")
 async def get_child_plan(
-    student_id: str,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("parent")),
+    student_id: str = Depends(linked_child),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    await _require_active_link(db, current_user.id, student_id)
     plan = await plan_crud.get_latest_plan(db, student_id)
     if plan is None:
         raise HTTPException(status_code=404, detail="Chưa có kế hoạch")
     return plan
 
 
+@router.get("/child/{student_id}/plan/window", response_model=ChildPlanWindow)
+async def get_child_plan_window(
+    student_id: str = Depends(linked_child),
+    start: Optional[date] = None,
+    days: int = Query(default=7, ge=1, le=31),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Sessions of the child's latest plan in [start, start + days) (local dates).
+
+    Trimmed in SQL; defaults to the 7 days from today.
+    """
+    window_start = datetime.combine(start or datetime.now(TZ_OFFSET).date(), time.min, TZ_OFFSET)
+    window_end = window_start + timedelta(days=days)
+    row = await plan_crud.get_plan_window(db, student_id, window_start, window_end)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Chưa có kế hoạch")
+    return ChildPlanWindow(window_start=window_start, window_end=window_end, **row._asdict())
+
+
 @router.get("/child/{student_id}/habits")
 async def get_child_habits(
-    student_id: str,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role("parent")),
+    student_id: str = Depends(linked_child),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    await _require_active_link(db, current_user.id, student_id)
     return await habits_crud.list_habits(db, student_id)
 
 
@@ -1,11 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, Response
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user
+from app.core import etags
+from app.core.deps import get_current_user, get_read_db
 from app.crud import plan as plan_crud
+from app.crud import user as user_crud
 from app.database import get_db
 from app.models.user import User
+from app.planner.generate_plan import PlannerProfile
 from app.planner.ics_export import plan_to_ics
+from app.planner.ics_feed import DEFAULT_FUTURE_DAYS, DEFAULT_PAST_DAYS, render_feed
 from app.planner.plan_service import rebuild_plan
 from app.schemas.plan import PlanRecordSchema, SessionStatusUpdate
 
@@ -25,27 +32,47 @@ def _row_to_schema(plan) -> PlanRecordSchema:
 
 @router.get("/latest")
 async def get_latest_plan(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    plan = await plan_crud.get_latest_plan(db, current_user.id)
-    if plan is None:
+    """Latest plan; answers 304 to a matching If-None-Match without loading it."""
+    version = await plan_crud.get_latest_plan_version(db, current_user.id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="No plan found")
+    etag = etags.make_etag(version)
+    if etags.if_none_match(request.headers.get("if-none-match"), etag):
+        return etags.not_modified(etag)
+
+    # The stored JSONB is sent as Postgres renders it: no decode/re-encode.
+    row = await plan_crud.get_latest_plan_json(db, current_user.id)
+    if row is None:
         raise HTTPException(status_code=404, detail="No plan found")
-    return _row_to_schema(plan).model_dump(by_alias=True)
+    return Response(
+        content=row.body,
+        media_type="application/json",
+        headers=etags.cache_headers(etags.make_etag(row.version)),
+    )
 
 
 @router.post("/rebuild")
 async def rebuild(
+    debug: bool = Query(default=False, description="Include a planner phase profile"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    plan = await rebuild_plan(db, current_user.id)
+    profile = PlannerProfile() if debug else None
+    plan = await rebuild_plan(db, current_user.id, profile=profile)
     if plan is None:
         raise HTTPException(
             status_code=400,
             detail="Cần ít nhất 1 task và 1 free slot để tạo kế hoạch.",
         )
-    return plan.model_dump(by_alias=True)
+    body = plan.model_dump(by_alias=True)
+    if profile is not None:
+        body["profile"] = profile.as_dict()
+    # Returned directly so the sessions skip jsonable_encoder.
+    return ORJSONResponse(body)
 
 
 @router.patch("/sessions/{session_id}/status", response_model=dict)
@@ -63,7 +90,7 @@ async def update_session_status(
 
 @router.get("/export/ics")
 async def export_ics(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     plan_row = await plan_crud.get_latest_plan(db, current_user.id)
@@ -77,3 +104,64 @@ async def export_ics(
         headers={"Content-Disposition": 'attachment; filename="studyflow.ics"'},
     )
 
+
+# ---------------------------------------------------------------------------
+# Calendar subscription feed
+# ---------------------------------------------------------------------------
+
+def _feed_info(user: User) -> dict:
+    return {
+        "token": user.calendar_token,
+        "path": f"/api/v1/plan/feed/{user.calendar_token}.ics",
+    }
+
+
+@router.post("/feed/token", response_model=dict)
+async def rotate_feed_token(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Create (or replace) the calendar subscription URL. Old URLs stop working."""
+    user = await user_crud.rotate_calendar_token(db, current_user)
+    return _feed_info(user)
+
+
+@router.delete("/feed/token", status_code=204)
+async def revoke_feed_token(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    await user_crud.revoke_calendar_token(db, current_user)
+
+
+@router.get("/feed/{token}.ics")
+async def calendar_feed(
+    token: str,
+    past_days: int = Query(default=DEFAULT_PAST_DAYS, ge=0, le=90),
+    future_days: int = Query(default=DEFAULT_FUTURE_DAYS, ge=1, le=366),
+    db: AsyncSession = Depends(get_db),
+):
+    """Read-only ICS feed authenticated by the token in the URL.
+
+    Only sessions inside [today - past_days, today + future_days] are served.
+    """
+    user = await user_crud.get_user_by_calendar_token(db, token)
+    if not user or not user.is_active:
+        raise HTTPException(status_code=404, detail="Feed not found")
+    plan_row = await plan_crud.get_latest_plan(db, user.id)
+    if plan_row is None:
+        sessions, generated_at = [], datetime.now(timezone.utc).isoformat()
+    else:
+        sessions, generated_at = plan_row.sessions or [], plan_row.generated_at
+    ics_content = render_feed(
+        sessions,
+        generated_at,
+        now=datetime.now(timezone.utc),
+        past_days=past_days,
+        future_days=future_days,
+    )
+    return Response(
+        content=ics_content,
+        media_type="text/calendar",
+        headers={"Cache-Control": "private, max-age=300"},
+    )
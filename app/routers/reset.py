@@ -1,33 +1,42 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy import text
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_current_user
+from app.core.purge import run_purges
+from app.crud import account_purge as purge_crud
 from app.database import get_db
 from app.models.user import User
+from app.schemas.account_purge import AccountPurgeSchema
 
 router = APIRouter(prefix="/reset", tags=["reset"])
 
 
-@router.delete("", status_code=204)
+@router.delete("", status_code=status.HTTP_202_ACCEPTED)
 async def reset_all_data(
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Delete all user data belonging to the authenticated user."""
-    owner_id = current_user.id
-    tables_with_owner = [
-        "feedback",
-        "plan_records",
-        "free_slots",
-        "habits",
-        "tasks",
-        "import_drafts",
-    ]
-    for table in tables_with_owner:
-        await db.execute(
-            text(f"DELETE FROM {table} WHERE owner_user_id = :uid"),
-            {"uid": owner_id},
-        )
+    """Delete all user data belonging to the authenticated user.
+
+    The data is tombstoned at once — owner-scoped reads stop returning it
+    when this commits — and deleted in the background; poll
+    `GET /reset/{id}` for progress. Anything created after this call is kept.
+    """
     # settings and profiles are per-user too but single-row; leave them intact.
+    [purge] = await purge_crud.create_purges(db, [current_user.id], requested_by=current_user.id)
     await db.commit()
+    background_tasks.add_task(run_purges, [purge.id])
+    return AccountPurgeSchema.model_validate(purge).model_dump(by_alias=False)
+
+
+@router.get("/{purge_id}")
+async def get_reset_status(
+    purge_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    purge = await purge_crud.get_purge(db, purge_id)
+    if not purge or purge.owner_user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Không tìm thấy yêu cầu xóa dữ liệu")
+    return AccountPurgeSchema.model_validate(purge).model_dump(by_alias=False)
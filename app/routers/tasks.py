@@ -1,22 +1,117 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import cursors, etags
 from app.core.deps import get_current_user
 from app.crud import tasks as crud
 from app.crud import plan as plan_crud
 from app.database import get_db
 from app.models.user import User
-from app.schemas.task import TaskCreate, TaskSchema, TaskUpdate
+from app.schemas.task import (
+    TaskBatchCreate,
+    TaskBatchDelete,
+    TaskBatchProgress,
+    TaskBatchRequest,
+    TaskBatchResult,
+    TaskBatchUpdate,
+    TaskCreate,
+    TaskMilestoneSchema,
+    TaskSchema,
+    TaskUpdate,
+)
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+# camelCase API name -> Task attribute, for `?fields=`
+_SPARSE_FIELDS = {
+    (info.alias or name): name for name, info in TaskSchema.model_fields.items()
+}
+
+
+# Sparse fields whose stored JSONB needs the same serialization as TaskSchema
+# (milestones are stored with snake_case keys, the API uses camelCase).
+_SPARSE_ADAPTERS = {"milestones": TypeAdapter(Optional[list[TaskMilestoneSchema]])}
+
+
+def _sparse_value(name: str, value):
+    adapter = _SPARSE_ADAPTERS.get(name)
+    if adapter is None:
+        return value
+    return adapter.dump_python(adapter.validate_python(value), mode="json", by_alias=True)
+
+
+def _parse_fields(fields: str) -> list[str]:
+    names = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in names if f not in _SPARSE_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Trường không hợp lệ: {', '.join(unknown)}")
+    return [_SPARSE_FIELDS[f] for f in names]
+
 
 @router.get("/", response_model=list[TaskSchema])
 async def list_tasks(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(default=None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    subject: Optional[str] = None,
+    task_status: Optional[crud.TaskStatus] = Query(default=None, alias="status"),
+    due_from: Optional[datetime] = Query(default=None, alias="dueFrom"),
+    due_to: Optional[datetime] = Query(default=None, alias="dueTo"),
+    fields: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return await crud.list_tasks(db, current_user.id)
+    """Tasks ordered by deadline.
+
+    With `limit`, a full page sets `X-Next-Cursor`; pass it back as `cursor`.
+    `fields` (comma-separated, e.g. `id,title,deadline`) returns only those keys.
+    Responses carry an ETag (except for the clock-dependent `active` and
+    `overdue` filters); a matching If-None-Match gets 304.
+    """
+    try:
+        after = cursors.decode(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Cursor không hợp lệ")
+    columns = _parse_fields(fields) if fields else None
+
+    headers = {}
+    if task_status not in ("active", "overdue"):
+        count, latest = await crud.task_list_version(db, current_user.id)
+        etag = etags.make_etag(current_user.id, count, latest, request.url.query)
+        if etags.if_none_match(request.headers.get("if-none-match"), etag):
+            return etags.not_modified(etag)
+        headers.update(etags.cache_headers(etag))
+
+    rows = await crud.page_tasks(
+        db,
+        current_user.id,
+        now=datetime.now(timezone.utc),
+        limit=limit,
+        after=after,
+        subject=subject,
+        status=task_status,
+        due_from=due_from,
+        due_to=due_to,
+        columns=columns,
+    )
+    if limit is not None and len(rows) == limit:
+        headers["X-Next-Cursor"] = cursors.encode(rows[-1].deadline, rows[-1].id)
+
+    if columns is None:
+        response.headers.update(headers)
+        return rows
+    aliases = {name: alias for alias, name in _SPARSE_FIELDS.items()}
+    content = [
+        {aliases[name]: _sparse_value(name, getattr(row, name)) for name in columns} for row in rows
+    ]
+    return JSONResponse(jsonable_encoder(content), headers=headers)
 
 
 @router.post("/", response_model=TaskSchema, status_code=status.HTTP_201_CREATED)
@@ -28,6 +123,43 @@ async def create_task(
     return await crud.create_task(db, payload, current_user.id)
 
 
+@router.post("/batch", response_model=TaskBatchResult)
+async def batch_tasks(
+    payload: TaskBatchRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Apply many task operations in one transaction.
+
+    Operations are applied grouped as creates, updates, progress, deletes;
+    ownership is checked once for every referenced id, and plans are cleaned
+    up once for all deleted tasks. Any unknown id rejects the whole batch.
+    """
+    creates = [op.task for op in payload.operations if isinstance(op, TaskBatchCreate)]
+    updates = [(op.id, op.task) for op in payload.operations if isinstance(op, TaskBatchUpdate)]
+    progress = [
+        (op.id, op.progress_minutes) for op in payload.operations if isinstance(op, TaskBatchProgress)
+    ]
+    deletes = {op.id for op in payload.operations if isinstance(op, TaskBatchDelete)}
+
+    referenced = {task_id for task_id, _ in updates} | {task_id for task_id, _ in progress} | deletes
+    missing = referenced - await crud.owned_task_ids(db, referenced, current_user.id)
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Task not found: {', '.join(sorted(missing))}")
+
+    created_ids = await crud.bulk_create_tasks(db, creates, current_user.id)
+    await crud.bulk_update_tasks(db, updates)
+    await crud.bulk_update_progress(db, progress)
+    await crud.bulk_delete_tasks(db, deletes, current_user.id)
+    await plan_crud.remove_tasks_from_plans(db, deletes, current_user.id)
+
+    return TaskBatchResult(
+        created_ids=created_ids,
+        updated_ids=list(dict.fromkeys(task_id for task_id, _ in updates + progress)),
+        deleted_ids=sorted(deletes),
+    )
+
+
 @router.get("/{task_id}", response_model=TaskSchema)
 async def get_task(
     task_id: str,
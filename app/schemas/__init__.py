@@ -5,6 +5,8 @@ from app.schemas.task import (
     TaskCreate,
     TaskUpdate,
     TaskSchema,
+    TaskBatchRequest,
+    TaskBatchResult,
 )
 from app.schemas.habit import HabitBase, HabitCreate, HabitSchema
 from app.schemas.free_slot import FreeSlotBase, FreeSlotCreate, FreeSlotSchema
@@ -21,6 +23,7 @@ from app.schemas.library import LibraryItemSchema, LibraryItemCreate
 
 __all__ = [
     "TaskMilestoneSchema", "TaskBase", "TaskCreate", "TaskUpdate", "TaskSchema",
+    "TaskBatchRequest", "TaskBatchResult",
     "HabitBase", "HabitCreate", "HabitSchema",
     "FreeSlotBase", "FreeSlotCreate", "FreeSlotSchema",
     "SessionSchema", "SessionStatusUpdate", "PlanRecordSchema", "PlanSuggestionSchema",
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+PurgeStatus = Literal["queued", "running", "succeeded", "failed"]
+
+
+class AccountPurgeSchema(BaseModel):
+    id: str
+    ownerUserId: str = Field(alias="owner_user_id")
+    batchId: Optional[str] = Field(alias="batch_id", default=None)
+    status: PurgeStatus
+    cutoff: datetime
+    rowsDeleted: int = Field(alias="rows_deleted", default=0)
+    tableCounts: dict = Field(alias="table_counts", default_factory=dict)
+    error: Optional[str] = None
+    createdAt: datetime = Field(alias="created_at")
+    startedAt: Optional[datetime] = Field(alias="started_at", default=None)
+    finishedAt: Optional[datetime] = Field(alias="finished_at", default=None)
+
+    model_config = {"populate_by_name": True, "from_attributes": True}
+
+
+class AdminPurgeRequest(BaseModel):
+    userIds: list[str] = Field(alias="user_ids", min_length=1, max_length=5000)
+
+    model_config = {"populate_by_name": True}
+
+
+class AdminPurgeBatchSchema(BaseModel):
+    batchId: str
+    status: PurgeStatus
+    accounts: int
+    accountsDone: int
+    rowsDeleted: int
+    elapsedSeconds: float
+    rowsPerSecond: float
+    purges: list[AccountPurgeSchema]
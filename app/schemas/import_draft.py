@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import List, Literal, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 class DraftItemSchema(BaseModel):
@@ -43,3 +44,41 @@ class ImportDraftUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
     items: Optional[List[DraftItemSchema]] = None
+
+
+class DraftItemPatch(BaseModel):
+    """Partial update of a single draft item; unset fields are left as-is.
+
+    Fields may be omitted but not sent as null: the patch is merged into the
+    stored item, which must stay a valid DraftItemSchema.
+    """
+    title: Optional[str] = None
+    durationMin: Optional[int] = None
+    difficulty: Optional[int] = Field(default=None, ge=1, le=5)
+    subject: Optional[str] = None
+    successCriteria: Optional[str] = None
+    orderIndex: Optional[int] = None
+    notes: Optional[str] = None
+
+    @field_validator("*")
+    @classmethod
+    def _reject_null(cls, value):
+        if value is None:
+            raise ValueError("Giá trị không được là null")
+        return value
+
+
+class ImportJobSchema(BaseModel):
+    id: str
+    kind: Literal["parse", "finalize"]
+    status: Literal["queued", "running", "succeeded", "failed"]
+    draftId: Optional[str] = Field(alias="draft_id", default=None)
+    totalItems: int = Field(alias="total_items", default=0)
+    processedItems: int = Field(alias="processed_items", default=0)
+    itemErrors: List[dict] = Field(alias="item_errors", default_factory=list)
+    error: Optional[str] = None
+    result: dict = Field(default_factory=dict)
+    createdAt: datetime = Field(alias="created_at")
+    updatedAt: datetime = Field(alias="updated_at")
+
+    model_config = {"populate_by_name": True, "from_attributes": True}
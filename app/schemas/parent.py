@@ -48,3 +48,63 @@ class SuggestionSchema(BaseModel):
 
 class SuggestionStatusUpdate(BaseModel):
     status: str  # accepted | rejected
+
+
+# ---- Dashboard overview ----
+
+class OverviewSession(BaseModel):
+    id: str
+    subject: str
+    title: str
+    planned_start: str
+    planned_end: str
+    minutes: int
+
+
+class OverviewTask(BaseModel):
+    id: str
+    subject: str
+    title: str
+    deadline: datetime
+    remaining_minutes: int
+
+
+class ChildOverview(BaseModel):
+    student_id: str
+    username: str
+    link_id: str
+    plan_version: Optional[int] = None
+    plan_generated_at: Optional[str] = None
+    sessions_total: int = 0
+    sessions_done: int = 0
+    completion_rate: Optional[float] = None  # sessions_done / sessions_total
+    upcoming_sessions: list[OverviewSession] = []
+    tasks_total: int = 0
+    tasks_done: int = 0
+    overdue_count: int = 0
+    overdue_tasks: list[OverviewTask] = []
+
+
+# ---- Windowed child plan ----
+
+class WindowSession(BaseModel):
+    id: str
+    task_id: Optional[str] = None
+    habit_id: Optional[str] = None
+    source: str
+    subject: str
+    title: str
+    planned_start: str
+    planned_end: str
+    minutes: int
+    status: str
+
+
+class ChildPlanWindow(BaseModel):
+    plan_id: str
+    plan_version: int
+    generated_at: str
+    window_start: datetime
+    window_end: datetime
+    unscheduled_count: int
+    sessions: list[WindowSession]
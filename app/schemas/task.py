@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Literal, Optional
+from typing import Annotated, Literal, Optional, Union
 import uuid
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 class TaskMilestoneSchema(BaseModel):
@@ -18,7 +18,7 @@ class TaskMilestoneSchema(BaseModel):
 class TaskBase(BaseModel):
     subject: str
     title: str
-    deadline: str  # ISO string
+    deadline: str  # ISO string (stored as timestamptz)
     timezone: str = "Asia/Ho_Chi_Minh"
     difficulty: Literal[1, 2, 3, 4, 5]
     duration_estimate_min: int = Field(alias="durationEstimateMin", ge=1)
@@ -33,6 +33,16 @@ class TaskBase(BaseModel):
 
     model_config = {"populate_by_name": True, "serialize_by_alias": True}
 
+    @field_validator("deadline", mode="before")
+    @classmethod
+    def _deadline_to_iso(cls, value):
+        # The column is timestamptz; the API keeps exchanging ISO strings.
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, str):
+            datetime.fromisoformat(value.replace("Z", "+00:00"))  # reject non-ISO early
+        return value
+
 
 class TaskCreate(TaskBase):
     pass
@@ -49,3 +59,52 @@ class TaskSchema(TaskBase):
     progress_minutes: int = Field(alias="progressMinutes", default=0)
 
     model_config = {"populate_by_name": True, "from_attributes": True, "serialize_by_alias": True}
+
+
+# ---------------------------------------------------------------------------
+# Batch mutations
+# ---------------------------------------------------------------------------
+
+MAX_BATCH_OPERATIONS = 1000
+
+
+class TaskBatchCreate(BaseModel):
+    op: Literal["create"]
+    task: TaskCreate
+
+
+class TaskBatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: str
+    task: TaskUpdate
+
+
+class TaskBatchProgress(BaseModel):
+    op: Literal["progress"]
+    id: str
+    progress_minutes: int = Field(alias="progressMinutes", ge=0)
+
+    model_config = {"populate_by_name": True}
+
+
+class TaskBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: str
+
+
+TaskBatchOperation = Annotated[
+    Union[TaskBatchCreate, TaskBatchUpdate, TaskBatchProgress, TaskBatchDelete],
+    Field(discriminator="op"),
+]
+
+
+class TaskBatchRequest(BaseModel):
+    operations: list[TaskBatchOperation] = Field(min_length=1, max_length=MAX_BATCH_OPERATIONS)
+
+
+class TaskBatchResult(BaseModel):
+    created_ids: list[str] = Field(alias="createdIds", default_factory=list)
+    updated_ids: list[str] = Field(alias="updatedIds", default_factory=list)
+    deleted_ids: list[str] = Field(alias="deletedIds", default_factory=list)
+
+    model_config = {"populate_by_name": True, "serialize_by_alias": True}
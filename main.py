@@ -2,8 +2,11 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 
 from app.config import settings
+from app.core import telemetry
+from app.core.compression import CompressionMiddleware
 from app.database import init_db
 from app.routers import tasks, habits, slots, plan, feedback, settings as settings_router, profile, library, reset, metrics
 from app.routers import import_draft
@@ -24,6 +27,7 @@ app = FastAPI(
     version=settings.app_version,
     debug=settings.debug,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -32,7 +36,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination headers must be readable by the cross-origin frontend.
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "X-Total-Count-Exact"],
 )
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_bytes,
+    gzip_level=settings.compression_gzip_level,
+    brotli_quality=settings.compression_brotli_quality,
+)
+# Outermost, so request latency includes compression.
+app.add_middleware(telemetry.TelemetryMiddleware)
 
 # Register all routers
 app.include_router(tasks.router, prefix="/api/v1")
@@ -59,3 +73,9 @@ async def root():
 @app.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Request latency, DB and planner timings in Prometheus text format."""
+    return PlainTextResponse(telemetry.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,130 @@
+"""Benchmark: per-call statement overhead, select() vs. cached lambda statements.
+
+For each hot CRUD query this times what happens on every call before any
+I/O: building the statement and resolving it through the compiled cache
+(the same `_compile_w_cache` step the engine performs), once with the
+plain `select(...)` the crud module used to build and once with the
+`app.crud.statements` lambda. Both paths hit the compiled cache after the
+first call; the difference is construction and cache-key generation.
+
+Pass --db to also run each query against DATABASE_URL from --concurrency
+concurrent sessions and compare end-to-end calls/s.
+
+Usage (from project root):
+    python scripts/bench_crud_statements.py [--calls 20000] [--db --concurrency 20]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+
+from app.crud import statements
+from app.models.free_slot import FreeSlot
+from app.models.parent import ParentStudentLink
+from app.models.plan import PlanRecord
+from app.models.task import Task
+from app.models.user import User
+
+# name -> (select() builder as the crud layer wrote it, cached statement), both taking one id
+CASES: dict[str, tuple[Callable, Callable]] = {
+    "get_user_by_id": (
+        lambda i: select(User).where(User.id == i),
+        statements.user_by_id,
+    ),
+    "get_latest_plan": (
+        lambda i: select(PlanRecord)
+        .where(PlanRecord.owner_user_id == i)
+        .order_by(PlanRecord.created_at.desc())
+        .limit(1),
+        statements.latest_plan,
+    ),
+    "list_tasks": (
+        lambda i: select(Task).where(Task.owner_user_id == i).order_by(Task.created_at),
+        statements.tasks_for_owner,
+    ),
+    "list_slots": (
+        lambda i: select(FreeSlot)
+        .where(FreeSlot.owner_user_id == i)
+        .order_by(FreeSlot.weekday, FreeSlot.start_time),
+        statements.slots_for_owner,
+    ),
+    "get_link": (
+        lambda i: select(ParentStudentLink).where(
+            ParentStudentLink.parent_id == i, ParentStudentLink.student_id == i,
+        ),
+        lambda i: statements.link(i, i),
+    ),
+}
+
+
+def _per_call(build: Callable, ids: list[str]) -> float:
+    dialect = asyncpg_dialect()
+    cache: dict = {}
+
+    def once(i: str) -> None:
+        build(i)._compile_w_cache(
+            dialect, compiled_cache=cache, column_keys=[], for_executemany=False, schema_translate_map=None,
+        )
+
+    once(ids[0])  # warm the compiled cache
+    best = float("inf")
+    for _ in range(3):
+        t0 = time.perf_counter()
+        for i in ids:
+            once(i)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(ids)
+
+
+async def _bench_db(calls: int, concurrency: int) -> None:
+    from app.database import AsyncSessionLocal, engine
+
+    ids = [str(uuid.uuid4()) for _ in range(concurrency)]
+    print(f"\ndb ({concurrency} sessions, {calls} calls per case)")
+    for name, (plain, cached) in CASES.items():
+        rates = []
+        for build in (plain, cached):
+            async def worker(owner: str, n: int) -> None:
+                async with AsyncSessionLocal() as db:
+                    for _ in range(n):
+                        (await db.execute(build(owner))).scalars().all()
+
+            t0 = time.perf_counter()
+            await asyncio.gather(*(worker(i, calls // concurrency) for i in ids))
+            rates.append(calls / (time.perf_counter() - t0))
+        print(f"  {name:<16} select {rates[0]:8.0f}/s   cached {rates[1]:8.0f}/s  ({rates[1] / rates[0] - 1:+.0%})")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--db", action="store_true", help="also run the queries against DATABASE_URL")
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    ids = [str(uuid.uuid4()) for _ in range(args.calls)]
+    print(f"statement build + compiled-cache lookup, {args.calls} calls")
+    for name, (plain, cached) in CASES.items():
+        before = _per_call(plain, ids)
+        after = _per_call(cached, ids)
+        print(
+            f"  {name:<16} select {before * 1e6:7.1f} µs   cached {after * 1e6:7.1f} µs  "
+            f"({before / after:.1f}x)"
+        )
+    if args.db:
+        asyncio.run(_bench_db(args.calls, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
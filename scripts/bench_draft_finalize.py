@@ -0,0 +1,118 @@
+"""Benchmark: finalize a 1,000-item program draft into tasks.
+
+Compares the legacy path (TaskCreate.model_validate + create_task, i.e. one
+ORM add + flush per item) with the batched path (one TypeAdapter pass + multi
+-row INSERT). The validation half runs without a database; pass --db to also
+time the inserts against DATABASE_URL inside a rolled-back transaction.
+
+Usage (from project root):
+    python scripts/bench_draft_finalize.py [--items 1000] [--db]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.core.import_worker import draft_items_to_tasks
+from app.crud import tasks as tasks_crud
+from app.schemas.task import TaskCreate
+
+
+def _draft(n: int) -> SimpleNamespace:
+    items = [
+        {
+            "id": f"item-{i}",
+            "title": f"Bài {i + 1}: luyện đề tổng hợp",
+            "durationMin": 30 + (i % 4) * 15,
+            "difficulty": 1 + i % 5,
+            "subject": "Toán",
+            "successCriteria": "Hoàn thành 10 câu",
+            "orderIndex": i,
+            "notes": "Ghi chú lỗi sai",
+        }
+        for i in range(n)
+    ]
+    return SimpleNamespace(name="Chương trình ôn thi", items=items)
+
+
+def _legacy_payloads(draft) -> list[TaskCreate]:
+    import datetime as dt_mod
+
+    out = []
+    for item in draft.items:
+        deadline_dt = dt_mod.datetime.utcnow() + dt_mod.timedelta(days=14)
+        duration_min = item.get("durationMin", 30)
+        out.append(TaskCreate.model_validate({
+            "subject": item.get("subject") or draft.name,
+            "title": item.get("title", "Nhiệm vụ từ draft"),
+            "deadline": deadline_dt.isoformat(),
+            "timezone": "Asia/Ho_Chi_Minh",
+            "difficulty": item.get("difficulty", 3),
+            "durationEstimateMin": duration_min,
+            "durationEstimateMax": duration_min,
+            "durationUnit": "minutes",
+            "estimatedMinutes": duration_min,
+            "importance": 2,
+            "contentFocus": item.get("notes") or "",
+            "successCriteria": [item.get("successCriteria") or "Hoàn thành mục tiêu"],
+            "milestones": None,
+            "notes": item.get("notes") or "",
+        }))
+    return out
+
+
+def _time(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+async def _bench_db(payloads: list[TaskCreate]) -> None:
+    from app.database import AsyncSessionLocal
+
+    owner = "bench-finalize"
+    async with AsyncSessionLocal() as db:
+        t0 = time.perf_counter()
+        for p in payloads:
+            await tasks_crud.create_task(db, p, owner)
+        legacy = time.perf_counter() - t0
+        await db.rollback()
+
+    async with AsyncSessionLocal() as db:
+        t0 = time.perf_counter()
+        await tasks_crud.bulk_create_tasks(db, payloads, owner)
+        await db.flush()
+        bulk = time.perf_counter() - t0
+        await db.rollback()
+
+    print(f"insert per item   : {legacy * 1e3:8.1f} ms")
+    print(f"insert multi-row  : {bulk * 1e3:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--db", action="store_true", help="also benchmark inserts against DATABASE_URL")
+    args = parser.parse_args()
+
+    draft = _draft(args.items)
+    legacy = _time(lambda: _legacy_payloads(draft))
+    batched = _time(lambda: draft_items_to_tasks(draft))
+    print(f"{args.items} draft items")
+    print(f"validate per item : {legacy * 1e3:8.1f} ms")
+    print(f"validate one pass : {batched * 1e3:8.1f} ms")
+    if args.db:
+        asyncio.run(_bench_db(draft_items_to_tasks(draft)))
+
+
+if __name__ == "__main__":
+    main()
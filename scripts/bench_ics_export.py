@@ -0,0 +1,124 @@
+"""Benchmark: export a 5,000-session plan to iCalendar.
+
+Compares the current serializer with the previous implementation (kept here
+as a reference: no escaping/folding, `_format_date` parsed per timestamp),
+both warm and with the memoised property lines cleared, and checks the output
+for RFC 5545 line-length compliance.
+
+Usage (from project root):
+    python scripts/bench_ics_export.py [--sessions 5000] [--repeat 20]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.core.time import TZ_OFFSET
+from app.planner.ics_export import MAX_LINE_OCTETS, PALETTE, _text_line, plan_to_ics
+from app.schemas.plan import PlanRecordSchema
+
+SUBJECTS = ["Toán", "Ngữ văn", "Tiếng Anh; IELTS", "Vật lý, nâng cao", "Hóa học"]
+
+
+def _legacy_format_date(iso: str) -> str:
+    dt = datetime.fromisoformat(iso)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _legacy_get(session, key: str, camel_key: str):
+    if isinstance(session, dict):
+        return session.get(camel_key) or session.get(key)
+    return getattr(session, key, None) or getattr(session, camel_key, None)
+
+
+def _legacy_plan_to_ics(plan: PlanRecordSchema) -> str:
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//StudyFlow//Planner 1.0//VI", "CALSCALE:GREGORIAN"]
+    for session in plan.sessions:
+        if _legacy_get(session, "source", "source") == "break":
+            continue
+        subject = _legacy_get(session, "subject", "subject")
+        criteria = _legacy_get(session, "success_criteria", "successCriteria") or []
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:{_legacy_get(session, 'id', 'id')}@studyflow",
+            f"DTSTAMP:{_legacy_format_date(plan.generated_at)}",
+            f"DTSTART:{_legacy_format_date(_legacy_get(session, 'planned_start', 'plannedStart'))}",
+            f"DTEND:{_legacy_format_date(_legacy_get(session, 'planned_end', 'plannedEnd'))}",
+            f"SUMMARY:{subject} · {_legacy_get(session, 'title', 'title')}",
+            f"DESCRIPTION:{' • '.join(criteria) if criteria else 'Hoàn thành buổi học'}",
+            f"CATEGORIES:{subject}",
+            f"COLOR:{PALETTE[abs(sum(ord(c) for c in subject)) % len(PALETTE)]}",
+            "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(lines)
+
+
+def _make_plan(n_sessions: int) -> PlanRecordSchema:
+    start = datetime.now(TZ_OFFSET).replace(minute=0, second=0, microsecond=0)
+    sessions = []
+    for i in range(n_sessions):
+        begin = start + timedelta(hours=i * 3 + random.randint(0, 2))
+        minutes = random.choice([25, 45, 60, 90])
+        sessions.append({
+            "id": str(uuid.uuid4()),
+            "source": "break" if i % 7 == 6 else "task",
+            "subject": random.choice(SUBJECTS),
+            "title": f"Ôn tập chương {i % 12 + 1}: hàm số, đạo hàm và ứng dụng\ntrong bài toán thực tế",
+            "plannedStart": begin.isoformat(),
+            "plannedEnd": (begin + timedelta(minutes=minutes)).isoformat(),
+            "minutes": minutes,
+            "status": "pending",
+            "successCriteria": ["Làm xong 20 bài tập trắc nghiệm", "Tóm tắt lý thuyết; ghi chú lỗi sai"],
+            "planVersion": 1,
+        })
+    return PlanRecordSchema(
+        id="bench", planVersion=1, sessions=sessions,
+        generatedAt=datetime.now(timezone.utc).isoformat(),
+    )
+
+
+def _bench(fn, plan: PlanRecordSchema, repeat: int) -> tuple[float, str]:
+    best = float("inf")
+    out = ""
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(plan)
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(7)
+    plan = _make_plan(args.sessions)
+
+    legacy_s, _ = _bench(_legacy_plan_to_ics, plan, args.repeat)
+    current_s, ics = _bench(plan_to_ics, plan, args.repeat)
+    # Cold: drop memoised property lines before every run
+    cold_s, _ = _bench(lambda p: (_text_line.cache_clear(), plan_to_ics(p))[1], plan, args.repeat)
+
+    too_long = [ln for ln in ics.split("\r\n") if len(ln.encode("utf-8")) > MAX_LINE_OCTETS]
+    events = ics.count("BEGIN:VEVENT")
+    print(f"sessions: {args.sessions}  events: {events}  bytes: {len(ics.encode('utf-8'))}")
+    print(f"legacy  : {legacy_s * 1e3:8.2f} ms  ({events / legacy_s:10.0f} events/s)")
+    print(f"current : {current_s * 1e3:8.2f} ms  ({events / current_s:10.0f} events/s)")
+    print(f"  cold  : {cold_s * 1e3:8.2f} ms  ({events / cold_s:10.0f} events/s)")
+    print(f"lines over {MAX_LINE_OCTETS} octets: {len(too_long)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Benchmark: parent child-plan view, full PlanRecord vs. SQL-windowed week.
+
+Builds one large plan (SESSIONS sessions over ~4 months plus unscheduled
+tasks with full payloads) and compares the response body of
+`GET /parent/child/{id}/plan` (the whole ORM record through
+jsonable_encoder) with `GET /parent/child/{id}/plan/window` (7 days,
+projected fields). Sizes are computed in-process; pass --db to also time
+both queries against DATABASE_URL inside a rolled-back transaction.
+
+Usage (from project root):
+    python scripts/bench_parent_plan_window.py [--sessions 5000] [--db]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.time import TZ_OFFSET
+from app.crud import plan as plan_crud
+from app.models.plan import PlanRecord
+from app.schemas.parent import ChildPlanWindow
+
+SUBJECTS = ["Toán", "Ngữ văn", "Tiếng Anh", "Vật lý", "Hóa học", "Sinh học"]
+WINDOW_DAYS = 7
+
+
+def _plan(owner: str, n: int, start: datetime) -> PlanRecord:
+    sessions = []
+    for i in range(n):
+        begin = start + timedelta(minutes=37 * i)
+        minutes = random.choice([25, 45, 60, 90])
+        sessions.append({
+            "id": str(uuid.uuid4()),
+            "taskId": str(uuid.uuid4()),
+            "habitId": None,
+            "source": "task",
+            "subject": random.choice(SUBJECTS),
+            "title": f"Ôn tập chương {random.randint(1, 12)}",
+            "plannedStart": begin.isoformat(),
+            "plannedEnd": (begin + timedelta(minutes=minutes)).isoformat(),
+            "minutes": minutes,
+            "bufferMinutes": 5,
+            "status": "pending",
+            "checklist": ["Đọc lý thuyết", "Làm bài tập", "Tự chấm"],
+            "successCriteria": ["Đúng 8/10 câu"],
+            "milestoneTitle": None,
+            "completedAt": None,
+            "planVersion": 3,
+        })
+    unscheduled = [
+        {
+            "id": str(uuid.uuid4()),
+            "subject": random.choice(SUBJECTS),
+            "title": "Đề cương cuối kỳ",
+            "deadline": start.isoformat(),
+            "contentFocus": "Ôn lại toàn bộ chương\n" * 5,
+            "successCriteria": ["Hoàn thành"],
+            "milestones": [{"id": str(uuid.uuid4()), "title": "Phần 1", "minutesEstimate": 30}],
+        }
+        for _ in range(n // 50)
+    ]
+    return PlanRecord(
+        id=str(uuid.uuid4()),
+        plan_version=3,
+        sessions=sessions,
+        unscheduled_tasks=unscheduled,
+        suggestions=[],
+        generated_at=start.isoformat(),
+        owner_user_id=owner,
+        created_at=start,
+    )
+
+
+def _window_in_python(record: PlanRecord, start: datetime, end: datetime) -> ChildPlanWindow:
+    """Same projection as plan_crud.get_plan_window, for the offline size check."""
+    sessions = [
+        {
+            "id": s["id"], "task_id": s["taskId"], "habit_id": s["habitId"],
+            "source": s["source"], "subject": s["subject"], "title": s["title"],
+            "planned_start": s["plannedStart"], "planned_end": s["plannedEnd"],
+            "minutes": s["minutes"], "status": s["status"],
+        }
+        for s in record.sessions
+        if start <= datetime.fromisoformat(s["plannedStart"]) < end
+    ]
+    return ChildPlanWindow(
+        plan_id=record.id,
+        plan_version=record.plan_version,
+        generated_at=record.generated_at,
+        window_start=start,
+        window_end=end,
+        unscheduled_count=len(record.unscheduled_tasks),
+        sessions=sessions,
+    )
+
+
+async def _bench_db(record: PlanRecord, start: datetime, end: datetime, repeat: int = 20) -> None:
+    from app.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        db.add(record)
+        await db.flush()
+
+        best_full = best_window = float("inf")
+        for _ in range(repeat):
+            db.expunge_all()
+            t0 = time.perf_counter()
+            plan = await plan_crud.get_latest_plan(db, record.owner_user_id)
+            json.dumps(jsonable_encoder(plan))
+            best_full = min(best_full, time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            row = await plan_crud.get_plan_window(db, record.owner_user_id, start, end)
+            ChildPlanWindow(window_start=start, window_end=end, **row._asdict()).model_dump_json()
+            best_window = min(best_window, time.perf_counter() - t0)
+        await db.rollback()
+
+    print(f"db full record    : {best_full * 1e3:8.1f} ms")
+    print(f"db windowed query : {best_window * 1e3:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--db", action="store_true", help="also time both queries against DATABASE_URL")
+    args = parser.parse_args()
+
+    start = datetime.now(TZ_OFFSET).replace(hour=0, minute=0, second=0, microsecond=0)
+    end = start + timedelta(days=WINDOW_DAYS)
+    record = _plan(f"bench-parent-{uuid.uuid4()}", args.sessions, start)
+
+    full = json.dumps(jsonable_encoder(record)).encode()
+    window = _window_in_python(record, start, end).model_dump_json().encode()
+    print(f"{args.sessions} sessions, {WINDOW_DAYS}-day window ({len(json.loads(window)['sessions'])} sessions)")
+    print(f"full record body  : {len(full) / 1024:8.1f} KiB")
+    print(f"window body       : {len(window) / 1024:8.1f} KiB  ({len(full) / len(window):.0f}x smaller)")
+    if args.db:
+        asyncio.run(_bench_db(record, start, end))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Benchmark: serializing plan responses, FastAPI default vs. orjson vs. raw JSONB.
+
+For plans of 100 to 20,000 sessions this times producing the response body
+of `/plan/latest` and `/plan/rebuild`:
+
+    default    PlanRecordSchema -> model_dump -> jsonable_encoder -> json.dumps
+               (what FastAPI does for a returned dict)
+    orjson     model_dump -> orjson.dumps (ORJSONResponse returned directly)
+    raw        the stored JSONB text passed through (`/plan/latest`); offline
+               only the str -> bytes step remains in Python
+
+Pass --db to time `/plan/latest`'s two data paths end to end against
+DATABASE_URL (ORM load + default encoding vs. get_latest_plan_json), inside
+a rolled-back transaction.
+
+Usage (from project root):
+    python scripts/bench_plan_json.py [--sizes 100,1000,5000,20000] [--db]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from app.core.time import TZ_OFFSET
+from app.crud import plan as plan_crud
+from app.models.plan import PlanRecord
+from app.schemas.plan import PlanRecordSchema
+
+SUBJECTS = ["Toán", "Ngữ văn", "Tiếng Anh", "Vật lý", "Hóa học", "Sinh học"]
+
+
+def _sessions(n: int, start: datetime) -> list[dict]:
+    sessions = []
+    for i in range(n):
+        begin = start + timedelta(minutes=37 * i)
+        minutes = random.choice([25, 45, 60, 90])
+        sessions.append({
+            "id": str(uuid.uuid4()),
+            "taskId": str(uuid.uuid4()),
+            "habitId": None,
+            "source": "task",
+            "subject": random.choice(SUBJECTS),
+            "title": f"Ôn tập chương {random.randint(1, 12)}",
+            "plannedStart": begin.isoformat(),
+            "plannedEnd": (begin + timedelta(minutes=minutes)).isoformat(),
+            "minutes": minutes,
+            "bufferMinutes": 5,
+            "status": "pending",
+            "checklist": ["Đọc lý thuyết", "Làm bài tập", "Tự chấm"],
+            "successCriteria": ["Đúng 8/10 câu"],
+            "milestoneTitle": None,
+            "completedAt": None,
+            "planVersion": 3,
+        })
+    return sessions
+
+
+def _record(n: int, start: datetime) -> PlanRecord:
+    return PlanRecord(
+        id=str(uuid.uuid4()),
+        plan_version=3,
+        sessions=_sessions(n, start),
+        unscheduled_tasks=[],
+        suggestions=[{"type": "increase_free_time", "message": "Thêm thời gian rảnh"}],
+        generated_at=start.isoformat(),
+        owner_user_id=f"bench-plan-json-{uuid.uuid4()}",
+        created_at=start,
+    )
+
+
+def _schema(record: PlanRecord) -> PlanRecordSchema:
+    # same construction as routers/plan.py
+    return PlanRecordSchema(
+        id=record.id,
+        planVersion=record.plan_version,
+        sessions=record.sessions,
+        unscheduledTasks=record.unscheduled_tasks,
+        suggestions=record.suggestions,
+        generatedAt=record.generated_at,
+    )
+
+
+def _default_body(content) -> bytes:
+    """FastAPI's handling of a returned dict: jsonable_encoder + JSONResponse.render."""
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def _best(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+async def _bench_db(sizes: list[int], start: datetime, repeat: int) -> None:
+    from app.database import AsyncSessionLocal, engine
+
+    print("\ndb: GET /plan/latest data path (best of %d)" % repeat)
+    async with AsyncSessionLocal() as db:
+        for n in sizes:
+            record = _record(n, start)
+            db.add(record)
+            await db.flush()
+            owner = record.owner_user_id
+
+            async def orm_path() -> bytes:
+                db.expunge_all()
+                row = await plan_crud.get_latest_plan(db, owner)
+                return _default_body(_schema(row).model_dump(by_alias=True))
+
+            async def raw_path() -> bytes:
+                return (await plan_crud.get_latest_plan_json(db, owner)).encode()
+
+            timings = []
+            for path in (orm_path, raw_path):
+                best = float("inf")
+                for _ in range(repeat):
+                    t0 = time.perf_counter()
+                    await path()
+                    best = min(best, time.perf_counter() - t0)
+                timings.append(best)
+            print(f"  {n:>6} sessions  orm+default {timings[0] * 1e3:8.1f} ms   raw jsonb {timings[1] * 1e3:8.1f} ms"
+                  f"  ({timings[0] / timings[1]:.1f}x)")
+        await db.rollback()
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,5000,20000")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--db", action="store_true", help="also time /plan/latest's queries against DATABASE_URL")
+    args = parser.parse_args()
+
+    random.seed(42)
+    sizes = [int(s) for s in args.sizes.split(",")]
+    start = datetime.now(TZ_OFFSET).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    print(f"{'sessions':>8} {'KiB':>8} {'default ms':>11} {'orjson ms':>10} {'raw ms':>8} {'orjson':>7} {'raw':>7}")
+    for n in sizes:
+        record = _record(n, start)
+        raw_text = json.dumps(_schema(record).model_dump(by_alias=True), ensure_ascii=False)
+
+        default = _best(lambda: _default_body(_schema(record).model_dump(by_alias=True)), args.repeat)
+        fast = _best(lambda: orjson.dumps(_schema(record).model_dump(by_alias=True)), args.repeat)
+        raw = _best(lambda: raw_text.encode(), args.repeat)
+
+        size = len(_default_body(_schema(record).model_dump(by_alias=True))) / 1024
+        print(
+            f"{n:>8} {size:>8.0f} {default * 1e3:>11.2f} {fast * 1e3:>10.2f} {raw * 1e3:>8.3f} "
+            f"{default / fast:>6.1f}x {default / raw:>6.0f}x"
+        )
+    if args.db:
+        asyncio.run(_bench_db(sizes, start, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
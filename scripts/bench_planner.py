@@ -0,0 +1,140 @@
+"""Benchmark: planner hot path on synthetic students, checked against baselines.
+
+For every scenario in scripts/synthetic.py this measures `generate_plan`,
+`clean_slots`, `_apply_breaks` and `plan_to_ics`: the best of --repeat runs,
+and the peak memory of one extra run under tracemalloc.
+
+Times are stored as multiples of a fixed pure-Python calibration loop, so
+baselines recorded on one machine stay meaningful on another. A run fails
+(exit code 1) when any ratio or peak exceeds its baseline by more than
+--tolerance.
+
+Usage (from project root):
+    python scripts/bench_planner.py                     # compare with baselines
+    python scripts/bench_planner.py --update-baselines  # record new baselines
+    python scripts/bench_planner.py --scenario year-programme --repeat 3
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.planner.clean_slots import clean_slots
+from app.planner.generate_plan import _apply_breaks, generate_plan
+from app.planner.ics_export import plan_to_ics
+from scripts.synthetic import SCENARIOS, make_student
+
+BASELINES = os.path.join(os.path.dirname(__file__), "planner_baselines.json")
+# Timings below this are too noisy to gate on; memory is still checked.
+MIN_GATED_SECONDS = 0.002
+
+
+def _calibrate() -> float:
+    """Best time of a fixed workload resembling planner code (dicts, strings)."""
+    def work() -> None:
+        d: dict[str, int] = {}
+        for i in range(200_000):
+            key = f"{i % 977:04d}"
+            d[key] = d.get(key, 0) + i
+    return _best(work, 5)
+
+
+def _best(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _peak_kib(fn: Callable[[], object]) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def _bench_scenario(name: str, repeat: int) -> dict[str, dict[str, float]]:
+    student = make_student(SCENARIOS[name])
+
+    def plan():
+        return generate_plan(
+            tasks=student.tasks,
+            free_slots=student.free_slots,
+            habits=student.habits,
+            settings=student.settings,
+            now_iso=student.now_iso,
+        )
+
+    record = plan()
+    focus = [s for s in record.sessions if s.source != "break"]
+    cases = {
+        "generate_plan": plan,
+        "clean_slots": lambda: clean_slots(student.free_slots),
+        "apply_breaks": lambda: _apply_breaks(focus, student.settings, record.plan_version),
+        "plan_to_ics": lambda: plan_to_ics(record),
+    }
+    results = {}
+    for case, fn in cases.items():
+        results[case] = {"seconds": _best(fn, repeat), "peak_kib": round(_peak_kib(fn), 1)}
+    results["generate_plan"]["sessions"] = len(record.sessions)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown/growth (0.5 = +50%%)")
+    parser.add_argument("--update-baselines", action="store_true")
+    args = parser.parse_args()
+
+    unit = _calibrate()
+    print(f"calibration unit: {unit * 1e3:.1f} ms")
+    baselines = {}
+    if os.path.exists(BASELINES):
+        with open(BASELINES, encoding="utf-8") as f:
+            baselines = json.load(f)
+
+    regressions = []
+    for name in args.scenario or SCENARIOS:
+        results = _bench_scenario(name, args.repeat)
+        print(f"\n{name}  ({results['generate_plan']['sessions']} sessions)")
+        for case, r in results.items():
+            ratio = r["seconds"] / unit
+            line = f"  {case:<14} {r['seconds'] * 1e3:9.2f} ms  x{ratio:7.3f}  peak {r['peak_kib']:9.1f} KiB"
+            base = baselines.get(name, {}).get(case)
+            if base and not args.update_baselines:
+                slower = ratio / base["ratio"] - 1
+                bigger = r["peak_kib"] / base["peak_kib"] - 1 if base["peak_kib"] else 0.0
+                line += f"  time {slower:+.0%}  mem {bigger:+.0%}"
+                timed = r["seconds"] >= MIN_GATED_SECONDS
+                if (timed and slower > args.tolerance) or bigger > args.tolerance:
+                    regressions.append(f"{name}/{case}")
+                    line += "  REGRESSION"
+            print(line)
+            if args.update_baselines:
+                baselines.setdefault(name, {})[case] = {"ratio": round(ratio, 4), "peak_kib": r["peak_kib"]}
+
+    if args.update_baselines:
+        with open(BASELINES, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nbaselines written to {os.path.relpath(BASELINES)}")
+    elif regressions:
+        print(f"\nregressed: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
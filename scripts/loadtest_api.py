@@ -0,0 +1,302 @@
+"""Load test: concurrent students against the real app and database.
+
+Seeds STUDENTS accounts through the API (register, free slots, habits and
+tasks from scripts/synthetic.py, one initial rebuild), then lets
+CONCURRENCY virtual clients replay a weighted request mix for DURATION
+seconds:
+
+    GET   /plan/latest                 (students opening the app)
+    GET   /metrics/plan                (dashboard)
+    PATCH /plan/sessions/{id}/status   (ticking sessions off)
+    POST  /plan/rebuild                (after editing tasks)
+
+and reports p50/p95/p99 latency and throughput per endpoint.
+
+Requests go through an in-process ASGI client, so the numbers cover
+routing, validation, the planner and the database — one worker's worth of
+capacity without socket overhead. The backing store is DATABASE_URL
+(the queries use Postgres-only SQL); point it at a throwaway database
+migrated with `alembic upgrade head`. Seeded accounts are removed at the
+end unless --keep is given.
+
+Usage (from project root):
+    python scripts/loadtest_api.py [--students 50] [--concurrency 20] [--duration 30]
+    python scripts/loadtest_api.py --mix latest=6,metrics=2,status=2,rebuild=0
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from sqlalchemy import bindparam, text
+
+from app.database import AsyncSessionLocal
+from main import app
+from scripts.synthetic import NOW, SCENARIOS, make_student
+
+API = "/api/v1"
+PASSWORD = "loadtest-password"
+DEFAULT_MIX = "latest=50,metrics=20,status=20,rebuild=10"
+
+_DELETE_USERS_SQL = text("DELETE FROM users WHERE id IN :ids").bindparams(bindparam("ids", expanding=True))
+_DELETE_PURGES_SQL = text("DELETE FROM account_purges WHERE owner_user_id IN :ids").bindparams(
+    bindparam("ids", expanding=True)
+)
+
+
+# ---------------------------------------------------------------------------
+# In-process ASGI client
+# ---------------------------------------------------------------------------
+
+async def call(method: str, path: str, token: Optional[str] = None, body=None) -> tuple[int, bytes]:
+    """Send one request straight into the ASGI app; returns (status, body)."""
+    path, _, query = path.partition("?")
+    payload = json.dumps(body).encode() if body is not None else b""
+    headers = [(b"host", b"loadtest"), (b"content-type", b"application/json")]
+    if token:
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": headers,
+        "client": ("127.0.0.1", 0),
+        "server": ("loadtest", 80),
+    }
+    sent = False
+    done = asyncio.Event()
+    status = 500
+    chunks: list[bytes] = []
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                done.set()
+
+    await app(scope, receive, send)
+    done.set()
+    return status, b"".join(chunks)
+
+
+# ---------------------------------------------------------------------------
+# Seeding
+# ---------------------------------------------------------------------------
+
+@dataclass
+class SeededStudent:
+    user_id: str
+    token: str
+    session_ids: list[str] = field(default_factory=list)
+
+
+def _expect(status: int, body: bytes, what: str) -> dict:
+    if status >= 300:
+        raise SystemExit(f"{what} failed: HTTP {status} {body[:300]!r}")
+    return json.loads(body) if body else {}
+
+
+async def seed_student(run_id: str, index: int, scenario: str) -> SeededStudent:
+    status, body = await call("POST", f"{API}/auth/register", body={
+        "username": f"loadtest-{run_id}-{index}",
+        "password": PASSWORD,
+        "last_name": "Tải",
+        "first_name": f"Học sinh {index}",
+    })
+    registered = _expect(status, body, "register")
+    student = SeededStudent(user_id=registered["user"]["id"], token=registered["access_token"])
+
+    data = make_student(SCENARIOS[scenario], seed=index)
+    # synthetic deadlines are relative to a fixed clock; move them to today
+    shift = datetime.now(NOW.tzinfo) - NOW
+    for slot in data.free_slots:
+        _expect(*await call("POST", f"{API}/slots/", student.token, slot.model_dump(
+            by_alias=True, include={"weekday", "start_time", "end_time", "capacity_minutes"},
+        )), "create slot")
+    for habit in data.habits:
+        _expect(*await call("POST", f"{API}/habits/", student.token, habit.model_dump(
+            by_alias=True, include={"name", "cadence", "weekday", "minutes"},
+        )), "create habit")
+    operations = []
+    for task in data.tasks:
+        created = task.model_dump(by_alias=True, mode="json", exclude={"id", "created_at", "updated_at"})
+        created["deadline"] = (datetime.fromisoformat(task.deadline) + shift).isoformat()
+        operations.append({"op": "create", "task": created})
+    _expect(*await call("POST", f"{API}/tasks/batch", student.token, {"operations": operations}), "create tasks")
+
+    plan = _expect(*await call("POST", f"{API}/plan/rebuild", student.token), "initial rebuild")
+    student.session_ids = [s["id"] for s in plan["sessions"] if s.get("source") != "break"]
+    return student
+
+
+async def cleanup(students: list[SeededStudent]) -> None:
+    """Purge every seeded account through DELETE /reset, then drop the users."""
+    for student in students:
+        await call("DELETE", f"{API}/reset", student.token)
+    ids = [s.user_id for s in students]
+    async with AsyncSessionLocal() as db:
+        await db.execute(_DELETE_PURGES_SQL, {"ids": ids})
+        await db.execute(_DELETE_USERS_SQL, {"ids": ids})
+        await db.commit()
+
+
+# ---------------------------------------------------------------------------
+# Load
+# ---------------------------------------------------------------------------
+
+def _parse_mix(raw: str) -> dict[str, int]:
+    mix = {}
+    for part in raw.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ("latest", "metrics", "status", "rebuild"):
+            raise SystemExit(f"unknown endpoint in --mix: {name}")
+        mix[name] = int(weight)
+    if not any(mix.values()):
+        raise SystemExit("--mix needs at least one positive weight")
+    return mix
+
+
+async def _one(kind: str, student: SeededStudent, rng: random.Random) -> tuple[str, int]:
+    if kind == "latest":
+        status, _ = await call("GET", f"{API}/plan/latest", student.token)
+        return "GET /plan/latest", status
+    if kind == "metrics":
+        range_key = rng.choice(["day", "week", "week", "month"])
+        status, _ = await call("GET", f"{API}/metrics/plan?range={range_key}", student.token)
+        return "GET /metrics/plan", status
+    if kind == "status":
+        if not student.session_ids:
+            return "PATCH /plan/sessions/{id}/status", 0
+        session_id = rng.choice(student.session_ids)
+        new_status = rng.choice(["done", "done", "skipped", "pending"])
+        status, _ = await call(
+            "PATCH", f"{API}/plan/sessions/{session_id}/status", student.token, {"status": new_status}
+        )
+        return "PATCH /plan/sessions/{id}/status", status
+    status, body = await call("POST", f"{API}/plan/rebuild", student.token)
+    if status == 200:
+        # a rebuild issues new session ids
+        student.session_ids = [s["id"] for s in json.loads(body)["sessions"] if s.get("source") != "break"]
+    return "POST /plan/rebuild", status
+
+
+async def run_load(
+    students: list[SeededStudent],
+    mix: dict[str, int],
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    seed: int,
+) -> tuple[dict[str, list[float]], dict[str, dict[int, int]], float]:
+    kinds, weights = zip(*mix.items())
+    latencies: dict[str, list[float]] = defaultdict(list)
+    statuses: dict[str, dict[int, int]] = defaultdict(lambda: defaultdict(int))
+    start = time.perf_counter()
+    measure_from = start + warmup
+    stop = measure_from + duration
+
+    async def client(worker: int) -> None:
+        rng = random.Random(f"{seed}:{worker}")
+        while True:
+            now = time.perf_counter()
+            if now >= stop:
+                return
+            kind = rng.choices(kinds, weights)[0]
+            label, status = await _one(kind, rng.choice(students), rng)
+            if now >= measure_from:
+                latencies[label].append(time.perf_counter() - now)
+                statuses[label][status] += 1
+
+    await asyncio.gather(*(client(i) for i in range(concurrency)))
+    return latencies, statuses, duration
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def report(latencies: dict[str, list[float]], statuses: dict[str, dict[int, int]], elapsed: float) -> None:
+    print(f"\n{'endpoint':<34} {'reqs':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  statuses")
+    total = 0
+    for label in sorted(latencies):
+        values = sorted(latencies[label])
+        total += len(values)
+        codes = " ".join(f"{code}:{n}" for code, n in sorted(statuses[label].items()))
+        print(
+            f"{label:<34} {len(values):>6} {len(values) / elapsed:>8.1f} "
+            f"{_percentile(values, 0.50) * 1e3:>8.1f} {_percentile(values, 0.95) * 1e3:>8.1f} "
+            f"{_percentile(values, 0.99) * 1e3:>8.1f}  {codes}"
+        )
+    print(f"{'total':<34} {total:>6} {total / elapsed:>8.1f}")
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    mix = _parse_mix(args.mix)
+    run_id = uuid.uuid4().hex[:8]
+    async with app.router.lifespan_context(app):
+        t0 = time.perf_counter()
+        students: list[SeededStudent] = []
+        try:
+            for index in range(args.students):
+                students.append(await seed_student(run_id, index, args.scenario))
+            print(
+                f"seeded {len(students)} students ({args.scenario}) in {time.perf_counter() - t0:.1f}s, "
+                f"run id {run_id}"
+            )
+            print(f"{args.concurrency} clients for {args.duration:.0f}s after {args.warmup:.0f}s warm-up, mix {mix}")
+            latencies, statuses, elapsed = await run_load(
+                students, mix, args.concurrency, args.duration, args.warmup, args.seed,
+            )
+            report(latencies, statuses, elapsed)
+        finally:
+            if students and not args.keep:
+                await cleanup(students)
+                print(f"\nremoved {len(students)} seeded students")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=50)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="month-typical")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="unmeasured seconds before the run")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="endpoint weights (latest, metrics, status, rebuild)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded students")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Load test: thousands of calendar subscribers polling the ICS feed.
+
+Simulates SUBSCRIBERS students, each with a plan of SESSIONS sessions spread
+over the next few months, and replays ROUNDS polling rounds. Between rounds a
+fraction of every plan is edited (status/time changes) to mimic real usage.
+Compares the windowed, cached feed against a full uncached `plan_to_ics`.
+
+Runs fully in-process — no database needed.
+
+Usage (from project root):
+    python scripts/loadtest_ics_feed.py [--subscribers 2000] [--sessions 300] [--rounds 5]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.core.time import TZ_OFFSET
+from app.planner.ics_export import plan_to_ics
+from app.planner.ics_feed import VEventCache, render_feed
+from app.schemas.plan import PlanRecordSchema
+
+SUBJECTS = ["Toán", "Ngữ văn", "Tiếng Anh", "Vật lý", "Hóa học", "Sinh học"]
+
+
+def _make_session(start: datetime) -> dict:
+    minutes = random.choice([25, 45, 60, 90])
+    return {
+        "id": str(uuid.uuid4()),
+        "source": random.choice(["task", "task", "task", "habit", "break"]),
+        "subject": random.choice(SUBJECTS),
+        "title": f"Ôn tập chương {random.randint(1, 12)}",
+        "plannedStart": start.isoformat(),
+        "plannedEnd": (start + timedelta(minutes=minutes)).isoformat(),
+        "minutes": minutes,
+        "status": "pending",
+        "successCriteria": ["Hoàn thành bài tập", "Tóm tắt ý chính"],
+        "planVersion": 1,
+    }
+
+
+def _make_plan(now: datetime, n_sessions: int) -> list[dict]:
+    start = now.astimezone(TZ_OFFSET) - timedelta(days=14)
+    return [
+        _make_session(start + timedelta(hours=random.randint(0, 24 * 150)))
+        for _ in range(n_sessions)
+    ]
+
+
+def _mutate(sessions: list[dict], fraction: float) -> None:
+    for i in random.sample(range(len(sessions)), int(len(sessions) * fraction)):
+        s = dict(sessions[i])
+        shifted = datetime.fromisoformat(s["plannedStart"]) + timedelta(minutes=30)
+        s["plannedStart"] = shifted.isoformat()
+        s["plannedEnd"] = (shifted + timedelta(minutes=s["minutes"])).isoformat()
+        sessions[i] = s
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscribers", type=int, default=2000)
+    parser.add_argument("--sessions", type=int, default=300)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--mutate", type=float, default=0.02, help="fraction edited per round")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    now = datetime.now(timezone.utc)
+    generated_at = now.isoformat()
+    plans = [_make_plan(now, args.sessions) for _ in range(args.subscribers)]
+    cache = VEventCache(max_entries=args.subscribers * args.sessions)
+
+    print(f"{args.subscribers} subscribers × {args.sessions} sessions, {args.rounds} rounds")
+
+    # Baseline: what /plan/export/ics costs per poll (full plan, no cache)
+    sample = plans[: min(200, len(plans))]
+    t0 = time.perf_counter()
+    full_bytes = 0
+    for sessions in sample:
+        full_bytes += len(plan_to_ics(PlanRecordSchema(
+            id="p", planVersion=1, sessions=sessions, generatedAt=generated_at,
+        )))
+    full_per_poll = (time.perf_counter() - t0) / len(sample)
+    print(f"full export     : {full_per_poll * 1e3:7.3f} ms/poll  {full_bytes // len(sample):>8} B/poll")
+
+    for rnd in range(args.rounds):
+        if rnd:
+            for sessions in plans:
+                _mutate(sessions, args.mutate)
+        hits, misses = cache.hits, cache.misses
+        t0 = time.perf_counter()
+        feed_bytes = 0
+        for sessions in plans:
+            feed_bytes += len(render_feed(sessions, generated_at, now=now, cache=cache))
+        elapsed = time.perf_counter() - t0
+        polls = len(plans)
+        round_hits, round_misses = cache.hits - hits, cache.misses - misses
+        hit_rate = round_hits / max(1, round_hits + round_misses)
+        print(
+            f"feed round {rnd + 1:<4}: {elapsed / polls * 1e3:7.3f} ms/poll  "
+            f"{feed_bytes // polls:>8} B/poll  {polls / elapsed:9.0f} polls/s  "
+            f"hit rate {hit_rate:6.1%}"
+        )
+
+    print(f"cached events   : {len(cache)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Deterministic synthetic students for planner benchmarks and load tests.
+
+`make_student(scenario, seed)` builds the planner inputs (tasks, free slots,
+habits, settings) for one student. The same seed always gives the same
+student. Scenarios range from a single busy week to a year-long programme
+with overlapping slots, milestones and many habits.
+
+Usage as a module (from project root):
+    from scripts.synthetic import SCENARIOS, make_student
+"""
+from __future__ import annotations
+
+import os
+import random
+import sys
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.core.time import TZ_OFFSET
+from app.schemas.free_slot import FreeSlotSchema
+from app.schemas.habit import HabitSchema
+from app.schemas.settings import AppSettingsSchema, BreakPresetSchema
+from app.schemas.task import TaskMilestoneSchema, TaskSchema
+
+SUBJECTS = ["Toán", "Ngữ văn", "Tiếng Anh", "Vật lý", "Hóa học", "Sinh học", "Lịch sử", "Địa lý"]
+HABITS = ["Đọc sách", "Thể dục", "Từ vựng tiếng Anh", "Thiền", "Luyện chữ", "Ôn bài cũ"]
+
+# Fixed clock so every run plans the same window.
+NOW = datetime(2026, 1, 5, 7, 0, tzinfo=TZ_OFFSET)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    tasks: int
+    horizon_days: int
+    slots_per_day: int
+    habits: int
+    milestone_ratio: float = 0.2
+    # probability that a slot overlaps the previous one (exercises clean_slots)
+    overlap_ratio: float = 0.1
+
+
+SCENARIOS: dict[str, Scenario] = {
+    s.name: s
+    for s in [
+        Scenario("week-light", tasks=8, horizon_days=7, slots_per_day=2, habits=1),
+        Scenario("month-typical", tasks=40, horizon_days=30, slots_per_day=3, habits=3),
+        Scenario("semester-heavy", tasks=200, horizon_days=120, slots_per_day=4, habits=4, milestone_ratio=0.35),
+        Scenario("overlapping-slots", tasks=60, horizon_days=30, slots_per_day=8, habits=2, overlap_ratio=0.6),
+        Scenario("year-programme", tasks=500, horizon_days=365, slots_per_day=3, habits=6, milestone_ratio=0.3),
+    ]
+}
+
+
+@dataclass
+class Student:
+    tasks: list[TaskSchema]
+    free_slots: list[FreeSlotSchema]
+    habits: list[HabitSchema]
+    settings: AppSettingsSchema
+    now_iso: str
+
+
+def _hhmm(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _slots(rng: random.Random, per_day: int, overlap_ratio: float) -> list[FreeSlotSchema]:
+    slots = []
+    for weekday in range(7):
+        cursor = rng.choice([6 * 60, 13 * 60, 17 * 60])
+        for _ in range(per_day):
+            length = rng.choice([45, 60, 90, 120])
+            if slots and slots[-1].weekday == weekday and rng.random() < overlap_ratio:
+                cursor -= rng.randint(15, 40)  # overlap the previous slot
+            start = max(0, min(cursor, 22 * 60))
+            end = min(start + length, 23 * 60 + 59)
+            slots.append(FreeSlotSchema(
+                id=str(uuid.UUID(int=rng.getrandbits(128))),
+                weekday=weekday,
+                startTime=_hhmm(start),
+                endTime=_hhmm(end),
+                capacityMinutes=end - start,
+                createdAt=NOW,
+            ))
+            cursor = end + rng.choice([0, 15, 30, 60])
+    return slots
+
+
+def _tasks(rng: random.Random, count: int, horizon_days: int, milestone_ratio: float) -> list[TaskSchema]:
+    tasks = []
+    for i in range(count):
+        estimated = rng.choice([30, 45, 60, 90, 120, 180, 240])
+        deadline = NOW + timedelta(days=rng.uniform(0.5, horizon_days), hours=rng.randint(0, 12))
+        milestones = None
+        if rng.random() < milestone_ratio:
+            parts = rng.randint(2, 4)
+            milestones = [
+                TaskMilestoneSchema(
+                    id=str(uuid.UUID(int=rng.getrandbits(128))),
+                    title=f"Phần {p + 1}",
+                    minutesEstimate=max(5, estimated // parts),
+                )
+                for p in range(parts)
+            ]
+        tasks.append(TaskSchema(
+            id=str(uuid.UUID(int=rng.getrandbits(128))),
+            subject=rng.choice(SUBJECTS),
+            title=f"Bài {i + 1}: ôn tập chuyên đề {rng.randint(1, 20)}",
+            deadline=deadline.isoformat(),
+            difficulty=rng.randint(1, 5),
+            durationEstimateMin=estimated,
+            durationEstimateMax=estimated + 30,
+            estimatedMinutes=estimated,
+            importance=rng.choice([None, 1, 2, 3]),
+            contentFocus="Đọc lý thuyết\nLàm bài tập\nTự chấm" if rng.random() < 0.5 else None,
+            successCriteria=["Đúng 8/10 câu"],
+            milestones=milestones,
+            progressMinutes=rng.choice([0, 0, 0, 15, 30]),
+            createdAt=NOW,
+            updatedAt=NOW,
+        ))
+    return tasks
+
+
+def _habits(rng: random.Random, count: int) -> list[HabitSchema]:
+    habits = []
+    for i in range(count):
+        weekly = rng.random() < 0.4
+        habits.append(HabitSchema(
+            id=str(uuid.UUID(int=rng.getrandbits(128))),
+            name=HABITS[i % len(HABITS)],
+            cadence="weekly" if weekly else "daily",
+            weekday=rng.randint(0, 6) if weekly else None,
+            minutes=rng.choice([10, 15, 20, 30]),
+            createdAt=NOW,
+        ))
+    return habits
+
+
+def make_student(scenario: Scenario, seed: int = 0) -> Student:
+    rng = random.Random(f"{scenario.name}:{seed}")
+    return Student(
+        tasks=_tasks(rng, scenario.tasks, scenario.horizon_days, scenario.milestone_ratio),
+        free_slots=_slots(rng, scenario.slots_per_day, scenario.overlap_ratio),
+        habits=_habits(rng, scenario.habits),
+        settings=AppSettingsSchema(
+            dailyLimitMinutes=rng.choice([120, 180, 240]),
+            bufferPercent=rng.choice([0.1, 0.15, 0.2]),
+            breakPreset=BreakPresetSchema(focus=45, rest=10),
+            lastUpdated=NOW,
+        ),
+        now_iso=NOW.isoformat(),
+    )